@@ -1,11 +1,25 @@
 import argparse
 import csv
 import os
+import threading
 import time
-from datetime import datetime, timezone
-from typing import Iterable, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
 import requests
+import yaml
+from requests.adapters import HTTPAdapter
+
+from preprocessing.kline_gaps import GapReport, scan_csv, scan_store
+from preprocessing.kline_manifest import CoverageManifest, contiguous_runs
+from preprocessing.kline_store import DEFAULT_BUFFER_ROWS, KlineStore
 
 BASE_URL = "https://api.binance.com/api/v3/klines"
 DEFAULT_SYMBOL = "BTCUSDT"
@@ -13,6 +27,19 @@ DEFAULT_INTERVAL = "1m"
 EXPORT_PATH = "./data/binance_klines/"
 MAX_LIMIT = 1000
 
+# Binance spot allows 6000 request weight per rolling minute per IP; a klines
+# call costs 2 regardless of limit.  Keep some headroom for other clients.
+WEIGHT_LIMIT_PER_MINUTE = 6000
+WEIGHT_HEADROOM = 0.8
+KLINES_WEIGHT = 2
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+RETRY_DELAY_SECONDS = 5
+DEFAULT_WORKERS = 1
+BATCHES_PER_RANGE = 10
+EXPORT_FORMATS = ("csv", "parquet")
+MANIFEST_SUFFIX = ".manifest.json"
+TAIL_BLOCK_BYTES = 4096
+
 INTERVAL_TO_MS = {
     "1m": 60_000,
     "3m": 180_000,
@@ -39,9 +66,86 @@ def build_params(symbol: str, interval: str, start_ms: int, end_ms: int) -> dict
     }
 
 
-def fetch_klines(symbol: str, interval: str, start_ms: int, end_ms: int) -> List[List]:
+class WeightBucket:
+    """Token bucket pacing requests against Binance's per-minute request weight.
+
+    Tokens refill continuously at ``capacity / 60`` per second.  After every
+    response the bucket is reconciled with the ``X-MBX-USED-WEIGHT-1M`` header
+    so that weight spent by other processes sharing the IP is accounted for.
+    """
+
+    def __init__(
+        self,
+        capacity: float = WEIGHT_LIMIT_PER_MINUTE * WEIGHT_HEADROOM,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.capacity = float(capacity)
+        self.refill_per_second = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def acquire(self, weight: float = KLINES_WEIGHT) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= weight:
+                        self._tokens -= weight
+                        return
+                    wait = (weight - self._tokens) / self.refill_per_second
+            self._sleep(wait)
+
+    def observe(self, used_weight: int) -> None:
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, max(0.0, self.capacity - used_weight))
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+def make_session(pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_klines(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    session: Optional[requests.Session] = None,
+    bucket: Optional[WeightBucket] = None,
+    base_url: str = BASE_URL,
+) -> List[List]:
     params = build_params(symbol, interval, start_ms, end_ms)
-    response = requests.get(BASE_URL, params=params, timeout=30)
+    if bucket is not None:
+        bucket.acquire(KLINES_WEIGHT)
+    http = session if session is not None else requests
+    response = http.get(base_url, params=params, timeout=30)
+    if bucket is not None:
+        used = response.headers.get(USED_WEIGHT_HEADER)
+        if used is not None:
+            bucket.observe(int(used))
+        if response.status_code in (418, 429):
+            bucket.pause(float(response.headers.get("Retry-After", 60)))
     if response.status_code != 200:
         raise RuntimeError(f"Binance API error {response.status_code}: {response.text}")
     return response.json()
@@ -51,16 +155,56 @@ def ensure_export_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def manifest_path_for(path: str) -> Path:
+    return Path(f"{path}{MANIFEST_SUFFIX}")
+
+
+def load_csv_manifest(path: str, interval_ms: int) -> CoverageManifest:
+    manifest = CoverageManifest.load(manifest_path_for(path))
+    if manifest is None:
+        manifest = CoverageManifest(interval_ms=interval_ms)
+    return manifest
+
+
+def read_last_line(path: str) -> Optional[str]:
+    # Walk backwards from EOF in fixed blocks, so the cost does not depend on
+    # how much history the file holds.
+    with open(path, "rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell()
+        tail = b""
+        while position > 0:
+            step = min(TAIL_BLOCK_BYTES, position)
+            position -= step
+            handle.seek(position)
+            tail = handle.read(step) + tail
+            stripped = tail.rstrip(b"\r\n")
+            if b"\n" in stripped:
+                return stripped.rsplit(b"\n", 1)[1].decode("utf-8")
+        stripped = tail.rstrip(b"\r\n")
+        return stripped.decode("utf-8") if stripped else None
+
+
 def get_existing_end(path: str) -> int:
     if not os.path.exists(path):
         return 0
-    with open(path, "r", encoding="utf-8") as handle:
-        last_line = None
-        for last_line in handle:
-            pass
+    manifest = CoverageManifest.load(manifest_path_for(path))
+    # The manifest is only trusted when it describes the file as it is now; a
+    # crash between the CSV append and the manifest update falls through to
+    # the tail read.
+    if (
+        manifest is not None
+        and manifest.last_timestamp is not None
+        and manifest.extra.get("bytes") == os.path.getsize(path)
+    ):
+        return manifest.last_timestamp + 1
+    last_line = read_last_line(path)
     if not last_line:
         return 0
-    last_timestamp = int(last_line.split(",", 1)[0])
+    try:
+        last_timestamp = int(last_line.split(",", 1)[0])
+    except ValueError:
+        return 0
     return last_timestamp + 1
 
 
@@ -74,6 +218,13 @@ def write_rows(path: str, rows: Iterable[List]) -> None:
             writer.writerow(row)
 
 
+def append_csv_batch(path: str, manifest: CoverageManifest, rows: List[List]) -> None:
+    write_rows(path, rows)
+    manifest.add_runs(contiguous_runs([row[0] for row in rows], manifest.interval_ms))
+    manifest.extra["bytes"] = os.path.getsize(path)
+    manifest.save(manifest_path_for(path))
+
+
 def kline_to_row(kline: List, interval_ms: int) -> List:
     open_time = int(kline[0])
     close_time = int(kline[6])
@@ -92,51 +243,518 @@ def daterange_to_ms(start: datetime, end: datetime) -> List[int]:
     return [int(start.timestamp() * 1000), int(end.timestamp() * 1000)]
 
 
-def download(symbol: str, interval: str, start: datetime, end: datetime, export_dir: str) -> None:
-    ensure_export_dir(export_dir)
-    export_path = os.path.join(export_dir, f"{symbol}_{interval}.csv")
-    interval_ms = interval_to_milliseconds(interval)
-    start_ms, end_ms = daterange_to_ms(start, end)
-    cursor = max(start_ms, get_existing_end(export_path))
+def split_ranges(start_ms: int, end_ms: int, interval_ms: int, batches: int = BATCHES_PER_RANGE) -> List[Tuple[int, int]]:
+    span = interval_ms * MAX_LIMIT * max(1, batches)
+    return [(lo, min(lo + span, end_ms)) for lo in range(start_ms, end_ms, span)]
 
-    while cursor < end_ms:
-        batch_end = min(cursor + interval_ms * MAX_LIMIT, end_ms)
+
+def batch_end(cursor: int, end_ms: int, interval_ms: int) -> int:
+    """Inclusive ``endTime`` for one request starting at ``cursor``.
+
+    ``end_ms`` is exclusive everywhere in this module while Binance's
+    ``endTime`` is inclusive, so a bar opening exactly at ``end_ms`` (or at a
+    range boundary) is never fetched twice.
+    """
+
+    return min(cursor + interval_ms * MAX_LIMIT, end_ms) - 1
+
+
+def fetch_with_retry(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    session: Optional[requests.Session] = None,
+    bucket: Optional[WeightBucket] = None,
+    base_url: str = BASE_URL,
+) -> List[List]:
+    while True:
         try:
-            klines = fetch_klines(symbol, interval, cursor, batch_end)
-        except RuntimeError as exc:
-            print(f"Error fetching data: {exc}. Retrying in 5 seconds...")
-            time.sleep(5)
-            continue
+            return fetch_klines(symbol, interval, start_ms, end_ms, session, bucket, base_url)
+        except (RuntimeError, requests.RequestException) as exc:
+            print(f"Error fetching data: {exc}. Retrying in {RETRY_DELAY_SECONDS} seconds...")
+            time.sleep(RETRY_DELAY_SECONDS)
+
 
+def fetch_range(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    session: Optional[requests.Session] = None,
+    bucket: Optional[WeightBucket] = None,
+    base_url: str = BASE_URL,
+) -> List[List]:
+    interval_ms = interval_to_milliseconds(interval)
+    rows: List[List] = []
+    cursor = start_ms
+    while cursor < end_ms:
+        klines = fetch_with_retry(
+            symbol, interval, cursor, batch_end(cursor, end_ms, interval_ms), session, bucket, base_url
+        )
         if not klines:
             cursor += interval_ms * MAX_LIMIT
             continue
-
-        rows = [kline_to_row(kline, interval_ms) for kline in klines]
-        write_rows(export_path, rows)
+        rows.extend(kline_to_row(kline, interval_ms) for kline in klines)
         cursor = klines[-1][6] + 1
-        time.sleep(0.5)
+    return rows
+
+
+def _nothing_to_flush() -> int:
+    return 0
+
+
+def open_export(
+    export_dir: str, symbol: str, interval: str, export_format: str
+) -> Tuple[str, int, Callable, Callable[[], int]]:
+    """Return ``(path, resume_ms, write_batch, flush)`` for one series.
+
+    Parquet stores buffer batches so each month partition is rewritten once
+    per ``DEFAULT_BUFFER_ROWS`` rows rather than once per request; callers
+    must call ``flush`` when they are done.  CSV appends are unbuffered.
+    """
 
+    if export_format == "parquet":
+        store = KlineStore(Path(export_dir), symbol, interval, buffer_rows=DEFAULT_BUFFER_ROWS)
+        last_timestamp = store.manifest().last_timestamp
+        existing_end = last_timestamp + 1 if last_timestamp is not None else 0
+        return str(store.path), existing_end, store.append, store.flush
+    export_path = os.path.join(export_dir, f"{symbol}_{interval}.csv")
+    manifest = load_csv_manifest(export_path, interval_to_milliseconds(interval))
+    write_batch = partial(append_csv_batch, export_path, manifest)
+    return export_path, get_existing_end(export_path), write_batch, _nothing_to_flush
+
+
+def download(
+    symbol: str,
+    interval: str,
+    start: datetime,
+    end: datetime,
+    export_dir: str,
+    workers: int = DEFAULT_WORKERS,
+    base_url: str = BASE_URL,
+    session: Optional[requests.Session] = None,
+    bucket: Optional[WeightBucket] = None,
+    export_format: str = "csv",
+) -> None:
+    ensure_export_dir(export_dir)
+    start_ms, end_ms = daterange_to_ms(start, end)
+    export_path, existing_end, write_batch, flush = open_export(export_dir, symbol, interval, export_format)
+    cursor = max(start_ms, existing_end)
+    workers = max(1, workers)
+    session = session or make_session(workers)
+    bucket = bucket or WeightBucket()
+    try:
+        _download_into(symbol, interval, cursor, end_ms, write_batch, workers, base_url, session, bucket)
+    finally:
+        flush()
     print(f"Download complete: {export_path}")
 
 
+def _download_into(
+    symbol: str,
+    interval: str,
+    cursor: int,
+    end_ms: int,
+    write_batch: Callable,
+    workers: int,
+    base_url: str,
+    session: requests.Session,
+    bucket: WeightBucket,
+) -> None:
+    interval_ms = interval_to_milliseconds(interval)
+    if workers == 1:
+        while cursor < end_ms:
+            klines = fetch_with_retry(
+                symbol, interval, cursor, batch_end(cursor, end_ms, interval_ms), session, bucket, base_url
+            )
+            if not klines:
+                cursor += interval_ms * MAX_LIMIT
+                continue
+            rows = [kline_to_row(kline, interval_ms) for kline in klines]
+            write_batch(rows)
+            cursor = klines[-1][6] + 1
+    else:
+        # Ranges are fetched concurrently but written strictly in order, so the
+        # CSV only ever holds a contiguous prefix and resume keeps working.
+        ranges = iter(split_ranges(cursor, end_ms, interval_ms))
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for lo, hi in ranges:
+                pending.append(pool.submit(fetch_range, symbol, interval, lo, hi, session, bucket, base_url))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                rows = pending.popleft().result()
+                if rows:
+                    write_batch(rows)
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    lo, hi = next_range
+                    pending.append(pool.submit(fetch_range, symbol, interval, lo, hi, session, bucket, base_url))
+
+
+def _open_time(bar_timestamp: int, interval_ms: int) -> int:
+    return bar_timestamp - (interval_ms - 1 - interval_ms // 2)
+
+
+def _window_bars(start_ms: int, end_ms: int, interval_ms: int) -> Tuple[int, int]:
+    """First and last bar timestamps of bars opening in ``[start_ms, end_ms)``."""
+
+    first_open = -(-start_ms // interval_ms) * interval_ms
+    last_open = -(-end_ms // interval_ms) * interval_ms - interval_ms
+    return _bar_timestamp(first_open, interval_ms), _bar_timestamp(last_open, interval_ms)
+
+
+def merge_csv_rows(path: str, rows: List[List], interval_ms: int) -> None:
+    """Merge out-of-order rows into a CSV export, rewriting it sorted and deduplicated."""
+
+    dtypes = {
+        "timestamp": np.int64,
+        "open": np.float64,
+        "high": np.float64,
+        "low": np.float64,
+        "close": np.float64,
+        "volume": np.float64,
+    }
+    frames = [pd.DataFrame(rows, columns=list(dtypes)).astype(dtypes)]
+    if os.path.exists(path):
+        frames.insert(0, pd.read_csv(path, dtype=dtypes))
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.drop_duplicates("timestamp", keep="last").sort_values("timestamp", kind="stable")
+    tmp_path = f"{path}.tmp"
+    merged.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    manifest = load_csv_manifest(path, interval_ms)
+    manifest.ranges = []
+    manifest.last_timestamp = None
+    manifest.add_runs(contiguous_runs(merged["timestamp"].to_numpy(), interval_ms))
+    manifest.extra["bytes"] = os.path.getsize(path)
+    manifest.save(manifest_path_for(path))
+
+
+def _unavailable(manifest: CoverageManifest) -> List[List[int]]:
+    return manifest.extra.get("unavailable", [])
+
+
+def backfill(
+    symbol: str,
+    interval: str,
+    start: datetime,
+    end: datetime,
+    export_dir: str,
+    workers: int = DEFAULT_WORKERS,
+    base_url: str = BASE_URL,
+    session: Optional[requests.Session] = None,
+    bucket: Optional[WeightBucket] = None,
+    export_format: str = "csv",
+) -> GapReport:
+    """Fetch only the bars missing from ``[start, end)`` in an existing export.
+
+    Holes are clipped to the window, so history outside it is neither fetched
+    nor judged.  Parts of the requested holes that Binance returns no data for
+    (exchange outages) are recorded as ``unavailable`` in the manifest so later
+    backfills do not request them again.  Returns the gap report after the
+    backfill.
+    """
+
+    ensure_export_dir(export_dir)
+    interval_ms = interval_to_milliseconds(interval)
+    first_bar, last_bar = _window_bars(*daterange_to_ms(start, end), interval_ms)
+    if export_format == "parquet":
+        store = KlineStore(Path(export_dir), symbol, interval)
+        export_path = str(store.path)
+        scan = partial(scan_store, store, first_bar, last_bar)
+        manifest_of = store.manifest
+        write_batch = store.append
+    else:
+        export_path = os.path.join(export_dir, f"{symbol}_{interval}.csv")
+        scan = partial(scan_csv, Path(export_path), interval_ms, first_bar, last_bar)
+        manifest_of = partial(load_csv_manifest, export_path, interval_ms)
+        write_batch = partial(merge_csv_rows, export_path, interval_ms=interval_ms)
+
+    report = scan()
+    print(f"Before backfill {symbol}_{interval}: {report.summary()}")
+    known_empty = _unavailable(manifest_of())
+    in_window = [
+        (max(lo, first_bar), min(hi, last_bar)) for lo, hi in report.missing if lo <= last_bar and hi >= first_bar
+    ]
+    holes = [
+        (lo, hi) for lo, hi in in_window
+        if not any(e_lo <= lo and hi <= e_hi for e_lo, e_hi in known_empty)
+    ]
+    needs_rewrite = export_format != "parquet" and (report.duplicates or report.out_of_order)
+    if not holes and not needs_rewrite:
+        return report
+
+    workers = max(1, workers)
+    session = session or make_session(workers)
+    bucket = bucket or WeightBucket()
+    ranges = [
+        (lo, hi)
+        for first, last in holes
+        for lo, hi in split_ranges(_open_time(first, interval_ms), _open_time(last, interval_ms) + 1, interval_ms)
+    ]
+    rows: List[List] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch_range, symbol, interval, lo, hi, session, bucket, base_url) for lo, hi in ranges]
+        for future in futures:
+            rows.extend(future.result())
+    rows = [row for row in rows if first_bar <= row[0] <= last_bar]
+    if rows or needs_rewrite:
+        write_batch(rows)
+
+    report = scan()
+    manifest = manifest_of()
+    unavailable = manifest.extra.setdefault("unavailable", [])
+    for lo, hi in report.missing:
+        lo, hi = max(lo, first_bar), min(hi, last_bar)
+        if lo > hi or [lo, hi] in unavailable:
+            continue
+        if any(h_lo <= lo and hi <= h_hi for h_lo, h_hi in holes):
+            unavailable.append([lo, hi])
+    if export_format == "parquet":
+        manifest.save(store.manifest_path)
+    else:
+        manifest.save(manifest_path_for(export_path))
+    print(f"After backfill {symbol}_{interval}: {report.summary()} ({len(rows)} bars fetched)")
+    return report
+
+
+@dataclass
+class DownloadJob:
+    symbol: str
+    interval: str
+    start: datetime
+    end: datetime
+
+    @property
+    def name(self) -> str:
+        return f"{self.symbol}_{self.interval}"
+
+
+@dataclass
+class JobProgress:
+    job: DownloadJob
+    total_ranges: int
+    done_ranges: int = 0
+    rows: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def update(self, rows: int) -> None:
+        self.done_ranges += 1
+        self.rows += rows
+
+    def throughput(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"[{self.job.name}] {self.done_ranges}/{self.total_ranges} ranges, "
+            f"{self.rows} rows, {self.throughput():.0f} rows/s"
+        )
+
+
+def _parse_date(value) -> datetime:
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    return datetime.strptime(str(value), "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+def expand_jobs(symbols: Iterable[str], intervals: Iterable[str], start, end) -> List[DownloadJob]:
+    start_dt, end_dt = _parse_date(start), _parse_date(end)
+    if end_dt <= start_dt:
+        raise ValueError("End date must be after start date")
+    jobs = []
+    for symbol in symbols:
+        for interval in intervals:
+            interval_to_milliseconds(interval)
+            jobs.append(DownloadJob(symbol.upper(), interval, start_dt, end_dt))
+    return jobs
+
+
+def load_job_spec(path: str) -> List[DownloadJob]:
+    """Expand a YAML job spec into symbol x interval x date-range jobs.
+
+    The spec holds a ``jobs`` list; each entry names ``symbols`` and
+    ``intervals`` and may override the ``start``/``end`` given in ``defaults``.
+    """
+
+    with open(path, "r", encoding="utf-8") as handle:
+        payload = yaml.safe_load(handle) or {}
+    defaults = payload.get("defaults", {})
+    jobs: List[DownloadJob] = []
+    for entry in payload.get("jobs", []):
+        merged = {**defaults, **entry}
+        jobs.extend(
+            expand_jobs(
+                merged.get("symbols", [DEFAULT_SYMBOL]),
+                merged.get("intervals", [DEFAULT_INTERVAL]),
+                merged.get("start", "2017-12-01"),
+                merged.get("end", datetime.now(timezone.utc).strftime("%Y-%m-%d")),
+            )
+        )
+    if not jobs:
+        raise ValueError(f"Job spec {path} defines no jobs (expected a non-empty 'jobs' list)")
+    return jobs
+
+
+def _bar_timestamp(open_ms: int, interval_ms: int) -> int:
+    return open_ms + interval_ms - 1 - interval_ms // 2
+
+
+def plan_job_ranges(
+    job: DownloadJob, export_dir: str, export_format: str
+) -> Tuple[Callable, Callable[[], int], List[Tuple[int, int]]]:
+    interval_ms = interval_to_milliseconds(job.interval)
+    start_ms, end_ms = daterange_to_ms(job.start, job.end)
+    _, existing_end, write_batch, flush = open_export(export_dir, job.symbol, job.interval, export_format)
+    if export_format != "parquet":
+        # CSV exports are append-only, so they resume from the tail and keep
+        # chronological order.
+        return write_batch, flush, split_ranges(max(start_ms, existing_end), end_ms, interval_ms)
+    manifest = KlineStore(Path(export_dir), job.symbol, job.interval).manifest()
+    ranges = []
+    for lo, hi in split_ranges(start_ms, end_ms, interval_ms):
+        first_open = -(-lo // interval_ms) * interval_ms
+        last_open = -(-hi // interval_ms) * interval_ms - interval_ms
+        if last_open >= first_open and manifest.covers(
+            _bar_timestamp(first_open, interval_ms), _bar_timestamp(last_open, interval_ms)
+        ):
+            continue
+        ranges.append((lo, hi))
+    return write_batch, flush, ranges
+
+
+def run_jobs(
+    jobs: List[DownloadJob],
+    export_dir: str,
+    workers: int = DEFAULT_WORKERS,
+    base_url: str = BASE_URL,
+    export_format: str = "csv",
+    session: Optional[requests.Session] = None,
+    bucket: Optional[WeightBucket] = None,
+) -> Dict[str, JobProgress]:
+    """Run many download jobs on one pool, session and request-weight budget.
+
+    Parquet stores accept ranges in any order, so all pending ranges are
+    scheduled newest first.  CSV exports must stay chronological per job; their
+    ranges are interleaved round-robin with the most recent jobs first.
+    """
+
+    ensure_export_dir(export_dir)
+    workers = max(1, workers)
+    session = session or make_session(workers)
+    bucket = bucket or WeightBucket()
+
+    writers: Dict[str, Callable] = {}
+    flushes: Dict[str, Callable[[], int]] = {}
+    progress: Dict[str, JobProgress] = {}
+    work: List[Tuple[Tuple, DownloadJob, int, int]] = []
+    for job in jobs:
+        write_batch, flush, ranges = plan_job_ranges(job, export_dir, export_format)
+        writers[job.name] = write_batch
+        flushes[job.name] = flush
+        progress[job.name] = JobProgress(job=job, total_ranges=len(ranges))
+        job_end = daterange_to_ms(job.start, job.end)[1]
+        for index, (lo, hi) in enumerate(ranges):
+            priority = (-hi,) if export_format == "parquet" else (index, -job_end)
+            work.append((priority, job, lo, hi))
+    work.sort(key=lambda item: item[0])
+
+    queue = iter(work)
+    pending: deque = deque()
+
+    def submit(pool: ThreadPoolExecutor) -> bool:
+        item = next(queue, None)
+        if item is None:
+            return False
+        _, job, lo, hi = item
+        future = pool.submit(fetch_range, job.symbol, job.interval, lo, hi, session, bucket, base_url)
+        pending.append((job, future))
+        return True
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while len(pending) < workers * 2 and submit(pool):
+                pass
+            while pending:
+                job, future = pending.popleft()
+                rows = future.result()
+                if rows:
+                    writers[job.name](rows)
+                progress[job.name].update(len(rows))
+                print(progress[job.name].describe())
+                submit(pool)
+    finally:
+        for flush in flushes.values():
+            flush()
+
+    for job_progress in progress.values():
+        print(f"Done {job_progress.describe()}")
+    return progress
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Download Binance historical klines with resume support")
     parser.add_argument("--symbol", default=DEFAULT_SYMBOL, help="Trading pair symbol (default BTCUSDT)")
+    parser.add_argument("--symbols", help="Comma separated symbols for a batch run (overrides --symbol)")
+    parser.add_argument("--intervals", help="Comma separated intervals for a batch run (overrides --interval)")
+    parser.add_argument("--jobs", help="YAML job spec of symbols x intervals x date ranges")
     parser.add_argument("--interval", default=DEFAULT_INTERVAL, help="Kline interval (1m,5m,15m,30m,1h)")
     parser.add_argument("--start", default="2017-12-01", help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end", default=datetime.now(timezone.utc).strftime("%Y-%m-%d"), help="End date (YYYY-MM-DD)")
     parser.add_argument("--output", default=EXPORT_PATH, help="Export directory")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent range fetchers (default 1)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv", help="Append to a CSV or a partitioned Parquet store")
+    parser.add_argument("--backfill", action="store_true", help="Only fetch bars missing from the existing export")
+    parser.add_argument("--base-url", default=BASE_URL, help="Klines endpoint (override for a local stub server)")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    start = datetime.strptime(args.start, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-    end = datetime.strptime(args.end, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-    if end <= start:
-        raise ValueError("End date must be after start date")
-    download(args.symbol.upper(), args.interval, start, end, args.output)
+    if args.jobs:
+        jobs = load_job_spec(args.jobs)
+    else:
+        symbols = (args.symbols or args.symbol).split(",")
+        intervals = (args.intervals or args.interval).split(",")
+        jobs = expand_jobs(symbols, intervals, args.start, args.end)
+    if args.backfill:
+        session = make_session(args.workers)
+        bucket = WeightBucket()
+        for job in jobs:
+            backfill(
+                job.symbol,
+                job.interval,
+                job.start,
+                job.end,
+                args.output,
+                workers=args.workers,
+                base_url=args.base_url,
+                session=session,
+                bucket=bucket,
+                export_format=args.format,
+            )
+        return
+    if len(jobs) > 1:
+        run_jobs(jobs, args.output, workers=args.workers, base_url=args.base_url, export_format=args.format)
+        return
+    job = jobs[0]
+    download(
+        job.symbol,
+        job.interval,
+        job.start,
+        job.end,
+        args.output,
+        workers=args.workers,
+        base_url=args.base_url,
+        export_format=args.format,
+    )
 
 
 if __name__ == "__main__":
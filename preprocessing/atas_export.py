@@ -0,0 +1,228 @@
+"""Streaming loader for ATAS ``IndicatorExporter`` JSON-lines exports.
+
+``IndicatorExporter.Export`` appends one JSON object per bar to
+``market_data_YYYYMMDD.json`` (plus an indented ``latest.json`` snapshot that
+is ignored here).  Each day file is parsed in bounded chunks of lines with
+``pyarrow.json`` into typed columns and cached as Parquet next to the exports::
+
+    C:/ATASExport/
+        market_data_20240101.json
+        .cache/market_data_20240101.parquet
+
+The cache key is the source file's size and mtime, stored in the Parquet
+schema metadata, so re-runs only re-parse days that are new or still being
+appended to.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import tempfile
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+EXPORT_PATTERN = "market_data_*.json"
+SNAPSHOT_NAME = "latest.json"
+CACHE_DIRNAME = ".cache"
+DEFAULT_CHUNK_LINES = 50_000
+CACHE_KEY_FIELDS = (b"source_size", b"source_mtime_ns")
+# .NET's StreamWriter(stream, Encoding.UTF8) writes a BOM when it creates the file.
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def export_files(path: Path) -> List[Path]:
+    """Day files under ``path``; falls back to every ``*.json`` but the snapshot."""
+
+    path = Path(path)
+    files = sorted(path.glob(EXPORT_PATTERN))
+    if not files:
+        files = sorted(file for file in path.glob("*.json") if file.name != SNAPSHOT_NAME)
+    return files
+
+
+def _source_key(path: Path) -> Dict[bytes, bytes]:
+    stat = path.stat()
+    return {b"source_size": str(stat.st_size).encode(), b"source_mtime_ns": str(stat.st_mtime_ns).encode()}
+
+
+def _normalise_chunk(table: pa.Table) -> pa.Table:
+    """Give every chunk the same column types so chunks and days concatenate."""
+
+    fields = []
+    arrays = []
+    for field, column in zip(table.schema, table.columns):
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            column = column.cast(pa.float64())
+        elif pa.types.is_timestamp(field.type):
+            column = column.cast(pa.string())
+        fields.append(pa.field(field.name, column.type))
+        arrays.append(column)
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def _parse_lines(lines: List[bytes]) -> Optional[pa.Table]:
+    """Parse a chunk of JSON lines into one table.
+
+    The whole chunk goes through ``pyarrow.json`` in one call.  Only when that
+    fails (typically the half-written last line of a file ATAS is still
+    appending to) is the chunk re-parsed line by line, dropping bad lines.
+    """
+
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return None
+    try:
+        return _normalise_chunk(pa_json.read_json(io.BytesIO(b"\n".join(lines))))
+    except pa.ArrowInvalid:
+        pass
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    if not records:
+        return None
+    payload = "\n".join(json.dumps(record) for record in records).encode("utf-8")
+    return _normalise_chunk(pa_json.read_json(io.BytesIO(payload)))
+
+
+def _read_chunks(handle, chunk_lines: int):
+    """Yield lists of at most ``chunk_lines`` lines, JSON-lines or legacy whole-file JSON."""
+
+    head = handle.read(len(UTF8_BOM))
+    if head != UTF8_BOM:
+        handle.seek(0)
+    start = handle.tell()
+    first = handle.readline().strip()
+    handle.seek(start)
+    if first.startswith(b"[") or (first.startswith(b"{") and not first.endswith(b"}")):
+        # Legacy exports hold a JSON array or a single indented object.
+        payload = json.loads(handle.read())
+        records = payload if isinstance(payload, list) else [payload]
+        yield [json.dumps(record).encode("utf-8") for record in records]
+        return
+    while True:
+        lines = list(islice(handle, chunk_lines))
+        if not lines:
+            return
+        yield lines
+
+
+def parse_export(path: Path, chunk_lines: int = DEFAULT_CHUNK_LINES) -> pa.Table:
+    """Parse one day file into a table with a UTC ``timestamp`` column."""
+
+    tables = []
+    with Path(path).open("rb") as handle:
+        for lines in _read_chunks(handle, chunk_lines):
+            table = _parse_lines(lines)
+            if table is not None:
+                tables.append(table)
+    if not tables:
+        return pa.table({"timestamp": pa.array([], type=pa.timestamp("us", tz="UTC"))})
+    table = pa.concat_tables(tables, promote_options="default")
+    if "timestamp" not in table.column_names:
+        raise ValueError(f"{path} has no timestamp column")
+    timestamps = pd.to_datetime(table.column("timestamp").to_pandas(), utc=True, format="ISO8601")
+    index = table.column_names.index("timestamp")
+    return table.set_column(index, "timestamp", pa.array(timestamps, type=pa.timestamp("us", tz="UTC")))
+
+
+def _cached_table(cache_path: Path, key: Dict[bytes, bytes]) -> Optional[pa.Table]:
+    if not cache_path.exists():
+        return None
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if any(metadata.get(name) != key[name] for name in CACHE_KEY_FIELDS):
+        return None
+    return pq.read_table(cache_path, memory_map=True)
+
+
+def _write_cache(cache_path: Path, table: pa.Table, key: Dict[bytes, bytes]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    metadata = dict(table.schema.metadata or {})
+    metadata.update(key)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_path.stem}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_export(
+    path: Path,
+    cache_dir: Optional[Path] = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+) -> pa.Table:
+    """Load one day file, re-parsing it only when its size or mtime changed."""
+
+    path = Path(path)
+    key = _source_key(path)
+    cache_path = Path(cache_dir) / f"{path.stem}.parquet" if cache_dir is not None else None
+    if cache_path is not None:
+        cached = _cached_table(cache_path, key)
+        if cached is not None:
+            return cached
+    table = parse_export(path, chunk_lines)
+    if cache_path is not None:
+        _write_cache(cache_path, table, key)
+    return table
+
+
+def load_exports(
+    path: Path,
+    cache_dir: Optional[Path] = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Load every day file under ``path`` into one frame indexed by UTC timestamp.
+
+    ``cache_dir`` defaults to ``<path>/.cache``.  Rows are sorted by timestamp
+    and duplicate timestamps keep their first occurrence.
+    """
+
+    path = Path(path)
+    files = export_files(path)
+    if not files:
+        raise FileNotFoundError(f"No indicator files found in {path}")
+    if use_cache and cache_dir is None:
+        cache_dir = path / CACHE_DIRNAME
+    tables = [load_export(file, cache_dir if use_cache else None, chunk_lines) for file in files]
+    frame = pa.concat_tables(
+        [table.replace_schema_metadata(None) for table in tables], promote_options="permissive"
+    ).to_pandas()
+    frame = frame.sort_values("timestamp", kind="stable").drop_duplicates("timestamp")
+    return frame.set_index("timestamp")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parse ATAS JSON-lines exports and refresh the Parquet cache")
+    parser.add_argument("path", help="Directory containing market_data_YYYYMMDD.json files")
+    parser.add_argument("--cache-dir", help="Cache directory (defaults to <path>/.cache)")
+    parser.add_argument("--chunk-lines", type=int, default=DEFAULT_CHUNK_LINES, help="Lines parsed per chunk")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+    frame = load_exports(Path(args.path), cache_dir, args.chunk_lines)
+    print(f"loaded {len(frame)} rows x {len(frame.columns)} columns from {args.path}")
+
+
+if __name__ == "__main__":
+    main()
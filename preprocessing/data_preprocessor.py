@@ -7,8 +7,12 @@ for MSI, MFI, KLI and trade state fields.
 """
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Union, overload
+
+import pandas as pd
+import pyarrow as pa
 
 STANDARD_FIELDS = {
     "MSI": [
@@ -109,6 +113,9 @@ LEGACY_ALIASES = {
 }
 
 
+FrameLike = Union[pd.DataFrame, pa.Table]
+
+
 @dataclass
 class IndicatorStandardizer:
     """Standardises indicator payloads according to the published schema."""
@@ -144,8 +151,112 @@ class IndicatorStandardizer:
             transformed[category] = self._normalise_category(category, category_payload)
         return transformed
 
+    def column_renames(self) -> Dict[str, str]:
+        """Flat ``legacy -> standard`` mapping across every category."""
+
+        renames: Dict[str, str] = {}
+        for category, alias_map in self.aliases.items():
+            if category in self.schema:
+                renames.update(alias_map)
+        return renames
+
+    def standard_columns(self) -> List[str]:
+        return [name for fields in self.schema.values() for name in fields]
+
+    def transform_frame(self, frame: FrameLike, strict: bool = False) -> FrameLike:
+        """Standardise a whole DataFrame or Arrow table in one columnar pass.
+
+        Legacy column names are renamed, every schema field missing from the
+        frame is added as an all-null column and extra columns (labels, scene
+        ids, prices) pass through unless ``strict`` is set, in which case they
+        raise ``KeyError`` like unknown fields in :meth:`transform`.  A legacy
+        column whose standard name is also present is ambiguous and raises.
+        """
+
+        columns = list(frame.column_names if isinstance(frame, pa.Table) else frame.columns)
+        renames = {name: target for name, target in self.column_renames().items() if name in columns}
+        clashes = sorted(name for name, target in renames.items() if target in columns)
+        if clashes:
+            raise KeyError(f"Both legacy and standard names present for: {', '.join(clashes)}")
+        standard = self.standard_columns()
+        renamed = [renames.get(name, name) for name in columns]
+        if strict:
+            unknown = sorted(set(renamed) - set(standard))
+            if unknown:
+                raise KeyError(
+                    f"Unknown fields {unknown}. Please update preprocessing to match the indicator catalog."
+                )
+        missing = [name for name in standard if name not in renamed]
+
+        if isinstance(frame, pa.Table):
+            table = frame.rename_columns(renamed)
+            for name in missing:
+                table = table.append_column(name, pa.nulls(table.num_rows))
+            return table
+        result = frame.rename(columns=renames)
+        if missing:
+            filler = pd.DataFrame({name: pd.Series([None] * len(result), index=result.index, dtype=object) for name in missing})
+            result = pd.concat([result, filler], axis=1)
+        return result
+
+
+class LazyPayloads(Sequence):
+    """Read-only sequence of per-row payload dicts built on first access.
+
+    Backed by a standardised frame: each field is converted to a NumPy array
+    once, and ``payloads[i]`` assembles the nested ``{category: {field: value}}``
+    dict for that row only when it is asked for.
+    """
+
+    def __init__(self, frame: FrameLike, schema: Mapping[str, Iterable[str]] = STANDARD_FIELDS) -> None:
+        self._schema = {category: list(fields) for category, fields in schema.items()}
+        self._frame = frame
+        self._columns: Dict[str, Any] = {}
+        self._length = frame.num_rows if isinstance(frame, pa.Table) else len(frame)
+
+    def _column(self, name: str):
+        if name not in self._columns:
+            if isinstance(self._frame, pa.Table):
+                self._columns[name] = self._frame.column(name).to_numpy(zero_copy_only=False)
+            else:
+                self._columns[name] = self._frame[name].to_numpy()
+        return self._columns[name]
+
+    def _payload(self, row: int) -> Dict[str, Dict[str, Any]]:
+        return {
+            category: {name: self._column(name)[row] for name in fields}
+            for category, fields in self._schema.items()
+        }
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Dict[str, Any]]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Dict[str, Any]]]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._payload(row) for row in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("payload index out of range")
+        return self._payload(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        return (self._payload(row) for row in range(self._length))
+
 
 def standardise(payload: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """Convenience wrapper returning a fully standardised payload."""
 
     return IndicatorStandardizer().transform(payload)
+
+
+def standardise_frame(frame: FrameLike, strict: bool = False) -> FrameLike:
+    """Convenience wrapper standardising a whole DataFrame or Arrow table."""
+
+    return IndicatorStandardizer().transform_frame(frame, strict=strict)
@@ -0,0 +1,388 @@
+"""Offline footprint engine built from Binance aggTrades files.
+
+This regenerates the order-flow fields that ``IndicatorExporter.OnCalculate``
+exports from ATAS, but from raw ``aggTrades`` dumps so that years of history
+can be rebuilt on any machine.  Trades are bucketed into bars and price levels
+with NumPy only:
+
+* per-bar OHLC, aggressive buy/sell volume, delta and traded notional;
+* per-bar price-level histograms stored CSR-style (``level_offsets`` indexes
+  into flat ``level_price`` / ``level_buy`` / ``level_sell`` arrays);
+* POC / value area and the high/low volume nodes nearest to the close, taken
+  from those histograms.
+
+The remaining fields use the definitions in ``OrderFlow_V5_indicator_catalog.md``
+with conventional parameters (EMA spans, RSI, z-score and percentile windows,
+absorption rule).  Fields that cannot be derived from trades alone are emitted
+as missing values so the output always carries the full ``STANDARD_FIELDS``
+schema.
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from preprocessing.data_preprocessor import STANDARD_FIELDS
+from preprocessing.kline_store import parse_interval
+
+AGG_TRADE_COLUMNS = (
+    "agg_trade_id",
+    "price",
+    "quantity",
+    "first_trade_id",
+    "last_trade_id",
+    "transact_time",
+    "is_buyer_maker",
+)
+BAR_COLUMNS = ("timestamp", "open", "high", "low", "close")
+VALUE_AREA_SHARE = 0.70
+# Volume nodes relative to the bar's POC volume.
+HVN_SHARE = 0.70
+LVN_SHARE = 0.30
+
+# Window lengths of the derived indicators.
+ATR_PERIOD = 14
+FAST_EMA_PERIOD = 12
+SLOW_EMA_PERIOD = 26
+RSI_PERIOD = 14
+VOLUME_PERCENTILE_WINDOW = 200
+CVD_STATS_WINDOW = 200
+MIGRATION_WINDOW = 20
+BASIS_POINT = 10_000.0
+
+
+@dataclass
+class AggTrades:
+    time: np.ndarray
+    price: np.ndarray
+    quantity: np.ndarray
+    is_buyer_maker: np.ndarray
+
+
+@dataclass
+class Footprint:
+    """Per-bar footprint with CSR-packed price-level histograms."""
+
+    interval_ms: int
+    tick_size: float
+    bar_open: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    buy_volume: np.ndarray
+    sell_volume: np.ndarray
+    notional: np.ndarray
+    level_offsets: np.ndarray
+    level_price: np.ndarray
+    level_buy: np.ndarray
+    level_sell: np.ndarray
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.buy_volume + self.sell_volume
+
+    @property
+    def delta(self) -> np.ndarray:
+        return self.buy_volume - self.sell_volume
+
+    def levels(self, bar: int) -> pd.DataFrame:
+        """Return the price ladder of one bar (mainly for inspection)."""
+
+        lo, hi = self.level_offsets[bar], self.level_offsets[bar + 1]
+        return pd.DataFrame(
+            {
+                "price": self.level_price[lo:hi],
+                "buy": self.level_buy[lo:hi],
+                "sell": self.level_sell[lo:hi],
+            }
+        )
+
+
+def load_agg_trades(path: Path) -> AggTrades:
+    """Read a Binance aggTrades CSV (plain or zipped, with or without header)."""
+
+    first = pd.read_csv(path, header=None, nrows=1)
+    has_header = not str(first.iloc[0, 0]).strip().lstrip("-").isdigit()
+    frame = pd.read_csv(
+        path,
+        header=0 if has_header else None,
+        names=None if has_header else list(AGG_TRADE_COLUMNS) + ["is_best_match"],
+        usecols=range(len(AGG_TRADE_COLUMNS)),
+    )
+    frame.columns = list(AGG_TRADE_COLUMNS)
+    is_buyer_maker = frame["is_buyer_maker"]
+    if is_buyer_maker.dtype != bool:
+        is_buyer_maker = is_buyer_maker.astype(str).str.lower().isin(("true", "1"))
+    time = frame["transact_time"].to_numpy(dtype=np.int64)
+    # Binance switched spot dumps to microseconds in 2025.
+    if time.size and time.max() > 10**14:
+        time = time // 1_000
+    return AggTrades(
+        time=time,
+        price=frame["price"].to_numpy(dtype=np.float64),
+        quantity=frame["quantity"].to_numpy(dtype=np.float64),
+        is_buyer_maker=is_buyer_maker.to_numpy(dtype=bool),
+    )
+
+
+def _segment_starts(keys: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+
+def build_footprint(trades: AggTrades, interval_ms: int, tick_size: float) -> Footprint:
+    """Bucket trades into bars and tick-size price levels."""
+
+    if trades.time.size == 0:
+        raise ValueError("Cannot build a footprint without trades")
+    order = np.argsort(trades.time, kind="stable")
+    time = trades.time[order]
+    price = trades.price[order]
+    quantity = trades.quantity[order]
+    # The maker side is passive: a buyer-maker trade is an aggressive sell.
+    buy_qty = np.where(trades.is_buyer_maker[order], 0.0, quantity)
+    sell_qty = quantity - buy_qty
+
+    bar_id = time // interval_ms
+    starts = _segment_starts(bar_id)
+    ends = np.r_[starts[1:], time.size] - 1
+
+    level_id = np.rint(price / tick_size).astype(np.int64)
+    level_order = np.lexsort((level_id, bar_id))
+    level_keys_bar = bar_id[level_order]
+    level_keys = level_id[level_order]
+    level_starts = np.flatnonzero(
+        np.r_[True, (level_keys_bar[1:] != level_keys_bar[:-1]) | (level_keys[1:] != level_keys[:-1])]
+    )
+    level_bar = level_keys_bar[level_starts]
+    counts = np.bincount(np.searchsorted(bar_id[starts], level_bar), minlength=starts.size)
+
+    return Footprint(
+        interval_ms=interval_ms,
+        tick_size=tick_size,
+        bar_open=bar_id[starts] * interval_ms,
+        open=price[starts],
+        high=np.maximum.reduceat(price, starts),
+        low=np.minimum.reduceat(price, starts),
+        close=price[ends],
+        buy_volume=np.add.reduceat(buy_qty, starts),
+        sell_volume=np.add.reduceat(sell_qty, starts),
+        notional=np.add.reduceat(price * quantity, starts),
+        level_offsets=np.r_[0, np.cumsum(counts)].astype(np.int64),
+        level_price=level_keys[level_starts] * tick_size,
+        level_buy=np.add.reduceat(buy_qty[level_order], level_starts),
+        level_sell=np.add.reduceat(sell_qty[level_order], level_starts),
+    )
+
+
+def _nearest_level(
+    footprint: Footprint, bar_of_level: np.ndarray, candidate: np.ndarray
+) -> np.ndarray:
+    """Price of the candidate level closest to each bar's close (NaN if none)."""
+
+    distance = np.where(candidate, np.abs(footprint.level_price - footprint.close[bar_of_level]), np.inf)
+    order = np.lexsort((footprint.level_price, distance, bar_of_level))
+    first = order[footprint.level_offsets[:-1]]
+    return np.where(np.isfinite(distance[first]), footprint.level_price[first], np.nan)
+
+
+def profile_levels(footprint: Footprint, share: float = VALUE_AREA_SHARE) -> pd.DataFrame:
+    """POC, value area and volume nodes for every bar.
+
+    The value area is the smallest set of the bar's highest-volume levels that
+    reaches ``share`` of its volume; VAH/VAL are that set's price extremes.
+    High (low) volume nodes are traded levels with at least ``HVN_SHARE`` (at
+    most ``LVN_SHARE``) of the POC volume; the nearest one to the close is
+    reported.
+    """
+
+    n_bars = footprint.bar_open.size
+    offsets = footprint.level_offsets
+    starts = offsets[:-1]
+    bar_of_level = np.repeat(np.arange(n_bars), np.diff(offsets))
+    total = footprint.level_buy + footprint.level_sell
+
+    ranked = np.lexsort((-total, bar_of_level))
+    ranked_total = total[ranked]
+    ranked_price = footprint.level_price[ranked]
+    running = np.cumsum(ranked_total)
+    before_bar = np.r_[0.0, running][starts]
+    within = running - before_bar[bar_of_level]
+    bar_volume = np.add.reduceat(ranked_total, starts)
+    in_area = within - ranked_total < share * bar_volume[bar_of_level]
+    poc_volume = ranked_total[starts][bar_of_level]
+
+    return pd.DataFrame(
+        {
+            "poc": ranked_price[starts],
+            "vah": np.maximum.reduceat(np.where(in_area, ranked_price, -np.inf), starts),
+            "val": np.minimum.reduceat(np.where(in_area, ranked_price, np.inf), starts),
+            "nearest_hvn": _nearest_level(footprint, bar_of_level, total >= HVN_SHARE * poc_volume),
+            "nearest_lvn": _nearest_level(footprint, bar_of_level, total <= LVN_SHARE * poc_volume),
+        }
+    )
+
+
+def bar_frame(footprint: Footprint) -> pd.DataFrame:
+    """Flatten a footprint into one row of base columns per bar."""
+
+    frame = pd.DataFrame(
+        {
+            "timestamp": footprint.bar_open,
+            "open": footprint.open,
+            "high": footprint.high,
+            "low": footprint.low,
+            "close": footprint.close,
+            "volume": footprint.volume,
+            "buy_volume": footprint.buy_volume,
+            "sell_volume": footprint.sell_volume,
+            "notional": footprint.notional,
+        }
+    )
+    return pd.concat([frame, profile_levels(footprint)], axis=1)
+
+
+def _rolling_percentile(values: np.ndarray, window: int) -> np.ndarray:
+    # ComputePercentile: rank of the current value among the trailing window
+    # (including itself), scaled by window length - 1.
+    padded = np.r_[np.full(window - 1, np.nan), values]
+    counts = np.minimum(np.arange(1, values.size + 1), window)
+    below = np.empty(values.size)
+    chunk = 100_000
+    for lo in range(0, values.size, chunk):
+        hi = min(lo + chunk, values.size)
+        windows = sliding_window_view(padded[lo: hi + window - 1], window)
+        below[lo:hi] = (windows < values[lo:hi, None]).sum(axis=1)
+    return below / np.maximum(1, counts - 1)
+
+
+def _cvd_rsi(cvd: pd.Series) -> pd.Series:
+    change = cvd.diff()
+    gains = change.clip(lower=0).rolling(RSI_PERIOD).sum()
+    losses = (-change.clip(upper=0)).rolling(RSI_PERIOD).sum()
+    rsi = 100 - 100 / (1 + gains / losses.where(losses != 0))
+    rsi = rsi.where(losses != 0, 100.0)
+    rsi.iloc[: RSI_PERIOD] = 50.0
+    return rsi
+
+
+def footprint_features(bars: pd.DataFrame) -> pd.DataFrame:
+    """Compute the STANDARD_FIELDS schema from chronologically ordered bars."""
+
+    bars = bars.reset_index(drop=True)
+    close = bars["close"]
+    volume = bars["volume"]
+    bar_range = bars["high"] - bars["low"]
+    out = pd.DataFrame({column: bars[column] for column in BAR_COLUMNS})
+    out["timestamp"] = pd.to_datetime(bars["timestamp"], unit="ms", utc=True)
+
+    # Market structure
+    out["poc"] = bars["poc"]
+    out["vah"] = bars["vah"]
+    out["val"] = bars["val"]
+    out["near_poc"] = close - bars["poc"]
+    out["near_vah"] = close - bars["vah"]
+    out["near_val"] = close - bars["val"]
+    migration = bars["poc"].diff().fillna(0.0)
+    out["value_migration"] = migration
+    out["value_migration_speed"] = migration / np.maximum(1.0, volume)
+    out["value_migration_consistency"] = np.sign(migration).rolling(MIGRATION_WINDOW, min_periods=1).mean()
+
+    # Money flow
+    delta = bars["buy_volume"] - bars["sell_volume"]
+    cvd = delta.cumsum()
+    out["bar_delta"] = delta
+    out["cvd"] = cvd
+    out["cvd_ema_fast"] = cvd.ewm(span=FAST_EMA_PERIOD, adjust=False).mean()
+    out["cvd_ema_slow"] = cvd.ewm(span=SLOW_EMA_PERIOD, adjust=False).mean()
+    out["cvd_macd"] = out["cvd_ema_fast"] - out["cvd_ema_slow"]
+    out["cvd_rsi"] = _cvd_rsi(cvd)
+    cvd_mean = cvd.rolling(CVD_STATS_WINDOW, min_periods=1).mean()
+    cvd_std = cvd.rolling(CVD_STATS_WINDOW, min_periods=1).std(ddof=0)
+    out["cvd_z"] = ((cvd - cvd_mean) / cvd_std.where(cvd_std != 0)).fillna(0.0)
+    # Aggressive buy/sell ratio, normalised to [-1, 1].
+    out["imbalance"] = (delta / volume.where(volume != 0)).fillna(0.0)
+
+    # Key levels
+    out["nearest_support"] = np.nan
+    out["nearest_resistance"] = np.nan
+    out["nearest_lvn"] = bars["nearest_lvn"]
+    out["nearest_hvn"] = bars["nearest_hvn"]
+    out["in_lvn"] = (close - bars["nearest_lvn"]).abs() <= bar_range * 0.25
+    absorption = (delta.abs() < volume * 0.2) & ((close - bars["open"]).abs() > bar_range * 0.5)
+    out["absorption_detected"] = absorption
+    out["absorption_strength"] = np.where(absorption, (volume - delta.abs()) / np.maximum(1.0, volume), 0.0)
+    out["absorption_side"] = None
+
+    # Volume, volatility and session
+    out["volume"] = volume
+    out["vol_pctl"] = _rolling_percentile(volume.to_numpy(dtype=np.float64), VOLUME_PERCENTILE_WINDOW)
+    # The first bar has no previous close; ``fmax`` ignores the NaN gaps there,
+    # so its true range is just high - low.
+    prev_close = close.shift(1)
+    true_range = np.fmax(bar_range, np.fmax((bars["high"] - prev_close).abs(), (bars["low"] - prev_close).abs()))
+    atr = true_range.rolling(ATR_PERIOD, min_periods=1).mean()
+    out["atr"] = atr
+    out["atr_norm_range"] = (bar_range / atr.where(atr != 0)).fillna(0.0)
+    session = out["timestamp"].dt.strftime("%Y%m%d")
+    vwap = bars["notional"].groupby(session).cumsum() / volume.groupby(session).cumsum()
+    # Keltner channel around the session VWAP with bands at +/- 2 ATR: -1 at
+    # the lower band, +1 at the upper one, clipped outside the channel.
+    half_width = 2 * atr
+    keltner = (close - vwap) / half_width.where(half_width != 0)
+    out["keltner_pos"] = keltner.clip(-1.0, 1.0).fillna(0.0)
+    vwap = vwap.fillna(0.0)
+    out["vwap_session"] = vwap
+    out["vwap_dev_bps"] = ((close - vwap) / vwap.where(vwap != 0) * BASIS_POINT).fillna(0.0)
+    out["ls_norm"] = np.nan  # liquidity score needs order-book data
+    out["session_id"] = session
+    out["state_tag"] = None
+    out["state_confidence"] = np.nan
+
+    schema = [field for fields in STANDARD_FIELDS.values() for field in fields]
+    return out.loc[:, list(BAR_COLUMNS) + [field for field in schema if field not in BAR_COLUMNS]]
+
+
+def build_features(paths: Iterable[Path], interval: str = "1m", tick_size: float = 0.1) -> pd.DataFrame:
+    """Build STANDARD_FIELDS features from chronologically ordered aggTrades files.
+
+    Files are reduced to bars one at a time, so peak memory is one file of
+    trades plus the bar table.  Daily dumps never split a bar across files.
+    """
+
+    interval_ms = parse_interval(interval)
+    frames: List[pd.DataFrame] = []
+    for path in paths:
+        frames.append(bar_frame(build_footprint(load_agg_trades(Path(path)), interval_ms, tick_size)))
+    if not frames:
+        raise ValueError("No aggTrades files given")
+    bars = pd.concat(frames, ignore_index=True).sort_values("timestamp", kind="stable")
+    return footprint_features(bars)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build order-flow features from Binance aggTrades files")
+    parser.add_argument("files", nargs="+", help="aggTrades CSV/ZIP files in chronological order")
+    parser.add_argument("--interval", default="1m", help="Bar interval (default 1m)")
+    parser.add_argument("--tick-size", type=float, default=0.1, help="Price level size for the footprint")
+    parser.add_argument("--output", default="data/processed/footprint_features.parquet", help="Parquet output path")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    features = build_features(sorted(args.files), args.interval, args.tick_size)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    features.to_parquet(output, index=False)
+    print(f"wrote {len(features)} bars to {output}")
+
+
+if __name__ == "__main__":
+    main()
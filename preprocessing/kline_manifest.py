@@ -0,0 +1,138 @@
+"""Coverage manifests for locally stored Binance klines.
+
+A manifest records which bar timestamps are already present on disk as a
+sorted list of inclusive ``[first, last]`` ranges plus the last timestamp seen.
+It is a small JSON document that is always replaced atomically, so readers
+never observe a half-written file even if the writer is interrupted.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class CoverageManifest:
+    """Covered timestamp ranges for one symbol/interval series."""
+
+    interval_ms: int
+    ranges: List[List[int]] = field(default_factory=list)
+    last_timestamp: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def add_range(self, first: int, last: int) -> None:
+        """Mark ``[first, last]`` as covered, merging touching ranges."""
+
+        if last < first:
+            first, last = last, first
+        merged: List[List[int]] = []
+        placed = False
+        for lo, hi in self.ranges:
+            if hi + self.interval_ms < first:
+                merged.append([lo, hi])
+            elif last + self.interval_ms < lo:
+                if not placed:
+                    merged.append([first, last])
+                    placed = True
+                merged.append([lo, hi])
+            else:
+                first, last = min(first, lo), max(last, hi)
+        if not placed:
+            merged.append([first, last])
+        self.ranges = merged
+        if self.last_timestamp is None or last > self.last_timestamp:
+            self.last_timestamp = last
+
+    def add_runs(self, runs: List[Tuple[int, int]]) -> None:
+        for first, last in runs:
+            self.add_range(int(first), int(last))
+
+    def covers(self, first: int, last: int) -> bool:
+        return any(lo <= first and last <= hi for lo, hi in self.ranges)
+
+    def missing(self, first: int, last: int) -> List[Tuple[int, int]]:
+        """Return the sub-ranges of ``[first, last]`` that are not covered."""
+
+        holes: List[Tuple[int, int]] = []
+        cursor = first
+        for lo, hi in self.ranges:
+            if hi < cursor:
+                continue
+            if lo > last:
+                break
+            if lo > cursor:
+                holes.append((cursor, lo - self.interval_ms))
+            cursor = max(cursor, hi + self.interval_ms)
+            if cursor > last:
+                break
+        if cursor <= last:
+            holes.append((cursor, last))
+        return holes
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = dict(self.extra)
+        payload.update(
+            {
+                "interval_ms": self.interval_ms,
+                "ranges": self.ranges,
+                "last_timestamp": self.last_timestamp,
+            }
+        )
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "CoverageManifest":
+        payload = dict(payload)
+        interval_ms = int(payload.pop("interval_ms"))
+        ranges = [[int(lo), int(hi)] for lo, hi in payload.pop("ranges", [])]
+        last = payload.pop("last_timestamp", None)
+        return cls(
+            interval_ms=interval_ms,
+            ranges=ranges,
+            last_timestamp=int(last) if last is not None else None,
+            extra=payload,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["CoverageManifest"]:
+        if not path.exists():
+            return None
+        with path.open("r", encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+    def save(self, path: Path) -> None:
+        atomic_write_json(path, self.to_dict())
+
+
+def contiguous_runs(timestamps, interval_ms: int) -> List[Tuple[int, int]]:
+    """Split a sorted timestamp array into ``(first, last)`` gap-free runs."""
+
+    values = np.asarray(timestamps, dtype=np.int64)
+    if values.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(values) > interval_ms)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [values.size - 1]))
+    return [(int(values[s]), int(values[e])) for s, e in zip(starts, ends)]
+
+
+def atomic_write_json(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.write("\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,126 @@
+"""Derive higher-interval klines from stored 1m bars.
+
+Bars keep the downloader's timestamp convention: a bar is stamped at
+``close_time - interval // 2`` where ``close_time = open_time + interval - 1``.
+Aggregation is fully vectorized: bucket ids come from integer division of the
+recovered open times and OHLCV is reduced with ``np.*.reduceat`` over the
+sorted bucket boundaries.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.kline_store import DEFAULT_STORE_PATH, KLINE_COLUMNS, KlineStore, parse_interval
+
+DEFAULT_TARGETS = ("3m", "5m", "15m", "30m", "1h")
+
+
+def bar_offset(interval_ms: int) -> int:
+    """Distance from a bar's open time to its stored timestamp."""
+
+    return interval_ms - 1 - interval_ms // 2
+
+
+def resample_frame(
+    frame: pd.DataFrame,
+    source_ms: int,
+    target_ms: int,
+    drop_incomplete_tail: bool = True,
+) -> pd.DataFrame:
+    """Aggregate sorted ``source_ms`` bars into ``target_ms`` bars.
+
+    Buckets with missing source bars in the middle of the history are kept
+    (Binance does the same across outages).  The final bucket is dropped when
+    ``drop_incomplete_tail`` is set and its last source bar has not arrived yet,
+    so incremental runs recompute it once it is complete.
+    """
+
+    if target_ms % source_ms:
+        raise ValueError(f"Target interval {target_ms}ms is not a multiple of {source_ms}ms")
+    if frame.empty:
+        return frame.loc[:, list(KLINE_COLUMNS)].iloc[0:0]
+
+    timestamps = frame["timestamp"].to_numpy(dtype=np.int64)
+    open_times = timestamps - bar_offset(source_ms)
+    buckets = open_times // target_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], timestamps.size] - 1
+
+    result = pd.DataFrame(
+        {
+            "timestamp": buckets[starts] * target_ms + bar_offset(target_ms),
+            "open": frame["open"].to_numpy(dtype=np.float64)[starts],
+            "high": np.maximum.reduceat(frame["high"].to_numpy(dtype=np.float64), starts),
+            "low": np.minimum.reduceat(frame["low"].to_numpy(dtype=np.float64), starts),
+            "close": frame["close"].to_numpy(dtype=np.float64)[ends],
+            "volume": np.add.reduceat(frame["volume"].to_numpy(dtype=np.float64), starts),
+        }
+    )
+    if drop_incomplete_tail:
+        last_expected_open = (buckets[-1] + 1) * target_ms - source_ms
+        if open_times[-1] < last_expected_open:
+            result = result.iloc[:-1]
+    return result
+
+
+def resample_store(
+    source: KlineStore,
+    interval: str,
+    partition: Optional[str] = None,
+    full: bool = False,
+) -> KlineStore:
+    """Incrementally build ``interval`` bars for ``source`` in a sibling store.
+
+    Only source bars from the bucket after the target's last complete bar
+    onwards are read, so nightly runs touch the newest partition(s) only.
+    ``full`` rebuilds from the whole source history.
+    """
+
+    target_ms = parse_interval(interval)
+    target = KlineStore(source.root, source.symbol, interval, partition or source.partition)
+    last = None if full else target.manifest().last_timestamp
+    start_ms = None
+    if last is not None:
+        next_open = last - bar_offset(target_ms) + target_ms
+        start_ms = next_open + bar_offset(source.interval_ms)
+    bars = source.read(start_ms=start_ms)
+    bars = bars.sort_values("timestamp", kind="stable").drop_duplicates("timestamp", keep="last")
+    target.append(resample_frame(bars, source.interval_ms, target_ms))
+    return target
+
+
+def resample_all(
+    root: Path,
+    symbol: str,
+    intervals: Iterable[str] = DEFAULT_TARGETS,
+    source_interval: str = "1m",
+    full: bool = False,
+) -> List[KlineStore]:
+    source = KlineStore(Path(root), symbol, source_interval)
+    return [resample_store(source, interval, full=full) for interval in intervals]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Derive higher-interval klines from a stored 1m series")
+    parser.add_argument("--root", default=DEFAULT_STORE_PATH, help="Kline store root directory")
+    parser.add_argument("--symbol", required=True, help="Trading pair symbol")
+    parser.add_argument("--source", default="1m", help="Source interval (default 1m)")
+    parser.add_argument("--intervals", default=",".join(DEFAULT_TARGETS), help="Comma separated target intervals")
+    parser.add_argument("--full", action="store_true", help="Rebuild targets from the full source history")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    intervals = [interval.strip() for interval in args.intervals.split(",") if interval.strip()]
+    for store in resample_all(Path(args.root), args.symbol.upper(), intervals, args.source, args.full):
+        print(f"resampled {store.path} (last={store.manifest().last_timestamp})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Partitioned Parquet storage for Binance klines.
+
+Each ``symbol``/``interval`` series lives in its own directory with one Parquet
+file per day or month and a ``manifest.json`` describing the covered ranges::
+
+    data/klines/BTCUSDT_1m/
+        manifest.json
+        2024-01.parquet
+        2024-02.parquet
+
+Timestamps are stored as int64 milliseconds (the ``close_time - interval/2``
+convention used by ``download_binance.kline_to_row``) and OHLCV as float64, so
+readers never have to re-parse text.  Readers only open the partitions that
+overlap the requested window and only the requested columns.
+
+Writers that append many small batches (the downloader) should set
+``buffer_rows``: batches are then collected in memory and each touched
+partition is rewritten once per flush instead of once per batch.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from preprocessing.kline_manifest import CoverageManifest, contiguous_runs
+
+DEFAULT_STORE_PATH = "./data/klines/"
+KLINE_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+KLINE_SCHEMA = pa.schema(
+    [("timestamp", pa.int64())] + [(column, pa.float64()) for column in KLINE_COLUMNS[1:]]
+)
+MANIFEST_NAME = "manifest.json"
+PARTITION_UNITS = {"day": "D", "month": "M"}
+# About a month of 1m bars: each month partition is rewritten once or twice.
+DEFAULT_BUFFER_ROWS = 50_000
+
+INTERVAL_TO_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+}
+INTERVAL_UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000}
+INTERVAL_PATTERN = re.compile(r"^(\d+)([mhd])$")
+
+
+def parse_interval(interval: str) -> int:
+    """Return the length of ``interval`` (e.g. ``"1m"``, ``"4h"``) in milliseconds."""
+
+    if interval in INTERVAL_TO_MS:
+        return INTERVAL_TO_MS[interval]
+    match = INTERVAL_PATTERN.match(interval)
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return int(match.group(1)) * INTERVAL_UNIT_MS[match.group(2)]
+
+
+def _partition_keys(timestamps: np.ndarray, partition: str) -> np.ndarray:
+    unit = PARTITION_UNITS[partition]
+    return timestamps.astype("datetime64[ms]").astype(f"datetime64[{unit}]").astype(str)
+
+
+def _partition_bounds(key: str, partition: str) -> tuple[int, int]:
+    unit = PARTITION_UNITS[partition]
+    start = np.datetime64(key, unit)
+    end = start + np.timedelta64(1, unit)
+    return int(start.astype("datetime64[ms]").astype(np.int64)), int(end.astype("datetime64[ms]").astype(np.int64)) - 1
+
+
+def _to_table(frame: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(frame.loc[:, list(KLINE_COLUMNS)], schema=KLINE_SCHEMA, preserve_index=False)
+
+
+def _normalise_frame(rows) -> pd.DataFrame:
+    if isinstance(rows, pd.DataFrame):
+        frame = rows.loc[:, list(KLINE_COLUMNS)].copy()
+    else:
+        frame = pd.DataFrame(list(rows), columns=list(KLINE_COLUMNS))
+    frame["timestamp"] = frame["timestamp"].astype(np.int64)
+    for column in KLINE_COLUMNS[1:]:
+        frame[column] = frame[column].astype(np.float64)
+    return frame
+
+
+@dataclass
+class KlineStore:
+    """Day- or month-partitioned Parquet store for one symbol/interval.
+
+    With ``buffer_rows > 0`` appended rows are held in memory until that many
+    are pending (or ``flush`` is called); rows are only on disk and in the
+    manifest after a flush.
+    """
+
+    root: Path
+    symbol: str
+    interval: str
+    partition: str = "month"
+    buffer_rows: int = 0
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+        self._pending: List[pd.DataFrame] = []
+        self._pending_rows = 0
+        if self.partition not in PARTITION_UNITS:
+            raise ValueError(f"Unsupported partition: {self.partition}")
+        parse_interval(self.interval)
+        manifest = CoverageManifest.load(self.manifest_path)
+        if manifest is not None:
+            self.partition = manifest.extra.get("partition", self.partition)
+
+    @property
+    def path(self) -> Path:
+        return self.root / f"{self.symbol}_{self.interval}"
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.path / MANIFEST_NAME
+
+    @property
+    def interval_ms(self) -> int:
+        return parse_interval(self.interval)
+
+    def manifest(self) -> CoverageManifest:
+        manifest = CoverageManifest.load(self.manifest_path)
+        if manifest is None:
+            manifest = CoverageManifest(
+                interval_ms=self.interval_ms,
+                extra={"symbol": self.symbol, "interval": self.interval, "partition": self.partition, "partitions": {}},
+            )
+        return manifest
+
+    def _partition_path(self, key: str) -> Path:
+        return self.path / f"{key}.parquet"
+
+    def _write_partition(self, key: str, frame: pd.DataFrame) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self._partition_path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=f".{key}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(_to_table(frame), tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def append(self, rows) -> int:
+        """Queue rows for their partitions, replacing duplicate timestamps.
+
+        Returns the number of rows received.  Unbuffered stores flush
+        immediately; buffered ones once ``buffer_rows`` rows are pending.
+        """
+
+        frame = _normalise_frame(rows)
+        if frame.empty:
+            return 0
+        self._pending.append(frame)
+        self._pending_rows += len(frame)
+        if self._pending_rows >= self.buffer_rows:
+            self.flush()
+        return len(frame)
+
+    def flush(self) -> int:
+        """Merge pending rows into their partitions and update the manifest.
+
+        Each touched partition is rewritten atomically once and the manifest
+        is updated afterwards, so an interrupted flush never records coverage
+        that is not on disk.  Returns the number of rows written.
+        """
+
+        if not self._pending:
+            return 0
+        frame = pd.concat(self._pending, ignore_index=True)
+        self._pending = []
+        self._pending_rows = 0
+        manifest = self.manifest()
+        partitions: Dict[str, Dict[str, int]] = manifest.extra.setdefault("partitions", {})
+        keys = _partition_keys(frame["timestamp"].to_numpy(), self.partition)
+        for key, chunk in frame.groupby(keys, sort=True):
+            path = self._partition_path(key)
+            if path.exists():
+                existing = pq.read_table(path, memory_map=True).to_pandas()
+                chunk = pd.concat([existing, chunk], ignore_index=True)
+            chunk = chunk.drop_duplicates("timestamp", keep="last").sort_values("timestamp", kind="stable")
+            self._write_partition(key, chunk)
+            timestamps = chunk["timestamp"].to_numpy()
+            partitions[key] = {"rows": int(len(chunk)), "first": int(timestamps[0]), "last": int(timestamps[-1])}
+        manifest.add_runs(contiguous_runs(np.unique(frame["timestamp"].to_numpy()), self.interval_ms))
+        manifest.save(self.manifest_path)
+        return len(frame)
+
+    def partition_keys(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> List[str]:
+        keys = sorted(self.manifest().extra.get("partitions", {}))
+        selected = []
+        for key in keys:
+            lo, hi = _partition_bounds(key, self.partition)
+            if start_ms is not None and hi < start_ms:
+                continue
+            if end_ms is not None and lo >= end_ms:
+                continue
+            selected.append(key)
+        return selected
+
+    def read(
+        self,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Read ``[start_ms, end_ms)`` touching only the overlapping partitions."""
+
+        columns = list(columns) if columns is not None else list(KLINE_COLUMNS)
+        if "timestamp" not in columns:
+            columns = ["timestamp"] + columns
+        filters = []
+        if start_ms is not None:
+            filters.append(("timestamp", ">=", int(start_ms)))
+        if end_ms is not None:
+            filters.append(("timestamp", "<", int(end_ms)))
+        tables = [
+            pq.read_table(self._partition_path(key), columns=columns, filters=filters or None, memory_map=True)
+            for key in self.partition_keys(start_ms, end_ms)
+        ]
+        if not tables:
+            return pd.DataFrame({column: pd.Series(dtype=KLINE_SCHEMA.field(column).type.to_pandas_dtype()) for column in columns})
+        return pa.concat_tables(tables).to_pandas()
+
+
+def discover_stores(root: Path) -> List[KlineStore]:
+    """Return every store under ``root`` that has a manifest."""
+
+    stores = []
+    for manifest_path in sorted(Path(root).glob(f"*/{MANIFEST_NAME}")):
+        manifest = CoverageManifest.load(manifest_path)
+        symbol = manifest.extra.get("symbol")
+        interval = manifest.extra.get("interval")
+        if not symbol or not interval:
+            continue
+        stores.append(KlineStore(Path(root), symbol, interval, manifest.extra.get("partition", "month")))
+    return stores
+
+
+def load_klines(
+    root: Path,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    series: Optional[Iterable[str]] = None,
+    symbol: Optional[str] = None,
+    interval: Optional[str] = None,
+) -> pd.DataFrame:
+    """Load one kline series from the stores under ``root``.
+
+    The series is selected by ``symbol``/``interval`` and/or ``series``
+    (``"{symbol}_{interval}"`` names).  Timestamps of different series
+    collide, so a selection matching more than one store raises
+    ``ValueError`` instead of mixing them.  The returned frame has a UTC
+    ``DatetimeIndex`` named ``timestamp``.
+    """
+
+    wanted = set(series) if series is not None else None
+    stores = [
+        store
+        for store in discover_stores(Path(root))
+        if (wanted is None or store.path.name in wanted)
+        and (symbol is None or store.symbol == symbol.upper())
+        and (interval is None or store.interval == interval)
+    ]
+    if not stores:
+        return pd.DataFrame()
+    if len(stores) > 1:
+        names = ", ".join(store.path.name for store in stores)
+        raise ValueError(f"{root} holds several kline series ({names}); select one by symbol/interval")
+    data = stores[0].read(start_ms, end_ms, columns).sort_values("timestamp", kind="stable")
+    data = data.drop_duplicates("timestamp")
+    data["timestamp"] = pd.to_datetime(data["timestamp"], unit="ms", utc=True)
+    return data.set_index("timestamp")
+
+
+def convert_csv(
+    csv_path: Path,
+    root: Path,
+    symbol: Optional[str] = None,
+    interval: Optional[str] = None,
+    partition: str = "month",
+    chunksize: int = 1_000_000,
+) -> KlineStore:
+    """Migrate a ``{symbol}_{interval}.csv`` export into a partitioned store."""
+
+    csv_path = Path(csv_path)
+    if symbol is None or interval is None:
+        stem_symbol, _, stem_interval = csv_path.stem.rpartition("_")
+        symbol = symbol or stem_symbol
+        interval = interval or stem_interval
+    store = KlineStore(Path(root), symbol, interval, partition)
+    dtypes = {column: np.float64 for column in KLINE_COLUMNS[1:]}
+    dtypes["timestamp"] = np.int64
+    for chunk in pd.read_csv(csv_path, dtype=dtypes, usecols=list(KLINE_COLUMNS), chunksize=chunksize):
+        store.append(chunk)
+    return store
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert Binance kline CSV exports into a partitioned Parquet store")
+    parser.add_argument("csv", nargs="+", help="CSV files named {symbol}_{interval}.csv")
+    parser.add_argument("--root", default=DEFAULT_STORE_PATH, help="Store root directory")
+    parser.add_argument("--partition", choices=sorted(PARTITION_UNITS), default="month", help="Partition granularity")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    for path in args.csv:
+        store = convert_csv(Path(path), Path(args.root), partition=args.partition)
+        manifest = store.manifest()
+        print(f"converted {path} -> {store.path} ({len(manifest.ranges)} covered ranges)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Streaming ATAS export loader against parsing every line with ``json.loads``."""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing import atas_export
+from preprocessing.atas_export import UTF8_BOM, load_exports
+
+
+def _records(day: str, count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    stamps = pd.date_range(day, periods=count, freq="min", tz="UTC")
+    for position, stamp in enumerate(stamps):
+        yield {
+            "timestamp": stamp.strftime("%Y-%m-%dT%H:%M:%S.0000000Z"),
+            "close": round(float(42_000 + rng.normal()), 1),
+            "bar_delta": int(rng.integers(-50, 50)),
+            "cvd_z": float(rng.normal()),
+            "absorption_detected": bool(position % 3 == 0),
+            "state_tag": ["BALANCED", "TRENDING", "TRANSITIONAL"][position % 3],
+        }
+
+
+@pytest.fixture
+def exports(tmp_path):
+    first = [json.dumps(record) for record in _records("2024-01-01", 60, 0)]
+    (tmp_path / "market_data_20240101.json").write_bytes(UTF8_BOM + "\n".join(first + [""]).encode())
+    second = [json.dumps(record) for record in _records("2024-01-02", 45, 1)]
+    # ATAS is still appending: the last line is half written.
+    (tmp_path / "market_data_20240102.json").write_text("\n".join(second) + "\n" + second[0][:25])
+    (tmp_path / "latest.json").write_text(json.dumps(json.loads(second[-1]), indent=2))
+    return tmp_path
+
+
+def _reference(path) -> pd.DataFrame:
+    records = []
+    for file in sorted(path.glob("market_data_*.json")):
+        for line in file.read_text(encoding="utf-8-sig").splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    frame = pd.DataFrame(records)
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True)
+    return frame.sort_values("timestamp").drop_duplicates("timestamp").set_index("timestamp")
+
+
+def _assert_same(frame: pd.DataFrame, expected: pd.DataFrame) -> None:
+    assert (frame.index == expected.index).all()
+    pd.testing.assert_frame_equal(frame.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+
+
+@pytest.mark.parametrize("chunk_lines", [7, 50_000])
+def test_streamed_exports_match_line_by_line_parsing(exports, chunk_lines):
+    _assert_same(load_exports(exports, chunk_lines=chunk_lines, use_cache=False), _reference(exports))
+
+
+def test_cache_is_reused_until_the_export_grows(exports, monkeypatch):
+    expected = _reference(exports)
+    _assert_same(load_exports(exports), expected)
+    assert sorted(file.name for file in (exports / ".cache").iterdir()) == [
+        "market_data_20240101.parquet",
+        "market_data_20240102.parquet",
+    ]
+
+    parsed = []
+    original = atas_export.parse_export
+
+    def counting_parse(path, chunk_lines):
+        parsed.append(path.name)
+        return original(path, chunk_lines)
+
+    monkeypatch.setattr(atas_export, "parse_export", counting_parse)
+    _assert_same(load_exports(exports), expected)
+    assert parsed == []
+
+    day = exports / "market_data_20240102.json"
+    text = day.read_text()
+    completed = [json.dumps(record) for record in _records("2024-01-02", 46, 1)]
+    day.write_text(text[: text.rindex("\n") + 1] + completed[-1] + "\n")
+    _assert_same(load_exports(exports), _reference(exports))
+    assert parsed == ["market_data_20240102.json"]
+    assert len(load_exports(exports)) == 60 + 46
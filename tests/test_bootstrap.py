@@ -0,0 +1,56 @@
+"""Chunked bootstrap in ``validator`` against the per-iteration ``rng.choice`` loop."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from validator import BOOTSTRAP_SEED, ValidationError, _bootstrap_indices, bootstrap_means, run_bootstrap
+
+
+def _choice_loop(data: np.ndarray, n_iter: int) -> np.ndarray:
+    rng = np.random.default_rng(BOOTSTRAP_SEED)
+    return np.array([rng.choice(data, size=data.size, replace=True).mean() for _ in range(n_iter)])
+
+
+@pytest.mark.parametrize("size", [1, 7, 250])
+@pytest.mark.parametrize("max_cells", [10**9, 1_000])
+def test_iid_means_match_the_choice_loop(size, max_cells):
+    data = np.random.default_rng(size).normal(size=size)
+    np.testing.assert_array_equal(bootstrap_means(data, 300, max_cells=max_cells), _choice_loop(data, 300))
+
+
+def test_run_bootstrap_matches_the_choice_loop_and_skips_nan():
+    data = np.random.default_rng(1).normal(size=400)
+    means = _choice_loop(data, 1000)
+    mean, (low, high) = run_bootstrap(np.r_[data, np.nan])
+    assert mean == pytest.approx(means.mean(), rel=1e-12)
+    assert (low, high) == pytest.approx(tuple(np.percentile(means, [2.5, 97.5])), rel=1e-12)
+
+
+def test_block_indices_are_circular_runs():
+    idx = _bootstrap_indices(np.random.default_rng(0), 20, 95, "block", 10)
+    assert idx.shape == (20, 95)
+    full_blocks = np.diff(idx[:, :90].reshape(20, 9, 10), axis=2)
+    last_block = np.diff(idx[:, 90:], axis=1)
+    assert ((full_blocks % 95) == 1).all() and ((last_block % 95) == 1).all()
+
+
+def test_stationary_blocks_have_the_requested_mean_length():
+    idx = _bootstrap_indices(np.random.default_rng(0), 200, 500, "stationary", 20)
+    assert ((idx >= 0) & (idx < 500)).all()
+    continues = (np.diff(idx, axis=1) % 500) == 1
+    # Restarts happen with probability 1 / block_size (a fresh start can also
+    # continue the previous block by chance, with probability 1 / size).
+    assert 1.0 / (1.0 - continues.mean()) == pytest.approx(20, rel=0.1)
+
+
+@pytest.mark.parametrize("method", ["block", "stationary"])
+def test_block_variants_are_centred_on_the_sample_mean(method):
+    data = np.random.default_rng(2).normal(size=1_000)
+    means = bootstrap_means(data, 2_000, method=method, block_size=25)
+    assert means.mean() == pytest.approx(data.mean(), abs=3 * means.std() / np.sqrt(means.size))
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValidationError, match="Unknown bootstrap method"):
+        bootstrap_means(np.ones(5), method="wild")
@@ -0,0 +1,101 @@
+"""Broadcast ``cost_surface`` against a per-group, per-scenario loop and ``evaluate_costs``."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation.src.costs import BPS, GRID_AXES, CostGrid, cost_surface, evaluate_costs, trade_cost_bps
+
+GRID = {
+    "taker_fee_bps": [4.0, 5.0],
+    "maker_fee_bps": [-1.0, 2.0],
+    "slippage_bps": {"start": 0.0, "stop": 10.0, "step": 2.5},
+    "fill_ratio": [0.0, 0.5, 1.0],
+    "turnover": 2.0,
+}
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(24)
+    n = 900
+    frame = pd.DataFrame(
+        {
+            "scene": rng.choice(["S1", "S2", "S3"], size=n),
+            "U1": rng.integers(0, 2, size=n),
+            "U2": (rng.random(n) < 0.1).astype(int),
+            "U3": 0,
+            "forward_return": np.round(rng.normal(5e-4, 2e-3, size=n), 4),  # ties with the costs
+        }
+    )
+    frame.loc[rng.random(n) < 0.05, "forward_return"] = np.nan
+    frame.loc[frame.index[:3], "U3"] = 1  # a single-trade group is dropped
+    frame.loc[frame.index[:3], "scene"] = ["S1", "S2", "S3"]
+    return frame
+
+
+def _group_loop(frame: pd.DataFrame, grid: CostGrid) -> pd.DataFrame:
+    # The previous path: filter each group, then loop over the scenarios.
+    records = []
+    mesh = {name: values.ravel() for name, values in grid.mesh().items()}
+    for scene, scene_df in frame.groupby("scene"):
+        for meta in ("U1", "U2", "U3"):
+            returns = scene_df.loc[scene_df[meta] > 0, "forward_return"].dropna()
+            if len(returns) < 2:
+                continue
+            gross, volatility = returns.mean(), returns.std(ddof=1)
+            for point in range(mesh["fill_ratio"].size):
+                taker, maker, slippage, fill = (mesh[name][point] for name in GRID_AXES)
+                cost = trade_cost_bps(taker, maker, slippage, fill, grid.turnover) / BPS
+                net = gross - cost
+                aggressive = grid.turnover * (1 - fill)
+                records.append(
+                    {
+                        "scene": scene,
+                        "meta_signal": meta,
+                        "trades": len(returns),
+                        "net": net,
+                        "net_sharpe": net / volatility if volatility > 0 else 0.0,
+                        "net_hit_rate": (returns - cost > 0).mean(),
+                        "breakeven_slippage_bps": (
+                            (gross * BPS - grid.turnover * fill * maker) / aggressive - taker
+                            if aggressive > 0
+                            else np.inf
+                        ),
+                    }
+                )
+    return pd.DataFrame(records)
+
+
+def test_surface_matches_the_group_loop(frame):
+    grid = CostGrid.from_dict(GRID)
+    assert grid.shape == (2, 2, 5, 3)
+    surface = cost_surface(frame, grid)
+    expected = _group_loop(frame, grid)
+    pd.testing.assert_frame_equal(surface[expected.columns], expected, check_dtype=False, rtol=1e-9)
+    assert not ((surface["meta_signal"] == "U3").any())
+
+
+def test_breakeven_slippage_zeroes_the_net_return(frame):
+    surface = cost_surface(frame, CostGrid.from_dict(GRID))
+    rows = surface[surface["fill_ratio"] < 1]
+    cost = trade_cost_bps(
+        rows["taker_fee_bps"], rows["maker_fee_bps"], rows["breakeven_slippage_bps"], rows["fill_ratio"], 2.0
+    )
+    np.testing.assert_allclose(rows["gross"] - cost / BPS, 0.0, atol=1e-15)
+
+
+def test_single_point_matches_evaluate_costs(frame):
+    scenario = {"taker_fee_bps": 4.0, "maker_fee_bps": 1.0, "slippage_bps": 2.0, "fill_ratio": 0.3}
+    surface = cost_surface(frame, CostGrid.from_dict(scenario), meta_signals=["U1"])
+    for row in surface.itertuples():
+        group = frame[(frame["scene"] == row.scene) & (frame["U1"] > 0)]["forward_return"].dropna()
+        evaluated = evaluate_costs(group, {"base": scenario}).iloc[0]
+        assert row.net == pytest.approx(evaluated["net"], rel=1e-12)
+        assert row.gross == pytest.approx(evaluated["gross"], rel=1e-12)
+
+
+def test_fill_ratio_outside_unit_interval_is_rejected():
+    with pytest.raises(ValueError, match="fill_ratio"):
+        CostGrid.from_dict({"fill_ratio": [0.5, 1.5]})
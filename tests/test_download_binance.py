@@ -0,0 +1,143 @@
+"""Run ``download`` against a local stub of the Binance klines endpoint."""
+from __future__ import annotations
+
+import csv
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import download_binance
+from preprocessing.kline_store import KlineStore
+
+INTERVAL_MS = 60_000
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+MIDDLE = datetime(2024, 1, 12, 12, tzinfo=timezone.utc)
+END = datetime(2024, 1, 31, tzinfo=timezone.utc)
+
+
+class KlinesStub(BaseHTTPRequestHandler):
+    """Serves synthetic 1m klines with Binance's startTime/endTime/limit semantics."""
+
+    requests: list = []
+    outages: list = []  # inclusive (first_open, last_open) ranges served as empty
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        start, end, limit = int(query["startTime"]), int(query["endTime"]), int(query["limit"])
+        type(self).requests.append((start, end))
+        first_open = -(-start // INTERVAL_MS) * INTERVAL_MS
+        klines = []
+        for open_time in range(first_open, end + 1, INTERVAL_MS):
+            if len(klines) == limit:
+                break
+            if any(lo <= open_time <= hi for lo, hi in type(self).outages):
+                continue
+            price = str(open_time // INTERVAL_MS % 1000)
+            klines.append([open_time, price, price, price, price, "1.0", open_time + INTERVAL_MS - 1])
+        body = json.dumps(klines).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header(download_binance.USED_WEIGHT_HEADER, "2")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - keep test output quiet
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    KlinesStub.requests = []
+    KlinesStub.outages = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KlinesStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/api/v3/klines"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _timestamps(path) -> list:
+    with open(path, newline="", encoding="utf-8") as handle:
+        return [int(row["timestamp"]) for row in csv.DictReader(handle)]
+
+
+def _open_ms(moment: datetime) -> int:
+    return download_binance.daterange_to_ms(moment, moment)[0]
+
+
+def _bar(open_ms: int) -> int:
+    return open_ms + INTERVAL_MS - 1 - INTERVAL_MS // 2
+
+
+def _expected(start: datetime, end: datetime) -> list:
+    return [_bar(open_time) for open_time in range(_open_ms(start), _open_ms(end), INTERVAL_MS)]
+
+
+def test_backfill_only_repairs_holes_inside_the_window(tmp_path, stub_url):
+    old_hole = (_open_ms(datetime(2024, 1, 1, 10, tzinfo=timezone.utc)), _open_ms(datetime(2024, 1, 1, 11, tzinfo=timezone.utc)))
+    outage = (_open_ms(datetime(2024, 1, 2, 5, tzinfo=timezone.utc)), _open_ms(datetime(2024, 1, 2, 6, tzinfo=timezone.utc)))
+    end = datetime(2024, 1, 4, tzinfo=timezone.utc)
+    KlinesStub.outages = [old_hole, outage]
+    download_binance.download("BTCUSDT", "1m", START, end, str(tmp_path), base_url=stub_url)
+
+    # The 2024-01-01 hole is outside the window and must stay untouched.
+    KlinesStub.outages = [outage]
+    KlinesStub.requests = []
+    window_start = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    download_binance.backfill("BTCUSDT", "1m", window_start, end, str(tmp_path), base_url=stub_url)
+    assert KlinesStub.requests
+    assert min(start for start, _ in KlinesStub.requests) >= _open_ms(window_start)
+    manifest = download_binance.load_csv_manifest(str(tmp_path / "BTCUSDT_1m.csv"), INTERVAL_MS)
+    assert manifest.extra["unavailable"] == [[_bar(outage[0]), _bar(outage[1])]]
+
+    download_binance.backfill("BTCUSDT", "1m", START, end, str(tmp_path), base_url=stub_url)
+    timestamps = _timestamps(tmp_path / "BTCUSDT_1m.csv")
+    missing = [_bar(open_time) for open_time in range(outage[0], outage[1] + 1, INTERVAL_MS)]
+    assert timestamps == [bar for bar in _expected(START, end) if bar not in missing]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_download_writes_bars_in_order(tmp_path, stub_url, workers):
+    download_binance.download("BTCUSDT", "1m", START, END, str(tmp_path), workers=workers, base_url=stub_url)
+
+    timestamps = _timestamps(tmp_path / "BTCUSDT_1m.csv")
+    assert timestamps == _expected(START, END)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parquet_download_flushes_buffered_bars(tmp_path, stub_url, workers):
+    download_binance.download(
+        "BTCUSDT", "1m", START, END, str(tmp_path), workers=workers, base_url=stub_url, export_format="parquet"
+    )
+
+    store = KlineStore(tmp_path, "BTCUSDT", "1m")
+    assert store.read()["timestamp"].tolist() == _expected(START, END)
+    assert store.manifest().last_timestamp == _expected(START, END)[-1]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_download_resumes_from_existing_export(tmp_path, stub_url, workers):
+    download_binance.download("BTCUSDT", "1m", START, MIDDLE, str(tmp_path), workers=workers, base_url=stub_url)
+    resume_from = _timestamps(tmp_path / "BTCUSDT_1m.csv")[-1]
+    KlinesStub.requests = []
+
+    download_binance.download("BTCUSDT", "1m", START, END, str(tmp_path), workers=workers, base_url=stub_url)
+
+    assert KlinesStub.requests
+    assert min(start for start, _ in KlinesStub.requests) > resume_from
+    assert _timestamps(tmp_path / "BTCUSDT_1m.csv") == _expected(START, END)
+
+
+def test_empty_job_spec_is_rejected(tmp_path):
+    spec = tmp_path / "jobs.yaml"
+    spec.write_text("defaults:\n  start: 2024-01-01\njobs: []\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="no jobs"):
+        download_binance.load_job_spec(str(spec))
@@ -0,0 +1,105 @@
+"""``preprocessing.footprint`` against per-bar pandas / Python references."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing.footprint import (
+    ATR_PERIOD,
+    HVN_SHARE,
+    LVN_SHARE,
+    VALUE_AREA_SHARE,
+    VOLUME_PERCENTILE_WINDOW,
+    AggTrades,
+    bar_frame,
+    build_footprint,
+    footprint_features,
+)
+
+MINUTE_MS = 60_000
+START_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+TICK = 0.1
+
+
+@pytest.fixture(scope="module")
+def trades() -> AggTrades:
+    rng = np.random.default_rng(7)
+    n = 20_000
+    time = START_MS + np.sort(rng.integers(0, 90 * MINUTE_MS, n))
+    price = np.round(42_000 + np.cumsum(rng.normal(0, 0.3, n)), 1)
+    return AggTrades(time=time, price=price, quantity=rng.random(n), is_buyer_maker=rng.random(n) < 0.5)
+
+
+@pytest.fixture(scope="module")
+def trade_frame(trades) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "bar": trades.time // MINUTE_MS * MINUTE_MS,
+            "level": np.rint(trades.price / TICK).astype(np.int64),
+            "price": trades.price,
+            "buy": np.where(trades.is_buyer_maker, 0.0, trades.quantity),
+            "sell": np.where(trades.is_buyer_maker, trades.quantity, 0.0),
+            "notional": trades.price * trades.quantity,
+        }
+    )
+
+
+def test_bars_match_a_pandas_groupby(trades, trade_frame):
+    bars = bar_frame(build_footprint(trades, MINUTE_MS, TICK))
+    expected = trade_frame.groupby("bar").agg(
+        open=("price", "first"),
+        high=("price", "max"),
+        low=("price", "min"),
+        close=("price", "last"),
+        buy_volume=("buy", "sum"),
+        sell_volume=("sell", "sum"),
+        notional=("notional", "sum"),
+    )
+    assert (bars["timestamp"].to_numpy() == expected.index.to_numpy()).all()
+    for column in expected.columns:
+        np.testing.assert_allclose(bars[column].to_numpy(), expected[column].to_numpy(), rtol=1e-12, err_msg=column)
+
+
+def test_profile_levels_match_a_per_bar_loop(trades, trade_frame):
+    bars = bar_frame(build_footprint(trades, MINUTE_MS, TICK))
+    ladders = trade_frame.assign(total=trade_frame["buy"] + trade_frame["sell"]).groupby(["bar", "level"])["total"].sum()
+    for row, (bar, ladder) in zip(bars.itertuples(), ladders.groupby(level="bar")):
+        prices = ladder.index.get_level_values("level").to_numpy() * TICK
+        volume = ladder.to_numpy()
+        ranked = np.argsort(-volume, kind="stable")
+        covered = np.cumsum(volume[ranked]) - volume[ranked] < VALUE_AREA_SHARE * volume.sum()
+        area = prices[ranked][covered]
+        hvn = prices[volume >= HVN_SHARE * volume.max()]
+        lvn = prices[volume <= LVN_SHARE * volume.max()]
+        assert row.poc == pytest.approx(prices[ranked[0]])
+        assert (row.val, row.vah) == pytest.approx((area.min(), area.max()))
+        assert row.nearest_hvn == pytest.approx(hvn[np.argmin(np.abs(hvn - row.close))])
+        if lvn.size:
+            assert row.nearest_lvn == pytest.approx(lvn[np.argmin(np.abs(lvn - row.close))])
+        else:
+            assert np.isnan(row.nearest_lvn)
+
+
+def test_features_follow_the_catalog_definitions(trades):
+    bars = bar_frame(build_footprint(trades, MINUTE_MS, TICK))
+    features = footprint_features(bars)
+    volume = bars["buy_volume"] + bars["sell_volume"]
+    delta = bars["buy_volume"] - bars["sell_volume"]
+
+    np.testing.assert_allclose(features["imbalance"], delta / volume)
+    assert features["ls_norm"].isna().all()
+    assert features["atr"].iloc[0] == pytest.approx(bars["high"].iloc[0] - bars["low"].iloc[0])
+    prev_close = bars["close"].shift(1)
+    true_range = pd.concat(
+        [bars["high"] - bars["low"], (bars["high"] - prev_close).abs(), (bars["low"] - prev_close).abs()], axis=1
+    ).max(axis=1)
+    np.testing.assert_allclose(features["atr"], true_range.rolling(ATR_PERIOD, min_periods=1).mean())
+    assert features["keltner_pos"].between(-1, 1).all()
+
+    values = volume.to_numpy()
+    expected = []
+    for i in range(values.size):
+        window = values[max(0, i - VOLUME_PERCENTILE_WINDOW + 1): i + 1]
+        expected.append((window < values[i]).sum() / max(1, window.size - 1))
+    np.testing.assert_allclose(features["vol_pctl"], expected)
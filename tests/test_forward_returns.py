@@ -0,0 +1,72 @@
+"""Time-indexed forward returns in ``validator`` against a row-by-row lookup."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validator import compute_future_returns, forward_return_matrix
+
+HORIZONS = [1, 5, 15]
+
+
+def _bars(seed: int = 0, gaps: bool = True) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=400, freq="min", tz="UTC")
+    if gaps:
+        missing = np.zeros(index.size, dtype=bool)
+        missing[[50, 51, 52, 120, 300]] = True
+        missing[200:230] = True
+        index = index[~missing]
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, index.size)))
+    spread = rng.random((2, index.size)) * 1e-3
+    return pd.DataFrame({"close": close, "high": close * (1 + spread[0]), "low": close * (1 - spread[1])}, index=index)
+
+
+def _row_lookup(bars: pd.DataFrame, horizon: int, tolerance: timedelta):
+    stamps = bars.index
+    close, high, low = (bars[column].to_numpy() for column in ("close", "high", "low"))
+    simple, mfe, mae = (np.full(len(bars), np.nan) for _ in range(3))
+    gap = np.zeros(len(bars), dtype=bool)
+    for i, stamp in enumerate(stamps):
+        target = stamp + pd.Timedelta(minutes=horizon)
+        if target > stamps[-1]:
+            continue
+        j = int(stamps.searchsorted(target, side="right")) - 1
+        gap[i] = stamps[j] != target or j - i < horizon
+        if j > i and target - stamps[j] <= tolerance:
+            simple[i] = close[j] / close[i] - 1
+            mfe[i] = high[i + 1: j + 1].max() / close[i] - 1
+            mae[i] = low[i + 1: j + 1].min() / close[i] - 1
+    return simple, gap, mfe, mae
+
+
+@pytest.mark.parametrize("tolerance", [timedelta(0), timedelta(minutes=2)])
+def test_matrix_matches_row_lookup_across_gaps(tolerance):
+    bars = _bars()
+    matrix = forward_return_matrix(bars.index, bars["close"], HORIZONS, bars["high"], bars["low"], tolerance)
+    for column, horizon in enumerate(HORIZONS):
+        simple, gap, mfe, mae = _row_lookup(bars, horizon, tolerance)
+        np.testing.assert_allclose(matrix["simple"][:, column], simple, rtol=1e-12)
+        np.testing.assert_allclose(matrix["log"][:, column], np.log1p(simple), rtol=1e-9)
+        np.testing.assert_array_equal(matrix["gap"][:, column], gap)
+        np.testing.assert_allclose(matrix["mfe"][:, column], mfe, rtol=1e-12)
+        np.testing.assert_allclose(matrix["mae"][:, column], mae, rtol=1e-12)
+
+
+def test_a_missing_target_bar_never_stretches_the_horizon():
+    bars = _bars()
+    returns = compute_future_returns(bars["close"], [5])["fut_ret_5m"]
+    before_outage = bars.index[(bars.index >= "2024-01-01 03:15") & (bars.index < "2024-01-01 03:20")]
+    assert returns[before_outage].isna().all()
+
+
+def test_matches_row_shift_on_a_gap_free_series():
+    bars = _bars(gaps=False)
+    returns = compute_future_returns(bars["close"], HORIZONS, extended=True)
+    for horizon in HORIZONS:
+        shifted = bars["close"].shift(-horizon) / bars["close"] - 1
+        pd.testing.assert_series_equal(returns[f"fut_ret_{horizon}m"], shifted, check_names=False)
+        assert not returns[f"fut_gap_{horizon}m"].any()
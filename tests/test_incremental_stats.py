@@ -0,0 +1,69 @@
+"""``run_incremental`` against the exact grid in ``validator``."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation.src.sufficient_stats import SufficientStatsStore
+from validator import run_grid, run_incremental
+
+SETTINGS = {"horizons": [5], "tests": ["t-test"], "bootstrap": {}, "stability": {}}
+TASKS = [
+    ({"name": "indicator"}, {"name": "all", "condition": None}),
+    ({"name": "indicator"}, {"name": "eu", "condition": "session == 'eu'"}),
+]
+COLUMNS = ["indicator", "slice", "horizon", "mean_ret", "win_rate", "sample_size", "effect_size", "t_stat", "p_value"]
+
+
+def _dataset(days: int = 4, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=days * 288, freq="5min", tz="UTC")
+    returns = rng.normal(0.0, 1e-3, index.size)
+    returns[-1:] = np.nan
+    return pd.DataFrame(
+        {
+            "indicator": rng.normal(size=index.size),
+            "session": np.where(index.hour < 12, "asia", "eu"),
+            "fut_ret_5m": returns,
+        },
+        index=index,
+    )
+
+
+def _report(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows)[COLUMNS].sort_values(["slice", "horizon"]).reset_index(drop=True)
+
+
+def _assert_matches_exact(dataset: pd.DataFrame, root) -> None:
+    incremental = _report(run_incremental(dataset, TASKS, SETTINGS, str(root)))
+    exact = _report(run_grid(dataset, TASKS, SETTINGS))
+    pd.testing.assert_frame_equal(incremental, exact, check_dtype=False, rtol=1e-9)
+
+
+def test_incremental_report_matches_exact_grid(tmp_path):
+    _assert_matches_exact(_dataset(), tmp_path)
+
+
+def test_changed_values_with_same_row_counts_are_recomputed(tmp_path):
+    dataset = _dataset()
+    run_incremental(dataset, TASKS, SETTINGS, str(tmp_path))
+    store = SufficientStatsStore(tmp_path)
+    before = store.manifest()["days"]
+
+    corrected = dataset.copy()
+    day = corrected.index.normalize() == pd.Timestamp("2024-01-02", tz="UTC")
+    corrected.loc[day, "fut_ret_5m"] *= -1.0
+    corrected.loc[day, "indicator"] += 1.0
+    _assert_matches_exact(corrected, tmp_path)
+    after = store.manifest()["days"]
+    assert [key for key in before if before[key] != after[key]] == ["2024-01-02"]
+
+
+@pytest.mark.parametrize("days", [slice(0, 2), slice(2, 4)])
+def test_report_only_covers_days_of_the_current_dataset(tmp_path, days):
+    dataset = _dataset()
+    run_incremental(dataset, TASKS, SETTINGS, str(tmp_path))
+    dates = np.unique(dataset.index.normalize())[days]
+    narrower = dataset[dataset.index.normalize().isin(dates)]
+    _assert_matches_exact(narrower, tmp_path)
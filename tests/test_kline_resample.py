@@ -0,0 +1,67 @@
+"""``preprocessing.kline_resample`` against a pandas resample of the same bars."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing.kline_resample import bar_offset, resample_frame, resample_store
+from preprocessing.kline_store import KlineStore
+
+MINUTE_MS = 60_000
+START_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+def _minute_bars(count: int, seed: int = 0, gap: slice = slice(95, 130)) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    opens = START_MS + MINUTE_MS * np.delete(np.arange(count, dtype=np.int64), np.arange(count)[gap])
+    close = 100.0 + np.cumsum(rng.normal(size=opens.size))
+    open_ = close + rng.normal(size=opens.size)
+    return pd.DataFrame(
+        {
+            "timestamp": opens + bar_offset(MINUTE_MS),
+            "open": open_,
+            "high": np.maximum(open_, close) + rng.random(opens.size),
+            "low": np.minimum(open_, close) - rng.random(opens.size),
+            "close": close,
+            "volume": rng.random(opens.size) * 10,
+        }
+    )
+
+
+def _pandas_resample(bars: pd.DataFrame, target: str, target_ms: int) -> pd.DataFrame:
+    opened = bars.assign(opened=pd.to_datetime(bars["timestamp"] - bar_offset(MINUTE_MS), unit="ms"))
+    frame = (
+        opened.set_index("opened")
+        .resample(target)
+        .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+        .dropna(subset=["open"])
+    )
+    open_ms = frame.index.as_unit("ms").asi8
+    return frame.reset_index(drop=True).assign(timestamp=open_ms + bar_offset(target_ms))[list(bars.columns)]
+
+
+@pytest.mark.parametrize("target, target_ms", [("5min", 5 * MINUTE_MS), ("15min", 15 * MINUTE_MS), ("1h", 60 * MINUTE_MS)])
+def test_resample_matches_pandas_resample(target, target_ms):
+    bars = _minute_bars(24 * 60)
+    result = resample_frame(bars, MINUTE_MS, target_ms)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), _pandas_resample(bars, target, target_ms))
+
+
+def test_incomplete_trailing_bucket_is_dropped():
+    bars = _minute_bars(63)
+    assert resample_frame(bars, MINUTE_MS, 5 * MINUTE_MS)["timestamp"].iloc[-1] == START_MS + 55 * MINUTE_MS + bar_offset(
+        5 * MINUTE_MS
+    )
+    assert len(resample_frame(bars, MINUTE_MS, 5 * MINUTE_MS, drop_incomplete_tail=False)) == 13
+
+
+def test_incremental_store_resample_matches_full_rebuild(tmp_path):
+    bars = _minute_bars(3 * 24 * 60)
+    source = KlineStore(tmp_path, "BTCUSDT", "1m")
+    for lo in range(0, len(bars), 1000):
+        source.append(bars.iloc[lo:lo + 1000])
+        resample_store(source, "15m")
+    incremental = KlineStore(tmp_path, "BTCUSDT", "15m").read()
+    full = resample_frame(bars, MINUTE_MS, 15 * MINUTE_MS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(incremental.reset_index(drop=True), full)
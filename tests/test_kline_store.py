@@ -0,0 +1,61 @@
+"""Buffered appends and series selection in ``preprocessing.kline_store``."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing.kline_store import KlineStore, load_klines
+
+INTERVAL_MS = 60_000
+START_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+def _bars(first: int, count: int, price: float = 1.0) -> pd.DataFrame:
+    timestamps = START_MS + 29_999 + INTERVAL_MS * np.arange(first, first + count, dtype=np.int64)
+    values = np.full(count, price)
+    return pd.DataFrame(
+        {"timestamp": timestamps, "open": values, "high": values, "low": values, "close": values, "volume": values}
+    )
+
+
+def test_buffered_append_rewrites_each_partition_once_per_flush(tmp_path, monkeypatch):
+    writes = []
+    original = KlineStore._write_partition
+
+    def counting_write(self, key, frame):
+        writes.append(key)
+        original(self, key, frame)
+
+    monkeypatch.setattr(KlineStore, "_write_partition", counting_write)
+    store = KlineStore(tmp_path, "BTCUSDT", "1m", buffer_rows=50_000)
+    for first in range(0, 44_640, 1000):  # January 2024 in 1000-bar batches
+        store.append(_bars(first, min(1000, 44_640 - first)))
+    assert writes == []
+    assert store.manifest().last_timestamp is None
+
+    store.flush()
+    assert writes == ["2024-01"]
+    assert store.manifest().ranges == [[START_MS + 29_999, START_MS + 29_999 + INTERVAL_MS * 44_639]]
+    assert len(store.read()) == 44_640
+
+
+def test_unbuffered_append_writes_immediately(tmp_path):
+    store = KlineStore(tmp_path, "BTCUSDT", "1m")
+    store.append(_bars(0, 10))
+    store.append(_bars(5, 10, price=2.0))
+    frame = store.read()
+    assert frame["timestamp"].is_monotonic_increasing and len(frame) == 15
+    assert (frame["close"].to_numpy()[5:] == 2.0).all()
+
+
+def test_load_klines_refuses_to_mix_series(tmp_path):
+    KlineStore(tmp_path, "BTCUSDT", "1m").append(_bars(0, 10, price=1.0))
+    KlineStore(tmp_path, "ETHUSDT", "1m").append(_bars(0, 10, price=2.0))
+
+    with pytest.raises(ValueError, match="several kline series"):
+        load_klines(tmp_path)
+    eth = load_klines(tmp_path, symbol="ethusdt", interval="1m")
+    assert len(eth) == 10 and (eth["close"] == 2.0).all()
+    assert len(load_klines(tmp_path, series=["BTCUSDT_1m"])) == 10
+    assert load_klines(tmp_path, symbol="SOLUSDT").empty
@@ -0,0 +1,61 @@
+"""Batched IRLS in ``validator.fit_logistic_batch`` against statsmodels ``Logit``."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import statsmodels.api as sm
+
+from validator import LOGIT_MIN_ROWS, fit_logistic_batch, run_logistic_regression
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(11)
+    n = 3_000
+    feature = rng.normal(2.0, 3.0, n)
+    feature[rng.random(n) < 0.03] = np.nan
+    signal = 0.4 * (feature - 2.0) / 3.0
+    targets = np.column_stack([signal * scale + rng.logistic(size=n) for scale in (1.0, 0.5, 0.0)])
+    targets[rng.random(targets.shape) < 0.05] = np.nan
+    return feature, targets
+
+
+def _statsmodels_fit(feature: np.ndarray, target: np.ndarray):
+    valid = ~np.isnan(feature) & ~np.isnan(target)
+    x = feature[valid]
+    z = (x - x.mean()) / x.std()
+    return sm.Logit((target[valid] > 0).astype(float), sm.add_constant(z)).fit(disp=0, tol=1e-12)
+
+
+def test_batch_matches_statsmodels_logit_per_column(data):
+    feature, targets = data
+    fit = fit_logistic_batch(feature, targets)
+    assert fit["converged"].all()
+    for column in range(targets.shape[1]):
+        res = _statsmodels_fit(feature, targets[:, column])
+        assert fit["n"][column] == res.nobs
+        assert fit["intercept"][column] == pytest.approx(res.params[0], rel=1e-7, abs=1e-10)
+        assert fit["coef"][column] == pytest.approx(res.params[1], rel=1e-7, abs=1e-10)
+        assert fit["se"][column] == pytest.approx(res.bse[1], rel=1e-7)
+        assert fit["p_value"][column] == pytest.approx(res.pvalues[1], rel=1e-6, abs=1e-12)
+
+
+def test_batch_matches_single_fits_and_warm_starts(data):
+    feature, targets = data
+    fit = fit_logistic_batch(feature, targets)
+    for column in range(targets.shape[1]):
+        coef, p_value = run_logistic_regression(feature, targets[:, column])
+        assert (coef, p_value) == pytest.approx((fit["coef"][column], fit["p_value"][column]), rel=1e-9)
+    start = np.column_stack([fit["intercept"], fit["coef"]])[::-1]
+    warm = fit_logistic_batch(feature, targets, start=start)
+    np.testing.assert_allclose(warm["coef"], fit["coef"], rtol=1e-9)
+
+
+def test_degenerate_columns_are_nan(data):
+    feature, targets = data
+    few = np.full(len(feature), np.nan)
+    few[: LOGIT_MIN_ROWS - 1] = 1.0
+    features = np.column_stack([feature, np.ones(len(feature)), feature])
+    fit = fit_logistic_batch(features, np.column_stack([targets[:, 0], targets[:, 0], few]))
+    assert np.isfinite(fit["coef"][0])
+    assert np.isnan(fit["coef"][1:]).all() and np.isnan(fit["p_value"][1:]).all()
@@ -0,0 +1,67 @@
+"""Parallel and per-group fits in ``run_regressions`` against serial statsmodels fits."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from validation.src.multivariate import _design_matrix, run_regressions
+
+CONTROLS = ("state_tag", "session_id")
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(21)
+    n = 800
+    frame = pd.DataFrame(
+        {
+            "scene": rng.choice(["S1", "S2", "S3"], size=n),
+            "state_tag": rng.choice(["trend", "range", "volatile"], size=n),
+            "session_id": rng.choice(["asia", "eu", "us"], size=n),
+            "U1": rng.integers(0, 2, size=n),
+            "U2": rng.integers(0, 2, size=n),
+            "U3": rng.integers(0, 2, size=n),
+        }
+    )
+    frame.loc[frame["scene"] == "S3", "U3"] = 1  # constant inside one group
+    frame["label"] = rng.poisson(0.5 + 0.3 * frame["U1"])
+    frame["fwd"] = rng.normal(0.1 * frame["U2"], 1.0)
+    return frame
+
+
+@pytest.fixture(scope="module")
+def serial(frame):
+    return run_regressions(frame, "label", frame["fwd"], CONTROLS, group_column="state_tag")
+
+
+def test_workers_give_the_serial_result(frame, serial):
+    parallel = run_regressions(frame, "label", frame["fwd"], CONTROLS, workers=2, group_column="state_tag")
+    for name in ("frequency_model", "strength_model", "quantile_model"):
+        pd.testing.assert_frame_equal(getattr(parallel, name).params, getattr(serial, name).params)
+    for name in ("combinations", "state_breakdown", "combo_matrix", "group_models"):
+        pd.testing.assert_frame_equal(getattr(parallel, name), getattr(serial, name))
+
+
+def test_strength_model_matches_statsmodels_ols(frame, serial):
+    res = sm.OLS(frame["fwd"].astype(float), _design_matrix(frame, ("U1", "U2", "U3"), CONTROLS)).fit()
+    params = serial.strength_model.params.set_index("variable")
+    np.testing.assert_allclose(params["Coef."], res.params, rtol=1e-10)
+    np.testing.assert_allclose(params["Std.Err."], res.bse, rtol=1e-10)
+    np.testing.assert_allclose(params["P>|t|"], res.pvalues, rtol=1e-8)
+
+
+def test_group_models_drop_constant_columns(frame):
+    result = run_regressions(frame, "label", frame["fwd"], CONTROLS, group_column="scene")
+    X = _design_matrix(frame, ("U1", "U2", "U3"), CONTROLS)
+    for scene, group in frame.groupby("scene"):
+        X_group = X.loc[group.index]
+        X_group = X_group.loc[:, (X_group.nunique() > 1) | (X_group.columns == "const")]
+        res = sm.OLS(group["fwd"].astype(float), X_group).fit()
+        fitted = result.group_models.query("group == @scene and model == 'ols'").set_index("variable")
+        assert list(fitted.index) == list(X_group.columns)
+        np.testing.assert_allclose(fitted["coef"], res.params, rtol=1e-10)
+        np.testing.assert_allclose(fitted["p_value"], res.pvalues, rtol=1e-8)
+    assert "U3" not in set(result.group_models.query("group == 'S3'")["variable"])
+    assert set(result.group_models["model"]) >= {"ols", "quantile_0.50"}
@@ -0,0 +1,80 @@
+"""Shared ``PartitionIndex`` groups against pandas ``groupby`` and boolean filters."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation.src.multivariate import _build_combo_matrix, _state_breakdown
+from validation.src.partitions import PARTITION_COLUMNS, PartitionIndex
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(20)
+    n = 600
+    frame = pd.DataFrame(
+        {
+            "scene": rng.choice(["S2", "S1", "S3"], size=n),
+            "state_tag": rng.choice(["trend", "range", "volatile"], size=n),
+            "session_id": rng.choice(["asia", "eu", "us"], size=n),
+            "U1": rng.integers(0, 2, size=n),
+            "U2": (rng.random(n) < 0.2).astype(float),
+            "U3": rng.integers(-1, 2, size=n),
+            "label": rng.integers(0, 2, size=n),
+        }
+    )
+    frame.loc[rng.random(n) < 0.05, "scene"] = np.nan
+    return frame
+
+
+def test_partitions_match_groupby(frame):
+    index = PartitionIndex.build(frame)
+    assert set(index.partitions) == set(PARTITION_COLUMNS)
+    for column in PARTITION_COLUMNS:
+        partition = index.partition(column)
+        groups = frame.groupby(column).indices
+        assert list(partition.categories) == list(groups)
+        for label, rows in partition.groups():
+            np.testing.assert_array_equal(rows, groups[label])
+        np.testing.assert_array_equal(partition.counts, [len(groups[label]) for label in groups])
+        assert partition.codes[frame[column].isna().to_numpy()].tolist() == [-1] * int(frame[column].isna().sum())
+
+
+def test_triggered_rows_and_totals_match_filters(frame):
+    index = PartitionIndex.build(frame)
+    scenes = index.partition("scene")
+    labels = frame["label"].to_numpy(dtype=float)
+    for meta in ("U1", "U2", "U3"):
+        triggered = frame[meta] > 0
+        np.testing.assert_array_equal(index.triggered(meta), triggered.to_numpy())
+        np.testing.assert_array_equal(scenes.totals(index.triggered(meta)), frame[triggered].groupby("scene").size())
+        np.testing.assert_allclose(
+            scenes.totals(index.triggered(meta), labels), frame[triggered].groupby("scene")["label"].sum()
+        )
+        for code, scene in enumerate(scenes.categories):
+            expected = np.flatnonzero((frame["scene"] == scene) & triggered)
+            np.testing.assert_array_equal(index.triggered_rows("scene", code, meta), expected)
+
+
+def _groupby_hits(frame: pd.DataFrame, column: str) -> pd.DataFrame:
+    # The previous per-stage path: groupby, then re-filter each group per meta.
+    records = []
+    for category, group in frame.groupby(column):
+        for meta in ("U1", "U2", "U3"):
+            subset = group[group[meta] > 0]
+            records.append(
+                {
+                    column: category,
+                    "meta_signal": meta,
+                    "N": len(subset),
+                    "hit_rate": subset["label"].mean() if len(subset) else np.nan,
+                }
+            )
+    return pd.DataFrame(records)
+
+
+def test_combo_matrix_and_state_breakdown_match_groupby(frame):
+    index = PartitionIndex.build(frame)
+    pd.testing.assert_frame_equal(_build_combo_matrix(frame, ("U1", "U2", "U3"), "label", index), _groupby_hits(frame, "scene"))
+    pd.testing.assert_frame_equal(_state_breakdown(frame, ("U1", "U2", "U3"), "label"), _groupby_hits(frame, "state_tag"))
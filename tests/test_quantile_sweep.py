@@ -0,0 +1,53 @@
+"""Banded ``quantile_sweep`` against one statsmodels ``QuantReg`` fit per quantile."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from validation.src.multivariate import quantile_sweep, run_regressions
+
+QUANTILES = [0.9, 0.1, 0.25, 0.5, 0.75, 0.5]
+
+
+@pytest.fixture(scope="module")
+def design():
+    rng = np.random.default_rng(22)
+    n = 500
+    X = sm.add_constant(pd.DataFrame({"U1": rng.integers(0, 2, size=n).astype(float), "x": rng.normal(size=n)}))
+    y = pd.Series(0.2 * X["U1"] + 0.5 * X["x"] + rng.standard_t(3, size=n))
+    return X, y
+
+
+def test_sweep_matches_one_quantreg_fit_per_quantile(design):
+    X, y = design
+    surface = quantile_sweep(X, y, QUANTILES)
+    assert surface["quantile"].unique().tolist() == sorted(set(QUANTILES))
+    for q, block in surface.groupby("quantile"):
+        res = sm.QuantReg(y, X).fit(q=q)
+        assert block["variable"].tolist() == list(X.columns)
+        np.testing.assert_allclose(block["coef"], res.params, rtol=1e-10)
+        np.testing.assert_allclose(block["std_err"], res.bse, rtol=1e-10)
+        np.testing.assert_allclose(block["p_value"], res.pvalues, rtol=1e-8)
+
+
+def test_bands_in_a_pool_give_the_serial_surface(design):
+    X, y = design
+    pd.testing.assert_frame_equal(quantile_sweep(X, y, QUANTILES, workers=3), quantile_sweep(X, y, QUANTILES))
+
+
+def test_out_of_range_and_empty_grids(design):
+    X, y = design
+    with pytest.raises(ValueError, match="strictly between 0 and 1"):
+        quantile_sweep(X, y, [0.5, 1.0])
+    assert quantile_sweep(X, y, []).empty
+
+
+def test_run_regressions_surface_uses_the_strength_design(design):
+    X, y = design
+    session = np.where(np.arange(len(y)) % 3, "eu", "us")
+    frame = X.drop(columns="const").assign(session_id=session, state_tag="trend", scene="S1", label=np.arange(len(y)) % 4)
+    result = run_regressions(frame, "label", y, ["session_id"], meta_signals=("U1",), quantiles=[0.5])
+    median = result.quantile_surface.set_index("variable")["coef"]
+    np.testing.assert_allclose(median, result.quantile_model.params.set_index("variable")["coef"], rtol=1e-10)
@@ -0,0 +1,69 @@
+"""``validator.rolling_window_detail`` against a window-by-window loop."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validator import ValidationError, rolling_window_detail, rolling_window_stability
+
+
+def _series(seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=30 * 24, freq="h", tz="UTC")
+    values = rng.normal(0.1, 1.0, index.size)
+    values[rng.random(index.size) < 0.05] = np.nan
+    keep = ~((index >= "2024-01-10") & (index < "2024-01-14"))  # a data outage
+    return pd.Series(values, index=index)[keep]
+
+
+def _window_loop(series: pd.Series, window: timedelta, step: timedelta) -> pd.DataFrame:
+    series = series.dropna()
+    records = []
+    start = series.index.min()
+    while start <= series.index.max():
+        segment = series[(series.index >= start) & (series.index < start + window)]
+        if not segment.empty:
+            sign = np.sign(segment.mean())
+            records.append(
+                {
+                    "window_start": start,
+                    "window_end": start + window,
+                    "count": len(segment),
+                    "mean": segment.mean(),
+                    "agreement": np.mean(np.sign(segment) == sign) if sign != 0 else np.nan,
+                }
+            )
+        start += step
+    return pd.DataFrame(records)
+
+
+@pytest.mark.parametrize(
+    "window, step",
+    [
+        (timedelta(days=7), timedelta(days=7)),
+        (timedelta(days=7), timedelta(days=2)),
+        (timedelta(days=5), timedelta(days=3)),
+        (timedelta(hours=36), timedelta(hours=12)),
+    ],
+)
+def test_detail_matches_the_window_loop(window, step):
+    series = _series()
+    detail = rolling_window_detail(series, window, step)
+    expected = _window_loop(series, window, step)
+    pd.testing.assert_frame_equal(detail, expected, check_dtype=False, check_exact=False, rtol=1e-12)
+
+    score, _ = rolling_window_stability(series, window, step)
+    assert score == pytest.approx(expected["agreement"].mean())
+
+
+def test_step_defaults_to_the_window_and_must_be_positive():
+    series = _series(1)
+    window = timedelta(days=4)
+    pd.testing.assert_frame_equal(rolling_window_detail(series, window), rolling_window_detail(series, window, window))
+    with pytest.raises(ValidationError):
+        rolling_window_detail(series, window, timedelta(0))
+    score, detail = rolling_window_stability(series.iloc[0:0], window)
+    assert np.isnan(score) and detail.empty
@@ -0,0 +1,73 @@
+"""Single-pass segmented stability against pandas rolling means per (scene, meta)."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation.src.stability import compute_stability, segmented_stability
+
+
+def _rolling_stability(series: pd.Series, window: int) -> float:
+    # The previous per-series path.
+    if series.empty:
+        return float("nan")
+    window = min(window, len(series))
+    if window < 10:
+        window = max(5, len(series))
+    rolling = series.rolling(window=window, min_periods=max(3, window // 3)).mean()
+    return float((rolling >= 0.5).mean())
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(23)
+    n = 1_200
+    return pd.DataFrame(
+        {
+            "scene": rng.choice(["S1", "S2", "S3", "RARE"], size=n, p=[0.45, 0.35, 0.195, 0.005]),
+            "U1": rng.integers(0, 2, size=n),
+            "U2": (rng.random(n) < 0.05).astype(int),  # short series
+            "U3": 0,  # never triggers
+            "label": (rng.random(n) < 0.5).astype(int),
+        }
+    )
+
+
+@pytest.mark.parametrize("window", [3, 8, 40, 90])
+def test_segments_match_rolling_means(window):
+    rng = np.random.default_rng(window)
+    lengths = np.array([0, 1, 4, 7, 12, 95, 300, 0])
+    values = (rng.random(lengths.sum()) < 0.55).astype(float)
+    values[rng.random(values.size) < 0.05] = np.nan
+    starts = np.concatenate(([0], np.cumsum(lengths)))
+    expected = [_rolling_stability(pd.Series(values[lo:hi]), window) for lo, hi in zip(starts[:-1], starts[1:])]
+    np.testing.assert_allclose(segmented_stability(values, lengths, window), expected, rtol=1e-12)
+
+
+def _per_pair(frame: pd.DataFrame, window: int) -> pd.DataFrame:
+    records = []
+    for scene, scene_df in frame.groupby("scene"):
+        for meta in ("U1", "U2", "U3"):
+            labels = scene_df.loc[scene_df[meta] > 0, "label"].reset_index(drop=True)
+            if len(labels):
+                stability = _rolling_stability(labels.astype(float), window)
+                records.append({"scene": scene, "meta_signal": meta, "stability": stability, "N": len(labels)})
+    return pd.DataFrame(records)
+
+
+def test_compute_stability_matches_per_pair_rolling(frame):
+    result = compute_stability(frame, "label", window_grid=[20, 90])
+    expected = _per_pair(frame, 90)
+    pd.testing.assert_frame_equal(result.metrics, expected, check_dtype=False)
+    assert result.score == pytest.approx(expected["stability"].mean())
+    assert "U3" not in set(result.metrics["meta_signal"])
+    for window, block in result.sensitivity.groupby("window"):
+        pd.testing.assert_frame_equal(
+            block.drop(columns="window").reset_index(drop=True), _per_pair(frame, window), check_dtype=False
+        )
+
+
+def test_no_triggers_scores_zero(frame):
+    result = compute_stability(frame.assign(U1=0, U2=0), "label", window_grid=[20])
+    assert result.metrics.empty and result.sensitivity.empty and result.score == 0.0
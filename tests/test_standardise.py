@@ -0,0 +1,70 @@
+"""Column-wise standardisation and lazy payloads against per-row ``standardise``."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from preprocessing.data_preprocessor import LEGACY_ALIASES, STANDARD_FIELDS, LazyPayloads, standardise, standardise_frame
+from validation.src.loaders import _generate_indicator_frame, load_dataset
+
+
+def _same(left, right) -> bool:
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(_same(left[key], right[key]) for key in left)
+    if pd.isna(left) and pd.isna(right):
+        return True
+    return left == right
+
+
+def _row_payload(record: pd.Series, names=None) -> dict:
+    # The previous per-row path: one nested dict per row through ``standardise``.
+    names = names or {category: fields for category, fields in STANDARD_FIELDS.items()}
+    return standardise(
+        {category: {name: record[name] for name in fields if name in record.index} for category, fields in names.items()}
+    )
+
+
+def test_lazy_payloads_match_per_row_standardise():
+    generated = _generate_indicator_frame(60)
+    frame, payloads = load_dataset(size=60)
+    assert len(payloads) == 60
+    for row in (0, 17, 59, -1):
+        assert _same(payloads[row], _row_payload(generated.iloc[row]))
+    assert all(_same(left, right) for left, right in zip(payloads[10:13], list(payloads)[10:13]))
+    with pytest.raises(IndexError):
+        payloads[60]
+
+
+@pytest.fixture
+def legacy_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(4)
+    legacy = {category: list(aliases)[:3] for category, aliases in LEGACY_ALIASES.items()}
+    columns = {name: rng.normal(size=8) for names in legacy.values() for name in names}
+    columns.update({"near_poc": rng.normal(size=8), "scene": ["A"] * 8})
+    return pd.DataFrame(columns)
+
+
+def test_frame_renames_legacy_columns_like_the_row_path(legacy_frame):
+    standard = standardise_frame(legacy_frame)
+    names = {
+        category: list(LEGACY_ALIASES[category])[:3] + (["near_poc"] if category == "MSI" else [])
+        for category in STANDARD_FIELDS
+    }
+    payloads = LazyPayloads(standard)
+    for row in range(len(legacy_frame)):
+        assert _same(payloads[row], _row_payload(legacy_frame.iloc[row], names))
+    assert standard["scene"].tolist() == ["A"] * 8
+
+    table = standardise_frame(pa.Table.from_pandas(legacy_frame, preserve_index=False))
+    assert table.column_names == list(standard.columns)
+    assert all(_same(left, right) for left, right in zip(LazyPayloads(table), payloads))
+
+
+def test_ambiguous_and_unknown_columns_are_rejected(legacy_frame):
+    legacy, standard = next(iter(LEGACY_ALIASES["MFI"].items()))
+    with pytest.raises(KeyError, match="Both legacy and standard"):
+        standardise_frame(legacy_frame.assign(**{legacy: 1.0, standard: 2.0}))
+    with pytest.raises(KeyError, match="Unknown fields"):
+        standardise_frame(legacy_frame, strict=True)
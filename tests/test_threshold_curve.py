@@ -0,0 +1,63 @@
+"""Sorted-array threshold sweeps in ``validator`` against direct comparisons."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validator import THRESHOLD_SENSITIVITY, SliceIndex, threshold_curve, threshold_sensitivity
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(5)
+    n = 2_000
+    indicator = np.round(rng.normal(size=n), 2)  # plenty of ties
+    indicator[rng.random(n) < 0.05] = np.nan
+    future = {
+        "fut_ret_5m": rng.normal(0, 1e-3, n),
+        "fut_ret_15m": np.where(rng.random(n) < 0.1, np.nan, rng.normal(0, 2e-3, n)),
+    }
+    return indicator, future
+
+
+def test_curve_matches_direct_comparisons(data):
+    indicator, future = data
+    series = pd.Series(indicator)
+    thresholds = [-3.0, -0.5, 0.0, 0.25, 0.5, 1.27, 5.0]
+    curve = threshold_curve(indicator, future, thresholds=thresholds)
+    for row in curve.itertuples():
+        triggered = series > row.threshold
+        returns = pd.Series(future[row.horizon])[triggered].dropna()
+        assert row.triggers == triggered.sum()
+        assert row.trigger_rate == pytest.approx(triggered.mean())
+        assert row.sample_size == len(returns)
+        if len(returns):
+            assert row.mean_ret == pytest.approx(returns.mean(), rel=1e-9, abs=1e-15)
+            assert row.hit_rate == pytest.approx((returns > 0).mean())
+        else:
+            assert np.isnan(row.mean_ret) and np.isnan(row.hit_rate)
+
+
+def test_default_thresholds_are_distinct_quantiles(data):
+    indicator, _ = data
+    curve = threshold_curve(indicator, n_points=50)
+    thresholds = curve["threshold"].to_numpy()
+    assert (np.diff(thresholds) > 0).all() and thresholds.size <= 50
+    assert thresholds[0] == np.nanmin(indicator) and thresholds[-1] == np.nanmax(indicator)
+    np.testing.assert_allclose(curve["trigger_rate"], [(indicator > t).mean() for t in thresholds])
+
+
+@pytest.mark.parametrize("base", [0.5, -1.2, 0.01])
+def test_sensitivity_matches_direct_comparisons(data, base):
+    indicator, _ = data
+    series = pd.Series(indicator)
+    rate = (series > base).mean()
+    expected = np.mean(
+        [abs((series > base * factor).mean() - rate) for factor in (1 - THRESHOLD_SENSITIVITY, 1 + THRESHOLD_SENSITIVITY)]
+    )
+    slice_index = SliceIndex(pd.DataFrame({"indicator": indicator}))
+    assert threshold_sensitivity(indicator, base) == pytest.approx(expected)
+    assert threshold_sensitivity(indicator, base, slice_index.sorted_values("indicator")) == pytest.approx(expected)
+    assert slice_index.sorted_values("indicator") is slice_index.sorted_values("indicator")
+    assert np.isnan(threshold_sensitivity(indicator, 0.0))
@@ -0,0 +1,64 @@
+"""One-sort quantile thresholds and packed trigger sets against pandas and boolean masks."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation.src.triggers import TriggerSet, build_trigger_grid, build_trigger_matrix, quantile_thresholds
+
+QUANTILES = [0.0, 0.05, 0.1, 0.333, 0.5, 0.9, 0.95, 0.999, 1.0]
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(25)
+    n = 1_003  # not a multiple of eight: the last byte carries padding bits
+    frame = pd.DataFrame(
+        {
+            "cvd_z": rng.normal(size=n),
+            "imbalance": np.round(rng.uniform(-1, 1, size=n), 1),  # heavy ties
+            "vol_pctl": rng.exponential(1e6, size=n),
+        }
+    )
+    frame.loc[rng.random(n) < 0.1, "cvd_z"] = np.nan
+    return frame
+
+
+def test_thresholds_match_series_quantile(frame):
+    for column in frame:
+        expected = frame[column].quantile(QUANTILES).to_numpy()
+        np.testing.assert_array_equal(quantile_thresholds(frame[column].to_numpy(), QUANTILES), expected)
+    assert np.isnan(quantile_thresholds(np.full(4, np.nan), [0.5])).all()
+
+
+def test_grid_triggers_match_comparisons(frame):
+    grid = build_trigger_grid(frame, list(frame) + ["missing"], QUANTILES)
+    assert list(grid.thresholds.index) == list(frame)
+    for column in frame:
+        for q in QUANTILES:
+            mask = (frame[column] >= frame[column].quantile(q)).to_numpy()
+            np.testing.assert_array_equal(grid.trigger(column, q).mask(), mask)
+            assert grid.counts().at[column, q] == mask.sum()
+
+
+def test_set_operations_match_boolean_masks(frame):
+    left = (frame["cvd_z"] > 0).to_numpy()
+    right = (frame["imbalance"] >= 0.5).to_numpy()
+    a, b = TriggerSet.from_mask(left), TriggerSet.from_mask(right)
+    for trigger, mask in ((a & b, left & right), (a | b, left | right), (~a, ~left), (~(a | b), ~(left | right))):
+        np.testing.assert_array_equal(trigger.mask(), mask)
+        assert trigger.count() == mask.sum() and len(trigger) == mask.size
+    assert (~TriggerSet.from_mask(np.zeros(11, dtype=bool))).count() == 11
+    with pytest.raises(ValueError, match="rows"):
+        a & TriggerSet.from_mask(left[:-1])
+
+
+def test_trigger_matrix_matches_the_int_columns(frame):
+    summary = build_trigger_matrix(frame, ["cvd_z", "vol_pctl"], quantile=0.9)
+    for column in ("cvd_z", "vol_pctl"):
+        threshold = frame[column].quantile(0.9)
+        assert summary.thresholds[column] == threshold
+        pd.testing.assert_series_equal(
+            summary.matrix[column], (frame[column] >= threshold).astype(int), check_dtype=False
+        )
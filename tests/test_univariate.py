@@ -0,0 +1,89 @@
+"""Grouped Welch tests in ``compute_univariate`` against a per-cell scipy loop."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from validation.src.partitions import PartitionIndex
+from validation.src.univariate import UnivariateConfig, _stability_score, compute_univariate
+
+METRICS = ["cvd_z", "imbalance", "vol_pctl"]
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(19)
+    n = 1_500
+    frame = pd.DataFrame({metric: rng.normal(size=n) for metric in METRICS})
+    frame["scene"] = rng.choice(["S1", "S2", "S3", "TINY"], size=n, p=[0.4, 0.3, 0.29, 0.01])
+    frame.loc[rng.random(n) < 0.02, "scene"] = None  # rows outside every scene
+    for name in ("RE", "HV", "HF"):
+        frame[name] = rng.integers(0, 2, size=n)
+    for name in ("U1", "U2", "U3"):
+        frame[name] = (rng.random(n) < 0.6).astype(float)
+    frame["label"] = (rng.random(n) < 0.3 + 0.1 * (frame["cvd_z"] > 0)).astype(int)
+    return frame
+
+
+def _config(**overrides) -> UnivariateConfig:
+    settings = dict(metrics=METRICS + ["missing"], min_samples=50, fdr_alpha=0.1, stability_threshold=0.2)
+    settings.update(overrides)
+    return UnivariateConfig(**settings)
+
+
+def _cell_loop(df: pd.DataFrame, config: UnivariateConfig) -> pd.DataFrame:
+    # The previous path: one scipy Welch test per scene x filter x meta x metric.
+    records = []
+    for scene, scene_df in df.groupby(config.scene_column):
+        for filter_name in config.filters:
+            filter_rate = float((scene_df[filter_name].astype(int) > 0).mean())
+            for meta in config.meta_signals:
+                subset = scene_df[scene_df[meta] > 0]
+                y = subset["label"]
+                for metric in METRICS:
+                    pos, neg = subset.loc[y == 1, metric], subset.loc[y == 0, metric]
+                    if len(pos) < 5 or len(neg) < 5:
+                        continue
+                    t_stat, p_value = stats.ttest_ind(pos, neg, equal_var=False)
+                    records.append(
+                        {
+                            "scene": scene,
+                            "filter": filter_name,
+                            "meta_signal": meta,
+                            "metric": metric,
+                            "N": len(subset),
+                            "filter_rate": filter_rate,
+                            "hit_rate": float(y.mean()),
+                            "uplift": pos.mean() - neg.mean(),
+                            "t_stat": t_stat,
+                            "p_value": p_value,
+                            "stability": _stability_score(y.reset_index(drop=True)),
+                        }
+                    )
+    return pd.DataFrame(records).sort_values(["scene", "metric"], kind="stable").reset_index(drop=True)
+
+
+def test_summary_matches_per_cell_scipy_tests(frame):
+    config = _config()
+    summary = compute_univariate(frame, "label", config).summary
+    expected = _cell_loop(frame, config)
+    assert "TINY" not in set(summary["scene"])
+    assert len(summary) == len(expected)
+    pd.testing.assert_frame_equal(summary[expected.columns], expected, check_dtype=False, rtol=1e-9)
+    assert summary["p_adjusted"].ge(summary["p_value"] - 1e-12).all()
+
+
+def test_shared_partitions_give_the_same_summary(frame):
+    config = _config()
+    partitions = PartitionIndex.build(frame, ["scene", "state_tag"], config.meta_signals)
+    pd.testing.assert_frame_equal(
+        compute_univariate(frame, "label", config, partitions).summary,
+        compute_univariate(frame, "label", config).summary,
+    )
+
+
+def test_no_positive_labels_is_rejected(frame):
+    with pytest.raises(ValueError, match="no positive samples"):
+        compute_univariate(frame.assign(label=0), "label", _config())
@@ -0,0 +1,79 @@
+"""Parquet loading for validator v2 against a plain pandas read, filter and merge."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing.kline_store import KlineStore
+from validation.src.loaders import DataSource, load_features, load_parquet_dataset
+
+MINUTE_MS = 60_000
+START = pd.Timestamp("2024-01-01", tz="UTC")
+
+
+def _ms(stamps: pd.Series) -> np.ndarray:
+    return ((stamps - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)).to_numpy(dtype=np.int64)
+
+
+@pytest.fixture
+def features(tmp_path):
+    rng = np.random.default_rng(9)
+    stamps = START + pd.to_timedelta(np.arange(3 * 24 * 60), unit="min")
+    frame = pd.DataFrame(
+        {
+            "timestamp": stamps,
+            "cvd_z": rng.normal(size=stamps.size),
+            "delta": rng.normal(size=stamps.size),  # legacy name of bar_delta
+            "scene": np.where(np.arange(stamps.size) % 2, "A", "B"),
+            "debug_note": "x",  # outside the schema, never projected
+        }
+    )
+    root = tmp_path / "features"
+    root.mkdir()
+    for day, chunk in frame.groupby(frame["timestamp"].dt.date):
+        chunk.to_parquet(root / f"{day}.parquet", index=False, row_group_size=360)
+    return root, frame
+
+
+@pytest.fixture
+def klines(tmp_path, features):
+    _, frame = features
+    rng = np.random.default_rng(10)
+    opens = _ms(frame["timestamp"])
+    opens = np.delete(opens, np.arange(100, 160))  # a kline outage
+    close = 100 + np.cumsum(rng.normal(size=opens.size))
+    bars = pd.DataFrame(
+        {"timestamp": opens + 29_999, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0}
+    )
+    KlineStore(tmp_path / "klines", "BTCUSDT", "1m").append(bars)
+    return tmp_path / "klines", bars
+
+
+def test_load_features_projects_and_filters_like_pandas(features):
+    root, frame = features
+    loaded = load_features(root, start="2024-01-02 06:00", end="2024-01-03")
+    expected = frame[(frame["timestamp"] >= "2024-01-02 06:00") & (frame["timestamp"] < "2024-01-03")]
+    expected = expected.drop(columns="debug_note").reset_index(drop=True)
+    pd.testing.assert_frame_equal(loaded.reset_index(drop=True), expected, check_dtype=False)
+
+
+def test_parquet_dataset_matches_a_pandas_merge(features, klines):
+    root, frame = features
+    store_root, bars = klines
+    source = DataSource(kind="parquet", features=root, klines=store_root, symbol="btcusdt", start="2024-01-01 12:00")
+    dataset = load_parquet_dataset(source)
+
+    kept = frame[frame["timestamp"] >= "2024-01-01 12:00"].drop(columns="debug_note").rename(columns={"delta": "bar_delta"})
+    kept = kept.assign(bar_open=_ms(kept["timestamp"]))
+    joined = kept.merge(
+        bars.assign(bar_open=bars["timestamp"] - 29_999)[["bar_open", "open", "high", "low", "close"]], on="bar_open"
+    )
+    joined["return"] = joined["close"].pct_change().fillna(0.0)
+    expected = joined.drop(columns="bar_open").set_index("timestamp")
+
+    assert len(dataset) == len(expected)
+    for column in ["cvd_z", "bar_delta", "scene", "close", "return"]:
+        pd.testing.assert_series_equal(dataset[column], expected[column], check_dtype=False, check_index_type=False)
+    assert "debug_note" not in dataset.columns and "delta" not in dataset.columns
+    assert dataset["poc"].isna().all()  # schema fields absent from the export are null
@@ -0,0 +1,77 @@
+"""The ``validator`` indicator x slice grid: slice masks and the process pool."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validator import SliceIndex, ValidationError, apply_slice, open_shared_dataset, run_grid, share_dataset
+
+SETTINGS = {
+    "horizons": [5, 15],
+    "tests": ["t-test", "bootstrap", "spearman_corr", "logistic_regression"],
+    "bootstrap": {"n_iter": 200, "method": "block", "block_size": 10},
+    "stability": {"rolling_window": "48h", "rolling_step": "24h"},
+}
+SLICES = [
+    {"name": "all", "condition": None},
+    {"name": "eu", "condition": "session == 'eu'"},
+    {"name": "busy", "condition": "volume > 1.0 and absorption"},
+]
+
+
+@pytest.fixture(scope="module")
+def dataset() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2024-01-01", periods=6 * 288, freq="5min", tz="UTC", name="timestamp")
+    frame = pd.DataFrame(
+        {
+            "cvd_z": rng.normal(size=index.size),
+            "imbalance": rng.uniform(-1, 1, index.size),
+            "volume": rng.exponential(size=index.size),
+            "absorption": rng.random(index.size) < 0.3,
+            "session": np.where(index.hour < 8, "asia", np.where(index.hour < 16, "eu", "us")),
+            "fut_ret_5m": rng.normal(0, 1e-3, index.size),
+            "fut_ret_15m": rng.normal(0, 2e-3, index.size),
+        },
+        index=index,
+    )
+    frame.iloc[::11, 0] = np.nan
+    frame.iloc[-3:, -2:] = np.nan
+    return frame
+
+
+def _tasks():
+    indicators = [{"name": "cvd_z", "threshold": 1.5}, {"name": "imbalance"}]
+    return [(indicator, slice_cfg) for indicator in indicators for slice_cfg in SLICES]
+
+
+def test_shared_dataset_round_trips(dataset, tmp_path):
+    path = str(tmp_path / "dataset.arrow")
+    share_dataset(dataset, path)
+    shared = open_shared_dataset(path)
+    pd.testing.assert_frame_equal(shared, dataset, check_dtype=False, check_freq=False)
+    assert not shared["cvd_z"].to_numpy().flags.writeable  # a view of the mapped file
+
+
+def test_process_pool_matches_serial_grid(dataset):
+    serial = pd.DataFrame(run_grid(dataset, _tasks(), SETTINGS, workers=1))
+    pooled = pd.DataFrame(run_grid(dataset, _tasks(), SETTINGS, workers=2))
+    assert len(serial) == len(_tasks()) * len(SETTINGS["horizons"])
+    pd.testing.assert_frame_equal(pooled, serial)
+
+
+def test_slice_index_selects_the_rows_of_query(dataset):
+    slice_index = SliceIndex(dataset)
+    for slice_cfg in SLICES:
+        condition = slice_cfg["condition"]
+        expected = apply_slice(dataset, condition)
+        mask = slice_index.mask(condition)
+        assert (dataset.index[mask] == expected.index).all() and mask.sum() == len(expected)
+        np.testing.assert_array_equal(slice_index.values("cvd_z", condition), expected["cvd_z"].to_numpy())
+        assert slice_index.mask(f"  {condition or ''} ") is mask  # evaluated once per condition
+
+
+def test_slice_index_reports_bad_conditions(dataset):
+    with pytest.raises(ValidationError, match="Failed to evaluate slice condition"):
+        SliceIndex(dataset).mask("no_such_column > 1")
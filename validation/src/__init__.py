@@ -4,9 +4,11 @@ __all__ = [
     "labels",
     "loaders",
     "multivariate",
+    "partitions",
     "qc",
     "scenes",
     "stability",
+    "sufficient_stats",
     "triggers",
     "univariate",
     "writers",
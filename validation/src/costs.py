@@ -1,12 +1,28 @@
-"""Cost sensitivity analysis."""
+"""Cost sensitivity analysis.
+
+Per-trade cost in bps is ``turnover * (fill_ratio * maker_fee +
+(1 - fill_ratio) * (taker_fee + slippage))``: the passively filled share
+pays the maker fee, the rest crosses the spread and pays taker fee plus
+slippage, and ``turnover`` counts the notional traded per trade (1 for the
+entry only, 2 for a round trip).  ``cost_surface`` evaluates a whole grid of
+these assumptions per scene and meta-signal in one broadcast, so thousands of
+cost scenarios can be swept from one validator run.
+"""
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Iterable, Tuple
 
 import numpy as np
 import pandas as pd
 
+from validation.src.partitions import PartitionIndex
+
+META_SIGNALS = ("U1", "U2", "U3")
+BPS = 10_000.0
+GRID_AXES = ("taker_fee_bps", "maker_fee_bps", "slippage_bps", "fill_ratio")
+SURFACE_COLUMNS = ("cost_bps", "trades", "gross", "net", "net_sharpe", "net_hit_rate", "breakeven_slippage_bps")
+
 
 @dataclass
 class CostScenario:
@@ -14,6 +30,171 @@ class CostScenario:
     taker_fee_bps: float
     maker_fee_bps: float
     slippage_bps: float
+    fill_ratio: float = 0.0
+    turnover: float = 1.0
+
+
+def trade_cost_bps(taker_fee_bps, maker_fee_bps, slippage_bps, fill_ratio=0.0, turnover=1.0):
+    """Per-trade cost in bps; broadcasts over array arguments."""
+
+    return turnover * (fill_ratio * maker_fee_bps + (1.0 - fill_ratio) * (taker_fee_bps + slippage_bps))
+
+
+def _axis(value) -> np.ndarray:
+    """A grid axis from a scalar, a list or ``{start, stop, step}`` (stop inclusive)."""
+
+    if isinstance(value, dict):
+        start, stop, step = float(value["start"]), float(value["stop"]), float(value["step"])
+        return np.round(np.arange(start, stop + step / 2, step), 10)
+    return np.atleast_1d(np.asarray(value, dtype=float))
+
+
+@dataclass
+class CostGrid:
+    """Cartesian grid of taker fee x maker fee x slippage x fill ratio."""
+
+    taker_fee_bps: np.ndarray
+    maker_fee_bps: np.ndarray
+    slippage_bps: np.ndarray
+    fill_ratio: np.ndarray
+    turnover: float = 1.0
+
+    @classmethod
+    def from_dict(cls, payload: Dict | None) -> "CostGrid":
+        payload = payload or {}
+        axes = {name: _axis(payload.get(name, 0.0)) for name in GRID_AXES}
+        if np.any((axes["fill_ratio"] < 0) | (axes["fill_ratio"] > 1)):
+            raise ValueError("fill_ratio values must lie in [0, 1]")
+        return cls(**axes, turnover=float(payload.get("turnover", 1.0)))
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(getattr(self, name).size for name in GRID_AXES)
+
+    def mesh(self) -> Dict[str, np.ndarray]:
+        """Every axis broadcast to ``shape`` (``indexing="ij"``)."""
+
+        grids = np.meshgrid(*(getattr(self, name) for name in GRID_AXES), indexing="ij")
+        return dict(zip(GRID_AXES, grids))
+
+    def cost_bps(self) -> np.ndarray:
+        mesh = self.mesh()
+        return trade_cost_bps(
+            mesh["taker_fee_bps"], mesh["maker_fee_bps"], mesh["slippage_bps"], mesh["fill_ratio"], self.turnover
+        )
+
+
+def _trade_groups(
+    df: pd.DataFrame,
+    return_column: str,
+    scene_column: str,
+    meta_signals: Iterable[str],
+    partitions: PartitionIndex | None,
+) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Triggered trades per (scene, meta-signal): labels, sorted returns and offsets.
+
+    Returns are sorted within each group, so a group's trades are one
+    contiguous slice of the returned array.
+    """
+
+    meta_signals = [meta for meta in meta_signals if meta in df]
+    partitions = partitions or PartitionIndex.build(df, [scene_column], meta_signals)
+    scenes = partitions.partition(scene_column)
+    returns = df[return_column].to_numpy(dtype=float)
+    n_meta = len(meta_signals)
+    codes = []
+    values = []
+    for meta_code, meta in enumerate(meta_signals):
+        rows = np.flatnonzero(partitions.triggered(meta) & (scenes.codes >= 0) & np.isfinite(returns))
+        codes.append(scenes.codes[rows] * n_meta + meta_code)
+        values.append(returns[rows])
+    codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int64)
+    values = np.concatenate(values) if values else np.empty(0)
+    order = np.lexsort((values, codes))
+    counts = np.bincount(codes, minlength=len(scenes) * n_meta)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    groups = pd.DataFrame(
+        {
+            "scene": np.repeat(scenes.categories, n_meta),
+            "meta_signal": np.tile(np.asarray(meta_signals, dtype=object), len(scenes)),
+        }
+    )
+    return groups, values[order], offsets
+
+
+def cost_surface(
+    df: pd.DataFrame,
+    grid: CostGrid,
+    return_column: str = "forward_return",
+    scene_column: str = "scene",
+    meta_signals: Iterable[str] = META_SIGNALS,
+    partitions: PartitionIndex | None = None,
+    min_trades: int = 2,
+) -> pd.DataFrame:
+    """Net expectancy, Sharpe and hit rate per (scene, meta-signal) and grid point.
+
+    One row per group with at least ``min_trades`` triggered trades and per
+    point of ``grid``.  ``breakeven_slippage_bps`` is the slippage at which
+    the group's mean net return is zero given the row's fees and fill ratio
+    (infinite for fully passive fills, where slippage does not apply).
+    Sharpe is per trade, like ``evaluate_costs``.
+    """
+
+    groups, returns, offsets = _trade_groups(df, return_column, scene_column, meta_signals, partitions)
+    counts = np.diff(offsets)
+    keep = np.flatnonzero(counts >= max(min_trades, 2))
+    mesh = grid.mesh()
+    cost = grid.cost_bps().ravel() / BPS
+    if keep.size == 0 or cost.size == 0:
+        return pd.DataFrame(columns=["scene", "meta_signal", *GRID_AXES, *SURFACE_COLUMNS])
+
+    member = np.repeat(np.arange(counts.size), counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.bincount(member, weights=returns, minlength=counts.size) / counts
+        deviations = returns - means[member]
+        variances = np.bincount(member, weights=deviations * deviations, minlength=counts.size) / (counts - 1)
+    n = counts[keep].astype(float)
+    gross = means[keep]
+    volatility = np.sqrt(variances[keep])
+
+    # (groups, grid points) in one broadcast; a constant cost leaves the volatility unchanged.
+    net = gross[:, None] - cost[None, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        net_sharpe = np.where(volatility[:, None] > 0, net / volatility[:, None], 0.0)
+    # Trades beating each cost: every return is ranked once against the sorted
+    # costs, binned per (group, rank), and a reverse cumulative sum over the
+    # ranks counts the returns above each cost.
+    cost_order = np.argsort(cost, kind="stable")
+    rank = np.searchsorted(cost[cost_order], returns, side="left")
+    n_bins = cost.size + 1
+    binned = np.bincount(member * n_bins + rank, minlength=counts.size * n_bins).reshape(counts.size, n_bins)
+    above = np.cumsum(binned[keep, :0:-1], axis=1)[:, ::-1]
+    wins = np.empty_like(above)
+    wins[:, cost_order] = above
+
+    fill = mesh["fill_ratio"].ravel()
+    passive = grid.turnover * fill * mesh["maker_fee_bps"].ravel()
+    aggressive = grid.turnover * (1.0 - fill)
+    taker = mesh["taker_fee_bps"].ravel()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        breakeven = np.where(
+            aggressive > 0,
+            (gross[:, None] * BPS - passive) / aggressive - taker,
+            np.inf,
+        )
+
+    n_points = cost.size
+    surface = groups.iloc[np.repeat(keep, n_points)].reset_index(drop=True)
+    for name in GRID_AXES:
+        surface[name] = np.tile(mesh[name].ravel(), keep.size)
+    surface["cost_bps"] = np.tile(cost * BPS, keep.size)
+    surface["trades"] = np.repeat(counts[keep], n_points)
+    surface["gross"] = np.repeat(gross, n_points)
+    surface["net"] = net.ravel()
+    surface["net_sharpe"] = net_sharpe.ravel()
+    surface["net_hit_rate"] = (wins / n[:, None]).ravel()
+    surface["breakeven_slippage_bps"] = breakeven.ravel()
+    return surface
 
 
 def evaluate_costs(forward_returns: pd.Series, configs: Dict[str, Dict[str, float]]) -> pd.DataFrame:
@@ -26,10 +207,13 @@ def evaluate_costs(forward_returns: pd.Series, configs: Dict[str, Dict[str, floa
     hit_rate = float((forward_returns > 0).mean())
 
     for name, cfg in configs.items():
-        taker_cost = cfg.get("taker_fee_bps", 0.0) / 10_000.0
-        maker_cost = cfg.get("maker_fee_bps", 0.0) / 10_000.0
-        slippage_cost = cfg.get("slippage_bps", 0.0) / 10_000.0
-        total_cost = taker_cost + slippage_cost
+        total_cost = trade_cost_bps(
+            cfg.get("taker_fee_bps", 0.0),
+            cfg.get("maker_fee_bps", 0.0),
+            cfg.get("slippage_bps", 0.0),
+            cfg.get("fill_ratio", 0.0),
+            cfg.get("turnover", 1.0),
+        ) / BPS
         net = gross - total_cost
         records.append(
             {
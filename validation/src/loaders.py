@@ -2,15 +2,30 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
-
-from preprocessing.data_preprocessor import STANDARD_FIELDS, standardise
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+from preprocessing.data_preprocessor import (
+    LEGACY_ALIASES,
+    STANDARD_FIELDS,
+    LazyPayloads,
+    standardise_frame,
+)
+from preprocessing.kline_store import KlineStore, parse_interval
 
 STATE_TAGS = ("BALANCED", "TRENDING", "TRANSITIONAL")
 SESSION_IDS = ("asia", "eu", "us")
+# Columns v2 needs besides the indicator schema; ``return`` is derived from
+# kline closes and ``scene`` defaults to DEFAULT_SCENE when the export lacks them.
+EXTRA_COLUMNS = ("scene", "return", "spread_bps")
+KLINE_FIELDS = ("open", "high", "low", "close")
+DEFAULT_SCENE = "ALL"
 
 
 def _numeric_series(rng: np.random.Generator, size: int, loc: float = 0.0, scale: float = 1.0) -> np.ndarray:
@@ -105,22 +120,164 @@ def _scene_whitelist() -> Iterable[str]:
     return [f"SCENE_{idx:03d}" for idx in range(1, 21)]
 
 
-def _to_payload(record: pd.Series) -> Dict[str, Dict[str, float]]:
-    payload: Dict[str, Dict[str, float]] = {}
-    for category, fields in STANDARD_FIELDS.items():
-        payload[category] = {field: record[field] for field in fields}
-    return standardise(payload)
-
-
 @dataclass
 class DatasetBundle:
     frame: pd.DataFrame
-    payloads: List[Dict[str, Dict[str, float]]]
+    payloads: Sequence[Dict[str, Dict[str, float]]]
+
+
+@dataclass
+class DataSource:
+    """Where v2 reads its bars from; ``kind: synthetic`` keeps the generated frame."""
+
+    kind: str = "synthetic"
+    features: Optional[Path] = None
+    klines: Optional[Path] = None
+    symbol: Optional[str] = None
+    interval: str = "1m"
+    start: Optional[str] = None
+    end: Optional[str] = None
+    columns: Optional[List[str]] = None
+    size: int = 1_200
+    timestamp_column: str = "timestamp"
+
+    @classmethod
+    def from_dict(cls, payload: Optional[Mapping[str, Any]]) -> "DataSource":
+        payload = dict(payload or {})
+        for key in ("features", "klines"):
+            if payload.get(key):
+                payload[key] = Path(payload[key])
+        if payload.get("columns") is not None:
+            payload["columns"] = list(payload["columns"])
+        return cls(**payload)
+
+
+def _time_bounds(start: Optional[str], end: Optional[str]) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    lo = pd.Timestamp(start, tz="UTC") if start else None
+    hi = pd.Timestamp(end, tz="UTC") if end else None
+    return lo, hi
+
+
+def _time_filter(field_type: pa.DataType, name: str, lo, hi):
+    """Predicate for ``[lo, hi)`` on a timestamp or int64-millisecond column."""
+
+    def literal(value: pd.Timestamp):
+        if pa.types.is_timestamp(field_type):
+            if field_type.tz is None:
+                value = value.tz_convert(None)
+            return pa.scalar(value, type=field_type)
+        return int(value.value // 1_000_000)
+
+    condition = None
+    if lo is not None:
+        condition = ds.field(name) >= literal(lo)
+    if hi is not None:
+        upper = ds.field(name) < literal(hi)
+        condition = upper if condition is None else condition & upper
+    return condition
+
+
+def _feature_columns(available: Iterable[str], requested: Optional[Iterable[str]], timestamp: str) -> List[str]:
+    """Project the requested standard columns plus any legacy aliases present on disk."""
+
+    available = list(available)
+    if requested is None:
+        wanted = [name for fields in STANDARD_FIELDS.values() for name in fields] + list(EXTRA_COLUMNS)
+    else:
+        wanted = list(requested)
+    aliases = {
+        alias: target for alias_map in LEGACY_ALIASES.values() for alias, target in alias_map.items()
+    }
+    wanted_set = set(wanted)
+    columns = [timestamp] + [
+        name for name in available if name != timestamp and (name in wanted_set or aliases.get(name) in wanted_set)
+    ]
+    return columns
+
+
+def load_features(
+    path: Path,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+    timestamp_column: str = "timestamp",
+) -> pd.DataFrame:
+    """Read a Parquet file or directory dataset with projection and date pushdown.
+
+    Files are memory-mapped, only the projected columns are decoded and row
+    groups outside ``[start, end)`` are skipped from their statistics.
+    """
+
+    dataset = ds.dataset(str(path), format="parquet", filesystem=fs.LocalFileSystem(use_mmap=True))
+    if timestamp_column not in dataset.schema.names:
+        raise ValueError(f"{path} has no '{timestamp_column}' column")
+    lo, hi = _time_bounds(start, end)
+    condition = _time_filter(dataset.schema.field(timestamp_column).type, timestamp_column, lo, hi)
+    projection = _feature_columns(dataset.schema.names, columns, timestamp_column)
+    table = dataset.to_table(columns=projection, filter=condition)
+    frame = table.to_pandas(split_blocks=True, self_destruct=True)
+    stamps = frame[timestamp_column]
+    if pd.api.types.is_integer_dtype(stamps):
+        frame[timestamp_column] = pd.to_datetime(stamps, unit="ms", utc=True)
+    else:
+        frame[timestamp_column] = pd.to_datetime(stamps, utc=True)
+    return frame
+
+
+def _bar_keys(stamps: pd.Series, interval_ms: int) -> np.ndarray:
+    """Bar open time in ms; ATAS open-time stamps and kline mid-bar stamps agree on it."""
+
+    values = pd.DatetimeIndex(stamps).values.astype("datetime64[ms]").astype(np.int64)
+    return values - values % interval_ms
+
+
+def load_parquet_dataset(source: DataSource) -> pd.DataFrame:
+    """Join standardised indicator features with stored klines on the bar open time."""
+
+    if source.features is None:
+        raise ValueError("data.features must point at a Parquet file or dataset directory")
+    frame = load_features(source.features, source.start, source.end, source.columns, source.timestamp_column)
+    frame = standardise_frame(frame)
+    interval_ms = parse_interval(source.interval)
+    frame["bar_open"] = _bar_keys(frame[source.timestamp_column], interval_ms)
+
+    if source.klines is not None and source.symbol:
+        lo, hi = _time_bounds(source.start, source.end)
+        store = KlineStore(source.klines, source.symbol.upper(), source.interval)
+        bars = store.read(
+            start_ms=int(lo.value // 1_000_000) if lo is not None else None,
+            end_ms=int(hi.value // 1_000_000) if hi is not None else None,
+            columns=list(KLINE_FIELDS),
+        )
+        bars["bar_open"] = bars.pop("timestamp").to_numpy() // interval_ms * interval_ms
+        bars = bars.drop_duplicates("bar_open", keep="last")
+        frame = frame.merge(bars, on="bar_open", how="inner", suffixes=("", "_binance"))
+
+    frame = frame.sort_values("bar_open", kind="stable").drop_duplicates("bar_open", keep="last")
+    if "return" not in frame.columns or frame["return"].isna().all():
+        if "close" not in frame.columns:
+            raise ValueError("Features need a 'return' column or klines to derive it from")
+        frame["return"] = frame["close"].pct_change().fillna(0.0)
+    if "scene" not in frame.columns:
+        frame["scene"] = DEFAULT_SCENE
+    frame = frame.drop(columns="bar_open").set_index(source.timestamp_column)
+    return frame
+
 
+def load_dataset(
+    size: int = 1_200,
+    source: DataSource | None = None,
+) -> Tuple[pd.DataFrame, Sequence[Dict[str, Dict[str, float]]]]:
+    """Return a standardised dataset and its lazily built payloads.
 
-def load_dataset(size: int = 1_200) -> Tuple[pd.DataFrame, List[Dict[str, Dict[str, float]]]]:
-    """Return a synthetic dataset and standardised payload list."""
+    Without a ``source`` (or with ``kind: synthetic``) a generated frame of
+    ``size`` rows is used; ``kind: parquet`` loads real exports.
+    """
 
-    frame = _generate_indicator_frame(size)
-    payloads = [_to_payload(frame.iloc[i]) for i in range(len(frame))]
-    return frame, payloads
+    if source is not None and source.kind == "parquet":
+        frame = load_parquet_dataset(source)
+    elif source is None or source.kind == "synthetic":
+        frame = standardise_frame(_generate_indicator_frame(source.size if source else size))
+    else:
+        raise ValueError(f"Unsupported data source kind: {source.kind}")
+    return frame, LazyPayloads(frame)
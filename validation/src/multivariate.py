@@ -1,8 +1,9 @@
 """Multivariate models for validator v2."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -10,6 +11,8 @@ import statsmodels.api as sm
 from statsmodels.tools.sm_exceptions import PerfectSeparationWarning
 import warnings
 
+from validation.src.partitions import PartitionIndex
+
 warnings.filterwarnings("ignore", category=PerfectSeparationWarning)
 
 
@@ -28,9 +31,12 @@ class MultivariateResult:
     frequency_model: RegressionSummary
     strength_model: RegressionSummary
     quantile_model: RegressionSummary
+    group_models: pd.DataFrame = field(default_factory=pd.DataFrame)
+    quantile_surface: pd.DataFrame = field(default_factory=pd.DataFrame)
 
 
 META_SIGNALS = ("U1", "U2", "U3")
+QUANTILE_GRID = tuple(round(0.05 * step, 2) for step in range(1, 20))
 
 
 def _design_matrix(df: pd.DataFrame, meta_signals: Iterable[str], controls: Iterable[str]) -> pd.DataFrame:
@@ -45,6 +51,28 @@ def _design_matrix(df: pd.DataFrame, meta_signals: Iterable[str], controls: Iter
     return features
 
 
+def _param_table(res) -> pd.DataFrame:
+    """Coefficient table read straight off the result arrays.
+
+    Same columns as ``summary2().tables[1]`` (``Coef.``, ``Std.Err.``, ``z``/``t``,
+    ``P>|z|``/``P>|t|`` and the 95% bounds) without building formatted tables.
+    """
+
+    stat = "t" if getattr(res, "use_t", False) else "z"
+    bounds = np.asarray(res.conf_int())
+    return pd.DataFrame(
+        {
+            "variable": res.model.exog_names,
+            "Coef.": np.asarray(res.params),
+            "Std.Err.": np.asarray(res.bse),
+            stat: np.asarray(res.tvalues),
+            f"P>|{stat}|": np.asarray(res.pvalues),
+            "[0.025": bounds[:, 0],
+            "0.975]": bounds[:, 1],
+        }
+    )
+
+
 def _fit_poisson_with_dispersion(X: pd.DataFrame, y: pd.Series) -> RegressionSummary:
     poisson_model = sm.GLM(y, X, family=sm.families.Poisson())
     poisson_res = poisson_model.fit()
@@ -53,28 +81,136 @@ def _fit_poisson_with_dispersion(X: pd.DataFrame, y: pd.Series) -> RegressionSum
         alpha = max(dispersion - 1, 1e-6)
         negbin_model = sm.GLM(y, X, family=sm.families.NegativeBinomial(alpha=alpha))
         negbin_res = negbin_model.fit()
-        params = negbin_res.summary2().tables[1].reset_index().rename(columns={"index": "variable"})
-        return RegressionSummary(model="negative_binomial", params=params, dispersion=dispersion)
-    params = poisson_res.summary2().tables[1].reset_index().rename(columns={"index": "variable"})
-    return RegressionSummary(model="poisson", params=params, dispersion=dispersion)
+        return RegressionSummary(model="negative_binomial", params=_param_table(negbin_res), dispersion=dispersion)
+    return RegressionSummary(model="poisson", params=_param_table(poisson_res), dispersion=dispersion)
 
 
 def _fit_linear_model(X: pd.DataFrame, y: pd.Series, name: str) -> RegressionSummary:
     model = sm.OLS(y, X)
     res = model.fit()
-    params = res.summary2().tables[1].reset_index().rename(columns={"index": "variable"})
-    return RegressionSummary(model=name, params=params)
+    return RegressionSummary(model=name, params=_param_table(res))
 
 
 def _fit_quantile_model(X: pd.DataFrame, y: pd.Series, quantile: float = 0.5) -> RegressionSummary:
     model = sm.QuantReg(y, X)
     res = model.fit(q=quantile)
     params = res.params.to_frame(name="coef").reset_index().rename(columns={"index": "variable"})
+    params["std_err"] = res.bse.reindex(params["variable"]).values
     params["p_value"] = res.pvalues.reindex(params["variable"]).values
     params["model"] = f"quantile_{quantile:.2f}"
     return RegressionSummary(model=f"quantile_{quantile:.2f}", params=params)
 
 
+def _fit_quantile_band(task: Tuple[pd.DataFrame, pd.Series, List[float]]) -> pd.DataFrame:
+    """``QuantReg`` fits for one band of quantiles, as a tidy frame."""
+
+    X, y, band = task
+    model = sm.QuantReg(y, X)
+    frames = []
+    for q in band:
+        res = model.fit(q=q)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "quantile": q,
+                    "variable": list(X.columns),
+                    "coef": np.asarray(res.params),
+                    "std_err": np.asarray(res.bse),
+                    "t": np.asarray(res.tvalues),
+                    "p_value": np.asarray(res.pvalues),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def quantile_sweep(
+    X: pd.DataFrame,
+    y: pd.Series,
+    quantiles: Iterable[float] = QUANTILE_GRID,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """Tidy quantile x variable coefficient surface with robust p-values.
+
+    Every quantile is a ``QuantReg.fit`` with its defaults (IRLS, robust
+    Epanechnikov / Hall-Sheather covariance).  The sorted grid is split into
+    ``workers`` contiguous bands that are fitted in parallel.
+    """
+
+    grid = sorted({float(q) for q in quantiles})
+    if not grid:
+        return pd.DataFrame(columns=["quantile", "variable", "coef", "std_err", "t", "p_value"])
+    if grid[0] <= 0 or grid[-1] >= 1:
+        raise ValueError("Quantiles must lie strictly between 0 and 1")
+    n_bands = max(1, min(workers, len(grid)))
+    bands = [[float(q) for q in band] for band in np.array_split(np.asarray(grid), n_bands)]
+    frames = _run_tasks(_fit_quantile_band, [(X, y, band) for band in bands], workers)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _fit_family(task: Tuple[str, pd.DataFrame, pd.Series]) -> RegressionSummary:
+    family, X, y = task
+    if family == "frequency":
+        return _fit_poisson_with_dispersion(X, y)
+    if family == "strength":
+        return _fit_linear_model(X, y, name="ols")
+    if family == "quantile":
+        return _fit_quantile_model(X, y, quantile=0.5)
+    raise ValueError(f"Unknown model family: {family}")
+
+
+def _coefficients(summary: RegressionSummary) -> pd.DataFrame:
+    params = summary.params
+    if "Coef." in params:
+        coef, std_err = params["Coef."], params["Std.Err."]
+        p_value = params[next(column for column in params if column.startswith("P>|"))]
+    else:
+        coef, std_err, p_value = params["coef"], params["std_err"], params["p_value"]
+    return pd.DataFrame(
+        {
+            "model": summary.model,
+            "variable": params["variable"].to_numpy(),
+            "coef": coef.to_numpy(dtype=float),
+            "std_err": std_err.to_numpy(dtype=float),
+            "p_value": p_value.to_numpy(dtype=float),
+        }
+    )
+
+
+def _varying_columns(X: pd.DataFrame) -> pd.DataFrame:
+    """``X`` without the columns that are constant over its rows, except ``const``.
+
+    Inside one group the group column's own dummies (and any control or
+    meta-signal that never changes there) are collinear with the intercept.
+    """
+
+    values = X.to_numpy(dtype=float)
+    varying = values.max(axis=0) > values.min(axis=0) if len(values) else np.zeros(X.shape[1], dtype=bool)
+    return X.loc[:, varying | (X.columns == "const")]
+
+
+def _fit_group(task: Tuple[object, pd.DataFrame, pd.Series, pd.Series]) -> pd.DataFrame:
+    group, X, y_freq, y_strength = task
+    frames = []
+    for family, y in (("frequency", y_freq), ("strength", y_strength), ("quantile", y_strength)):
+        try:
+            frames.append(_coefficients(_fit_family((family, X, y))))
+        except (np.linalg.LinAlgError, ValueError):
+            continue
+    if not frames:
+        return pd.DataFrame()
+    result = pd.concat(frames, ignore_index=True)
+    result.insert(0, "group", group)
+    return result
+
+
+def _run_tasks(function, tasks: List, workers: int) -> List:
+    if workers <= 1 or len(tasks) <= 1:
+        return [function(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(function, tasks))
+
+
 def _summarise_combinations(
     meta_signals: Iterable[str],
     frequency: RegressionSummary,
@@ -105,37 +241,50 @@ def _summarise_combinations(
     return pd.DataFrame(rows)
 
 
-def _build_combo_matrix(df: pd.DataFrame, meta_signals: Iterable[str], label_column: str) -> pd.DataFrame:
+def _partition_hits(
+    df: pd.DataFrame,
+    partitions: PartitionIndex,
+    column: str,
+    meta_signals: Iterable[str],
+    label_column: str,
+) -> pd.DataFrame:
+    """Triggered count and hit rate per (category, meta) from the shared partition."""
+
+    partition = partitions.partition(column)
+    labels = df[label_column].to_numpy(dtype=float)
     records = []
-    for scene, scene_df in df.groupby("scene"):
-        for meta in meta_signals:
-            if meta not in scene_df:
-                continue
-            triggered = scene_df[scene_df[meta] > 0]
-            N = len(triggered)
-            hit_rate = float(triggered[label_column].mean()) if N else np.nan
-            records.append(
-                {
-                    "scene": scene,
-                    "meta_signal": meta,
-                    "N": N,
-                    "hit_rate": hit_rate,
-                }
-            )
+    totals = {}
+    for meta in meta_signals:
+        if meta not in df:
+            continue
+        triggered = partitions.triggered(meta)
+        totals[meta] = (partition.totals(triggered), partition.totals(triggered, labels))
+    for code, category in enumerate(partition.categories):
+        for meta, (counts, hits) in totals.items():
+            N = int(counts[code])
+            hit_rate = float(hits[code] / N) if N else np.nan
+            records.append({column: category, "meta_signal": meta, "N": N, "hit_rate": hit_rate})
     return pd.DataFrame(records)
 
 
-def _state_breakdown(df: pd.DataFrame, meta_signals: Iterable[str], label_column: str) -> pd.DataFrame:
-    records = []
-    for state, state_df in df.groupby("state_tag"):
-        for meta in meta_signals:
-            if meta not in state_df:
-                continue
-            triggered = state_df[state_df[meta] > 0]
-            N = len(triggered)
-            hit_rate = float(triggered[label_column].mean()) if N else np.nan
-            records.append({"state_tag": state, "meta_signal": meta, "N": N, "hit_rate": hit_rate})
-    return pd.DataFrame(records)
+def _build_combo_matrix(
+    df: pd.DataFrame,
+    meta_signals: Iterable[str],
+    label_column: str,
+    partitions: PartitionIndex | None = None,
+) -> pd.DataFrame:
+    partitions = partitions or PartitionIndex.build(df, ["scene"], meta_signals)
+    return _partition_hits(df, partitions, "scene", meta_signals, label_column)
+
+
+def _state_breakdown(
+    df: pd.DataFrame,
+    meta_signals: Iterable[str],
+    label_column: str,
+    partitions: PartitionIndex | None = None,
+) -> pd.DataFrame:
+    partitions = partitions or PartitionIndex.build(df, ["state_tag"], meta_signals)
+    return _partition_hits(df, partitions, "state_tag", meta_signals, label_column)
 
 
 def run_regressions(
@@ -144,22 +293,57 @@ def run_regressions(
     forward_returns: pd.Series,
     controls: Iterable[str],
     meta_signals: Iterable[str] = META_SIGNALS,
+    partitions: PartitionIndex | None = None,
+    workers: int = 1,
+    group_column: str | None = None,
+    quantiles: Iterable[float] | None = None,
 ) -> MultivariateResult:
+    """Fit the frequency, strength and median models, optionally per group.
+
+    With ``workers > 1`` the three model families (and, when ``group_column``
+    names a partition such as ``scene`` or ``state_tag``, every per-group fit)
+    run concurrently in a process pool.  Each group is fitted on the columns
+    that vary within it, so the group's own dummies drop out; groups whose
+    design is still singular are skipped.  ``quantiles`` additionally fits the strength design over a grid
+    of quantiles (see ``quantile_sweep``) into ``quantile_surface``.
+    """
+
     meta_signals = tuple(meta_signals)
     controls = tuple(controls)
 
     X_freq = _design_matrix(df, meta_signals, controls)
     y_freq = df[label_column].astype(float)
-    frequency_model = _fit_poisson_with_dispersion(X_freq, y_freq)
-
     X_strength = X_freq
     y_strength = forward_returns.loc[X_strength.index].astype(float)
-    strength_model = _fit_linear_model(X_strength, y_strength, name="ols")
-    quantile_model = _fit_quantile_model(X_strength, y_strength, quantile=0.5)
+
+    frequency_model, strength_model, quantile_model = _run_tasks(
+        _fit_family,
+        [("frequency", X_freq, y_freq), ("strength", X_strength, y_strength), ("quantile", X_strength, y_strength)],
+        workers,
+    )
 
     combinations = _summarise_combinations(meta_signals, frequency_model, strength_model, quantile_model, df, label_column)
-    combo_matrix = _build_combo_matrix(df, meta_signals, label_column)
-    state_breakdown = _state_breakdown(df, meta_signals, label_column)
+    partition_columns = ["scene", "state_tag"] + ([group_column] if group_column else [])
+    partitions = partitions or PartitionIndex.build(df, partition_columns, meta_signals)
+    combo_matrix = _build_combo_matrix(df, meta_signals, label_column, partitions)
+    state_breakdown = _state_breakdown(df, meta_signals, label_column, partitions)
+
+    group_models = pd.DataFrame()
+    if group_column:
+        partition = partitions.partition(group_column)
+        tasks = []
+        for group, rows in partition.groups():
+            X_group = _varying_columns(X_freq.iloc[rows])
+            if rows.size > X_group.shape[1]:
+                tasks.append((group, X_group, y_freq.iloc[rows], y_strength.iloc[rows]))
+        fitted = [frame for frame in _run_tasks(_fit_group, tasks, workers) if not frame.empty]
+        if fitted:
+            group_models = pd.concat(fitted, ignore_index=True)
+            group_models.insert(0, "group_column", group_column)
+
+    quantile_surface = pd.DataFrame()
+    if quantiles is not None:
+        quantile_surface = quantile_sweep(X_strength, y_strength, quantiles, workers)
 
     return MultivariateResult(
         combinations=combinations,
@@ -168,4 +352,6 @@ def run_regressions(
         frequency_model=frequency_model,
         strength_model=strength_model,
         quantile_model=quantile_model,
+        group_models=group_models,
+        quantile_surface=quantile_surface,
     )
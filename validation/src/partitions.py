@@ -0,0 +1,112 @@
+"""Shared row partitions for validator v2 stages.
+
+The dataset is partitioned once by scene, state_tag and session_id: every
+partition stores integer codes per row, its sorted category labels and the
+row positions sorted by code with offsets into them, so the row positions
+of one category are a slice ``order[offsets[i]:offsets[i + 1]]`` (a view, in
+original row order).  Meta-signal trigger masks are computed once as well;
+selecting the triggered rows of a category with them copies the positions.
+Stages then aggregate with ``np.bincount`` over the codes instead of running
+their own ``groupby`` and re-filtering ``scene_df[scene_df[meta] > 0]``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+PARTITION_COLUMNS = ("scene", "state_tag", "session_id")
+META_SIGNALS = ("U1", "U2", "U3")
+
+
+@dataclass
+class Partition:
+    """Categorical codes plus code-sorted row offsets for one column."""
+
+    name: str
+    codes: np.ndarray
+    categories: np.ndarray
+    order: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "Partition":
+        # Same categories and order as ``df.groupby(column)``: sorted, NaN dropped.
+        codes, categories = pd.factorize(series, sort=True)
+        codes = codes.astype(np.int64)
+        valid = np.flatnonzero(codes >= 0)
+        order = valid[np.argsort(codes[valid], kind="stable")]
+        counts = np.bincount(codes[valid], minlength=len(categories))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        return cls(
+            name=str(series.name),
+            codes=codes,
+            categories=np.asarray(categories, dtype=object),
+            order=order,
+            offsets=offsets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def rows(self, code: int) -> np.ndarray:
+        """Row positions of category ``code`` (a view into ``order``)."""
+
+        return self.order[self.offsets[code]:self.offsets[code + 1]]
+
+    def groups(self) -> Iterator[Tuple[object, np.ndarray]]:
+        for code, label in enumerate(self.categories):
+            yield label, self.rows(code)
+
+    def totals(self, mask: np.ndarray, weights: np.ndarray | None = None) -> np.ndarray:
+        """Per-category count (or weighted sum) of the rows selected by ``mask``."""
+
+        selected = mask & (self.codes >= 0)
+        return np.bincount(
+            self.codes[selected],
+            weights=None if weights is None else weights[selected],
+            minlength=len(self.categories),
+        )
+
+
+@dataclass
+class PartitionIndex:
+    """Partitions and meta-signal trigger masks shared by every v2 stage."""
+
+    n_rows: int
+    partitions: Dict[str, Partition] = field(default_factory=dict)
+    triggers: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        columns: Iterable[str] = PARTITION_COLUMNS,
+        meta_signals: Iterable[str] = META_SIGNALS,
+    ) -> "PartitionIndex":
+        partitions = {column: Partition.from_series(df[column]) for column in columns if column in df}
+        triggers = {
+            meta: df[meta].to_numpy(dtype=float) > 0 for meta in meta_signals if meta in df
+        }
+        return cls(n_rows=len(df), partitions=partitions, triggers=triggers)
+
+    def partition(self, column: str) -> Partition:
+        return self.partitions[column]
+
+    def triggered(self, meta: str) -> np.ndarray:
+        return self.triggers[meta]
+
+    def triggered_rows(self, column: str, code: int, meta: str) -> np.ndarray:
+        """Rows of one category where ``meta`` fired, in original row order.
+
+        Boolean indexing returns a new array, not a view into ``order``.
+        """
+
+        rows = self.partitions[column].rows(code)
+        return rows[self.triggers[meta][rows]]
@@ -1,28 +1,75 @@
-"""Rolling stability analysis for validator v2."""
+"""Rolling stability analysis for validator v2.
+
+Stability is the share of a (scene, meta-signal) series' positions whose
+rolling hit rate is at least 0.5.  All series are evaluated in one pass: the
+triggered rows of every pair are laid out back to back (scene-major, in time
+order within a scene), and each rolling window sum is a difference of one
+global cumulative sum, clipped at the start of its segment.  Any number of
+window lengths can be evaluated the same way for sensitivity analysis.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+from dataclasses import dataclass, field
+from typing import Iterable, Tuple
 
+import numpy as np
 import pandas as pd
 
+from validation.src.partitions import PartitionIndex
+
 META_SIGNALS = ("U1", "U2", "U3")
+DEFAULT_WINDOW = 90
 
 
 @dataclass
 class StabilityResult:
     metrics: pd.DataFrame
     score: float
+    sensitivity: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+
+def _window_bounds(lengths: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-segment rolling window and ``min_periods`` for a nominal ``window``.
+
+    Short series get a window covering the whole series (at least five rows),
+    with ``min_periods`` of a third of the window but never below three.
+    """
+
+    windows = np.minimum(window, lengths)
+    windows = np.where(windows < 10, np.maximum(5, lengths), windows)
+    return windows, np.maximum(3, windows // 3)
+
+
+def segmented_stability(values: np.ndarray, lengths: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """Stability of consecutive segments of ``values`` with the given ``lengths``.
 
+    Equivalent to ``(series.rolling(w, min_periods=m).mean() >= 0.5).mean()``
+    per segment, with ``w`` and ``m`` from ``_window_bounds``.  NaN values are
+    skipped as in pandas; empty segments yield NaN.
+    """
 
-def _stability(series: pd.Series, window: int = 90) -> float:
-    if series.empty:
-        return float("nan")
-    window = min(window, len(series))
-    if window < 10:
-        window = max(5, len(series))
-    rolling = series.rolling(window=window, min_periods=max(3, window // 3)).mean()
-    return float((rolling >= 0.5).mean())
+    values = np.asarray(values, dtype=float)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    result = np.full(lengths.size, np.nan)
+    if values.size == 0:
+        return result
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    segment = np.repeat(np.arange(lengths.size), lengths)
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+
+    windows, min_periods = _window_bounds(lengths, window)
+    position = np.arange(values.size)
+    lower = np.maximum(starts[segment], position - windows[segment] + 1)
+    total = sums[position + 1] - sums[lower]
+    n = counts[position + 1] - counts[lower]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hit = (n >= min_periods[segment]) & (total / n >= 0.5)
+
+    filled = lengths > 0
+    result[filled] = np.add.reduceat(hit.astype(float), starts[filled]) / lengths[filled]
+    return result
 
 
 def compute_stability(
@@ -30,25 +77,58 @@ def compute_stability(
     label_column: str,
     scene_column: str = "scene",
     meta_signals: Iterable[str] = META_SIGNALS,
+    partitions: PartitionIndex | None = None,
+    window: int = DEFAULT_WINDOW,
+    window_grid: Iterable[int] | None = None,
 ) -> StabilityResult:
-    records = []
-    for scene, scene_df in df.groupby(scene_column):
-        for meta in meta_signals:
-            if meta not in scene_df:
-                continue
-            triggered = scene_df[scene_df[meta].astype(int) > 0]
-            if triggered.empty:
-                continue
-            stability = _stability(triggered[label_column])
-            records.append(
-                {
-                    "scene": scene,
-                    "meta_signal": meta,
-                    "stability": stability,
-                    "N": len(triggered),
-                }
-            )
-
-    metrics = pd.DataFrame(records)
+    """Rolling hit-rate stability per (scene, meta-signal) with at least one trigger.
+
+    ``metrics`` and ``score`` use ``window``; ``window_grid`` additionally
+    fills ``sensitivity`` with one row per pair and window length.
+    """
+
+    meta_signals = [meta for meta in meta_signals if meta in df]
+    partitions = partitions or PartitionIndex.build(df, [scene_column], meta_signals)
+    scenes = partitions.partition(scene_column)
+    labels = df[label_column].to_numpy(dtype=float)
+
+    # One stable sort by (scene, meta) pair code; ``scenes.order`` is already
+    # scene-major in time order, so rows keep their time order within a pair.
+    n_meta = len(meta_signals)
+    ordered = labels[scenes.order]
+    scene_of_row = scenes.codes[scenes.order]
+    pair_codes = []
+    pair_values = []
+    for meta_code, meta in enumerate(meta_signals):
+        triggered = partitions.triggered(meta)[scenes.order]
+        pair_codes.append(scene_of_row[triggered] * n_meta + meta_code)
+        pair_values.append(ordered[triggered])
+    pair_codes = np.concatenate(pair_codes) if pair_codes else np.empty(0, dtype=np.int64)
+    values = np.concatenate(pair_values) if pair_values else np.empty(0)
+    values = values[np.argsort(pair_codes, kind="stable")]
+    lengths = np.bincount(pair_codes, minlength=len(scenes) * n_meta)
+    scene_codes = np.repeat(np.arange(len(scenes)), n_meta)
+    meta_names = np.tile(np.asarray(meta_signals, dtype=object), len(scenes))
+    present = lengths > 0
+
+    def frame(window_length: int) -> pd.DataFrame:
+        stability = segmented_stability(values, lengths, window_length)
+        return pd.DataFrame(
+            {
+                "scene": scenes.categories[scene_codes[present]],
+                "meta_signal": meta_names[present],
+                "stability": stability[present],
+                "N": lengths[present].astype(int),
+            }
+        )
+
+    metrics = frame(window) if present.any() else pd.DataFrame()
     score = float(metrics["stability"].mean()) if not metrics.empty else 0.0
-    return StabilityResult(metrics=metrics, score=score)
+
+    sensitivity = pd.DataFrame()
+    if window_grid is not None and present.any():
+        sensitivity = pd.concat(
+            [frame(int(length)).assign(window=int(length)) for length in window_grid],
+            ignore_index=True,
+        )
+    return StabilityResult(metrics=metrics, score=score, sensitivity=sensitivity)
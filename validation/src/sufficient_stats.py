@@ -0,0 +1,214 @@
+"""Per-day sufficient statistics for incremental validation runs.
+
+For every (indicator, slice, horizon) cell and UTC day the store keeps counts,
+sums, sums of squares and cross-products of the indicator ``x`` and forward
+return ``y``::
+
+    results/sufficient_stats/
+        manifest.json
+        2024-01-01.parquet
+        2024-01-02.parquet
+
+Merging days is a grouped sum, so nightly runs only accumulate the days whose
+rows changed and recompute means, t-stats, win rates and correlations in
+O(days) instead of O(rows).  ``manifest.json`` records a key of the grid
+configuration and a per-day signature (a hash of the day's rows, index and
+values); a day is recomputed when its signature changes, e.g. after a
+re-export or a kline backfill, or once the next day's bars complete its last
+forward returns.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from preprocessing.kline_manifest import atomic_write_json
+
+CELL_KEYS = ("indicator", "slice", "horizon")
+STAT_COLUMNS = (
+    "rows",  # rows in the slice
+    "n",  # finite returns
+    "sum_y",
+    "sum_y2",
+    "wins",  # returns > 0
+    "n_x",  # finite indicator values
+    "sum_x",
+    "n_xy",  # rows with both finite
+    "sxy_x",
+    "sxy_y",
+    "sxy_xx",
+    "sxy_yy",
+    "sxy_xy",
+)
+MANIFEST_NAME = "manifest.json"
+
+
+def config_key(payload) -> str:
+    """Stable hash of the grid definition; a change invalidates every stored day."""
+
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def day_ids(index: pd.Index) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(codes, days)``: an int code per row and the ``YYYY-MM-DD`` labels."""
+
+    days = pd.DatetimeIndex(index).values.astype("datetime64[D]")
+    labels, codes = np.unique(days, return_inverse=True)
+    return codes.astype(np.int64), labels.astype(str)
+
+
+def day_signatures(codes: np.ndarray, labels: np.ndarray, frame: pd.DataFrame) -> Dict[str, str]:
+    """SHA-1 per day of the row hashes (index and every column) of ``frame``."""
+
+    row_hashes = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+    order = np.argsort(codes, kind="stable")
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=labels.size))))
+    ordered = row_hashes[order]
+    return {
+        str(day): hashlib.sha1(ordered[offsets[code]:offsets[code + 1]].tobytes()).hexdigest()
+        for code, day in enumerate(labels)
+    }
+
+
+def accumulate(codes: np.ndarray, n_days: int, x: np.ndarray, y: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-day sufficient statistics of one cell; ``codes`` are the day ids of the slice rows."""
+
+    def total(weights) -> np.ndarray:
+        return np.bincount(codes, weights=weights, minlength=n_days)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    fy = np.isfinite(y)
+    fx = np.isfinite(x)
+    both = fx & fy
+    y0 = np.where(fy, y, 0.0)
+    x0 = np.where(fx, x, 0.0)
+    xb = np.where(both, x, 0.0)
+    yb = np.where(both, y, 0.0)
+    return {
+        "rows": total(None),
+        "n": total(fy.astype(float)),
+        "sum_y": total(y0),
+        "sum_y2": total(y0 * y0),
+        "wins": total((y0 > 0).astype(float)),
+        "n_x": total(fx.astype(float)),
+        "sum_x": total(x0),
+        "n_xy": total(both.astype(float)),
+        "sxy_x": total(xb),
+        "sxy_y": total(yb),
+        "sxy_xx": total(xb * xb),
+        "sxy_yy": total(yb * yb),
+        "sxy_xy": total(xb * yb),
+    }
+
+
+def summarise(frame: pd.DataFrame, keys: Sequence[str] = CELL_KEYS) -> pd.DataFrame:
+    """Merge per-day rows into one row per cell with the derived statistics."""
+
+    if frame.empty:
+        return pd.DataFrame(columns=list(keys))
+    totals = frame.groupby(list(keys), sort=False)[list(STAT_COLUMNS)].sum()
+    n = totals["n"].to_numpy()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = totals["sum_y"].to_numpy() / n
+        variance = (totals["sum_y2"].to_numpy() - n * mean**2) / (n - 1)
+        t_stat = mean / np.sqrt(np.clip(variance, 0.0, None) / n)
+        p_value = 2.0 * stats.t.sf(np.abs(t_stat), n - 1)
+        m = totals["n_xy"].to_numpy()
+        cov = totals["sxy_xy"].to_numpy() - totals["sxy_x"].to_numpy() * totals["sxy_y"].to_numpy() / m
+        var_x = totals["sxy_xx"].to_numpy() - totals["sxy_x"].to_numpy() ** 2 / m
+        var_y = totals["sxy_yy"].to_numpy() - totals["sxy_y"].to_numpy() ** 2 / m
+        corr = cov / np.sqrt(var_x * var_y)
+        summary = pd.DataFrame(
+            {
+                "mean_ret": mean,
+                "win_rate": totals["wins"].to_numpy() / totals["rows"].to_numpy(),
+                "sample_size": n.astype(np.int64),
+                "effect_size": totals["sum_x"].to_numpy() / totals["n_x"].to_numpy(),
+                "t_stat": np.where(n > 1, t_stat, np.nan),
+                "p_value": np.where(n > 1, p_value, np.nan),
+                "pearson_corr": np.where(m > 2, corr, np.nan),
+                "days": frame.groupby(list(keys), sort=False)["day"].nunique().to_numpy(),
+            },
+            index=totals.index,
+        )
+    summary = summary[totals["n"].to_numpy() > 0]
+    return summary.reset_index()
+
+
+@dataclass
+class SufficientStatsStore:
+    """Directory of per-day statistic files plus a manifest of day signatures."""
+
+    root: Path
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    def manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {"config_key": None, "days": {}}
+        with self.manifest_path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def stale_days(self, signatures: Dict[str, str], key: str) -> List[str]:
+        """Days whose statistics are missing, outdated or built for another grid."""
+
+        manifest = self.manifest()
+        if manifest.get("config_key") != key:
+            return sorted(signatures)
+        stored = manifest.get("days", {})
+        return sorted(
+            day
+            for day, signature in signatures.items()
+            if stored.get(day) != signature or not self._day_path(day).exists()
+        )
+
+    def _day_path(self, day: str) -> Path:
+        return self.root / f"{day}.parquet"
+
+    def write_days(self, frame: pd.DataFrame, signatures: Dict[str, str], key: str) -> None:
+        """Replace the files of every day in ``signatures`` and update the manifest."""
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = self.manifest()
+        if manifest.get("config_key") != key:
+            for path in self.root.glob("*.parquet"):
+                path.unlink()
+            manifest = {"config_key": key, "days": {}}
+        groups = dict(tuple(frame.groupby("day", sort=True))) if not frame.empty else {}
+        for day in sorted(signatures):
+            chunk = groups.get(day, frame.iloc[0:0])
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f".{day}.", suffix=".tmp")
+            os.close(fd)
+            try:
+                chunk.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, self._day_path(day))
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            manifest["days"][day] = signatures[day]
+        atomic_write_json(self.manifest_path, manifest)
+
+    def load(self, days: Iterable[str] | None = None) -> pd.DataFrame:
+        days = sorted(days) if days is not None else sorted(self.manifest().get("days", {}))
+        frames = [pd.read_parquet(self._day_path(day)) for day in days if self._day_path(day).exists()]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=["day", *CELL_KEYS, *STAT_COLUMNS])
+        return pd.concat(frames, ignore_index=True)
@@ -1,27 +1,143 @@
-"""Trigger calculations used by the validator."""
+"""Trigger calculations used by the validator.
+
+Each indicator column is sorted once; thresholds for a whole quantile grid
+are then read off the sorted values with the same linear interpolation as
+``Series.quantile``.  Trigger membership (``value >= threshold``) is stored
+as a packed bitset, one bit per row instead of an int64 column, so trigger
+sets are 64x smaller and combine with byte-wise AND/OR/NOT.
+"""
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Tuple
 
+import numpy as np
 import pandas as pd
 
+# Set bits per byte value, for counting triggers without unpacking.
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class TriggerSet:
+    """Rows of an ``n_rows`` frame packed into bits (``np.packbits`` order)."""
+
+    bits: np.ndarray
+    n_rows: int
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "TriggerSet":
+        mask = np.asarray(mask, dtype=bool)
+        return cls(bits=np.packbits(mask), n_rows=mask.size)
+
+    def mask(self) -> np.ndarray:
+        return np.unpackbits(self.bits, count=self.n_rows).astype(bool)
+
+    def count(self) -> int:
+        return int(_POPCOUNT[self.bits].sum())
+
+    def _check(self, other: "TriggerSet") -> None:
+        if other.n_rows != self.n_rows:
+            raise ValueError(f"Trigger sets cover {self.n_rows} and {other.n_rows} rows")
+
+    def __and__(self, other: "TriggerSet") -> "TriggerSet":
+        self._check(other)
+        return TriggerSet(self.bits & other.bits, self.n_rows)
+
+    def __or__(self, other: "TriggerSet") -> "TriggerSet":
+        self._check(other)
+        return TriggerSet(self.bits | other.bits, self.n_rows)
+
+    def __invert__(self) -> "TriggerSet":
+        # Clear the padding bits of the last byte so counts stay exact.
+        bits = ~self.bits
+        if self.n_rows % 8:
+            bits[-1] &= np.uint8((0xFF << (8 - self.n_rows % 8)) & 0xFF)
+        return TriggerSet(bits, self.n_rows)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+
+def quantile_thresholds(values: np.ndarray, quantiles: Iterable[float]) -> np.ndarray:
+    """Linear-interpolated quantiles of the non-NaN ``values`` from a single sort."""
+
+    quantiles = np.asarray(list(quantiles), dtype=float)
+    ordered = np.sort(values[~np.isnan(values)])
+    if ordered.size == 0:
+        return np.full(quantiles.size, np.nan)
+    position = quantiles * (ordered.size - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, ordered.size - 1)
+    fraction = position - lower
+    # Same lerp as numpy's "linear" method, so results match ``Series.quantile``.
+    low, high = ordered[lower], ordered[upper]
+    diff = high - low
+    return np.where(fraction >= 0.5, high - diff * (1 - fraction), low + diff * fraction)
+
 
 @dataclass
-class TriggerSummary:
-    thresholds: Dict[str, float]
-    matrix: pd.DataFrame
+class TriggerGrid:
+    """Thresholds and trigger sets for every (column, quantile) pair."""
 
+    quantiles: Tuple[float, ...]
+    thresholds: pd.DataFrame
+    triggers: Dict[Tuple[str, float], TriggerSet]
+
+    def trigger(self, column: str, quantile: float) -> TriggerSet:
+        return self.triggers[(column, float(quantile))]
+
+    def counts(self) -> pd.DataFrame:
+        """Triggered rows per column (rows) and quantile (columns)."""
+
+        return pd.DataFrame(
+            [[self.trigger(column, q).count() for q in self.quantiles] for column in self.thresholds.index],
+            index=self.thresholds.index,
+            columns=self.thresholds.columns,
+        )
 
-def build_trigger_matrix(df: pd.DataFrame, columns: Iterable[str], quantile: float = 0.9) -> TriggerSummary:
-    """Create a boolean trigger matrix using quantile thresholds."""
 
-    thresholds: Dict[str, float] = {}
-    matrix = pd.DataFrame(index=df.index)
+def build_trigger_grid(df: pd.DataFrame, columns: Iterable[str], quantiles: Iterable[float]) -> TriggerGrid:
+    """Thresholds for a whole quantile grid, one sort per column, and packed trigger sets."""
+
+    quantiles = tuple(float(q) for q in quantiles)
+    thresholds = {}
+    triggers: Dict[Tuple[str, float], TriggerSet] = {}
     for column in columns:
         if column not in df:
             continue
-        threshold = float(df[column].quantile(quantile))
-        matrix[column] = (df[column] >= threshold).astype(int)
-        thresholds[column] = threshold
-    return TriggerSummary(thresholds=thresholds, matrix=matrix)
+        values = df[column].to_numpy(dtype=float)
+        column_thresholds = quantile_thresholds(values, quantiles)
+        thresholds[column] = column_thresholds
+        for q, threshold in zip(quantiles, column_thresholds):
+            triggers[(column, q)] = TriggerSet.from_mask(values >= threshold)
+    frame = pd.DataFrame.from_dict(thresholds, orient="index", columns=list(quantiles))
+    return TriggerGrid(quantiles=quantiles, thresholds=frame, triggers=triggers)
+
+
+@dataclass
+class TriggerSummary:
+    thresholds: Dict[str, float]
+    triggers: Dict[str, TriggerSet]
+    index: pd.Index
+
+    @property
+    def matrix(self) -> pd.DataFrame:
+        """Unpacked 0/1 trigger columns, built on demand."""
+
+        return pd.DataFrame(
+            {column: trigger.mask().astype(int) for column, trigger in self.triggers.items()},
+            index=self.index,
+        )
+
+
+def build_trigger_matrix(df: pd.DataFrame, columns: Iterable[str], quantile: float = 0.9) -> TriggerSummary:
+    """Quantile thresholds and packed trigger sets for ``columns``."""
+
+    grid = build_trigger_grid(df, columns, [quantile])
+    q = grid.quantiles[0]
+    return TriggerSummary(
+        thresholds={column: float(grid.thresholds.at[column, q]) for column in grid.thresholds.index},
+        triggers={column: grid.trigger(column, q) for column in grid.thresholds.index},
+        index=df.index,
+    )
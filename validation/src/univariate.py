@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Iterable, List
+from typing import Iterable, Tuple
 
 import numpy as np
 import pandas as pd
+from scipy import stats
 from statsmodels.stats.multitest import multipletests
-from statsmodels.stats.weightstats import ttest_ind
+
+from validation.src.partitions import PartitionIndex
 
 
 DEFAULT_FILTERS = ("RE", "HV", "HF")
@@ -47,58 +49,141 @@ def _ensure_boolean(series: pd.Series) -> pd.Series:
     return series.astype(int) > 0
 
 
-def compute_univariate(df: pd.DataFrame, label_column: str, config: UnivariateConfig) -> UnivariateResult:
-    records: List[dict] = []
-    metrics = list(config.metrics)
+def _group_moments(values: np.ndarray, groups: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Counts, means and unbiased variances of every column of ``values`` per group id.
+
+    Rows are sorted by group once and reduced with ``np.add.reduceat`` over the
+    whole metric matrix; variances use a second centred pass for accuracy.
+    """
+
+    counts = np.zeros(n_groups)
+    means = np.full((n_groups, values.shape[1]), np.nan)
+    variances = np.full((n_groups, values.shape[1]), np.nan)
+    if groups.size == 0:
+        return counts, means, variances
+    order = np.argsort(groups, kind="stable")
+    ordered_groups = groups[order]
+    ordered = values[order]
+    starts = np.flatnonzero(np.r_[True, ordered_groups[1:] != ordered_groups[:-1]])
+    ids = ordered_groups[starts]
+    counts[ids] = np.diff(np.r_[starts, ordered_groups.size])
+    means[ids] = np.add.reduceat(ordered, starts, axis=0) / counts[ids, None]
+    squares = np.add.reduceat((ordered - means[ordered_groups]) ** 2, starts, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variances[ids] = squares / (counts[ids, None] - 1)
+    return counts, means, variances
+
+
+def _welch(
+    n_pos: np.ndarray,
+    mean_pos: np.ndarray,
+    var_pos: np.ndarray,
+    n_neg: np.ndarray,
+    mean_neg: np.ndarray,
+    var_neg: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Welch t statistics and two-sided p-values for whole arrays of group pairs."""
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        se_pos = var_pos / n_pos
+        se_neg = var_neg / n_neg
+        t_stat = (mean_pos - mean_neg) / np.sqrt(se_pos + se_neg)
+        dof = (se_pos + se_neg) ** 2 / (se_pos**2 / (n_pos - 1) + se_neg**2 / (n_neg - 1))
+        p_value = 2.0 * stats.t.sf(np.abs(t_stat), dof)
+    return t_stat, np.clip(p_value, 0.0, 1.0)
+
+
+def compute_univariate(
+    df: pd.DataFrame,
+    label_column: str,
+    config: UnivariateConfig,
+    partitions: PartitionIndex | None = None,
+) -> UnivariateResult:
     label_series = df[label_column]
     if label_series.sum() < 1:
         raise ValueError("Label column has no positive samples")
 
-    for scene, scene_df in df.groupby(config.scene_column):
-        for filter_name in config.filters:
-            if filter_name not in scene_df:
-                continue
-            filter_series = _ensure_boolean(scene_df[filter_name])
-            filter_rate = float(filter_series.mean())
-            for meta_signal in config.meta_signals:
-                if meta_signal not in scene_df:
-                    continue
-                mask = _ensure_boolean(scene_df[meta_signal])
-                subset = scene_df[mask]
-                N = int(len(subset))
-                if N == 0:
-                    continue
-                y = subset[label_column]
-                if y.nunique() < 2:
-                    continue
-                stability = _stability_score(y)
-                hit_rate = float(y.mean())
-                for metric in metrics:
-                    if metric not in subset:
-                        continue
-                    values = subset[metric].astype(float)
-                    pos = values[y == 1]
-                    neg = values[y == 0]
-                    if len(pos) < 5 or len(neg) < 5:
-                        continue
-                    stat, p_value, _ = ttest_ind(pos, neg, usevar="unequal")
-                    p_value = float(np.clip(p_value, 0.0, 1.0))
-                    uplift = float(pos.mean() - neg.mean())
-                    records.append(
-                        {
-                            "scene": scene,
-                            "filter": filter_name,
-                            "meta_signal": meta_signal,
-                            "metric": metric,
-                            "N": N,
-                            "filter_rate": filter_rate,
-                            "hit_rate": hit_rate,
-                            "uplift": uplift,
-                            "t_stat": float(stat),
-                            "p_value": p_value,
-                            "stability": stability,
-                        }
-                    )
+    metrics = [metric for metric in config.metrics if metric in df]
+    filters = [name for name in config.filters if name in df]
+    meta_signals = [name for name in config.meta_signals if name in df]
+    partitions = partitions or PartitionIndex.build(df, [config.scene_column], meta_signals)
+    scenes = partitions.partition(config.scene_column)
+    scene_codes, scene_values = scenes.codes, scenes.categories
+    n_scenes = len(scenes)
+    has_scene = scene_codes >= 0
+    scene_rows = scenes.counts
+    labels = label_series.to_numpy()
+    matrix = df[metrics].to_numpy(dtype=float) if metrics else np.empty((len(df), 0))
+
+    filter_rates = {
+        name: np.bincount(
+            scene_codes[has_scene], weights=_ensure_boolean(df[name]).to_numpy()[has_scene], minlength=n_scenes
+        )
+        / np.maximum(scene_rows, 1)
+        for name in filters
+    }
+
+    # One block of (scene x metric) rows per meta signal; the Welch test does
+    # not depend on the filter, which only contributes its rate.
+    blocks = []
+    for meta_order, meta_signal in enumerate(meta_signals):
+        mask = partitions.triggered(meta_signal) & has_scene
+        n_rows = np.bincount(scene_codes[mask], minlength=n_scenes)
+        binary = mask & ((labels == 0) | (labels == 1))
+        groups = scene_codes[binary] * 2 + labels[binary].astype(np.int64)
+        counts, means, variances = _group_moments(matrix[binary], groups, 2 * n_scenes)
+        n_neg, n_pos = counts[0::2], counts[1::2]
+        eligible = np.flatnonzero((n_rows > 0) & (n_neg >= 5) & (n_pos >= 5))
+        if eligible.size == 0 or not metrics:
+            continue
+        t_stat, p_value = _welch(
+            n_pos[eligible, None],
+            means[1::2][eligible],
+            variances[1::2][eligible],
+            n_neg[eligible, None],
+            means[0::2][eligible],
+            variances[0::2][eligible],
+        )
+        stability = np.array(
+            [
+                _stability_score(pd.Series(labels[partitions.triggered_rows(config.scene_column, code, meta_signal)]))
+                for code in eligible
+            ]
+        )
+        n_metrics = len(metrics)
+        blocks.append(
+            pd.DataFrame(
+                {
+                    "scene_code": np.repeat(eligible, n_metrics),
+                    "meta_order": meta_order,
+                    "metric_order": np.tile(np.arange(n_metrics), eligible.size),
+                    "meta_signal": meta_signal,
+                    "metric": np.tile(np.asarray(metrics, dtype=object), eligible.size),
+                    "N": np.repeat(n_rows[eligible], n_metrics).astype(int),
+                    "hit_rate": np.repeat(n_pos[eligible] / n_rows[eligible], n_metrics),
+                    "uplift": (means[1::2][eligible] - means[0::2][eligible]).ravel(),
+                    "t_stat": t_stat.ravel(),
+                    "p_value": p_value.ravel(),
+                    "stability": np.repeat(stability, n_metrics),
+                }
+            )
+        )
+
+    records = []
+    if blocks and filters:
+        base = pd.concat(blocks, ignore_index=True)
+        for filter_order, filter_name in enumerate(filters):
+            block = base.copy()
+            block["filter_order"] = filter_order
+            block["filter"] = filter_name
+            block["filter_rate"] = filter_rates[filter_name][block["scene_code"].to_numpy()]
+            records.append(block)
+    if records:
+        ordered = pd.concat(records, ignore_index=True).sort_values(
+            ["scene_code", "filter_order", "meta_order", "metric_order"], kind="stable"
+        )
+        ordered["scene"] = np.asarray(scene_values, dtype=object)[ordered["scene_code"].to_numpy()]
+        records = ordered.to_dict("records")
 
     columns = [
         "scene",
@@ -1,13 +1,26 @@
 """Validator v2 entrypoint."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple
 
+import pandas as pd
 import yaml
 
-from validation.src import costs, labels, loaders, multivariate, qc, scenes, stability, triggers, univariate, writers
+from validation.src import (
+    costs,
+    labels,
+    loaders,
+    multivariate,
+    partitions,
+    qc,
+    scenes,
+    stability,
+    triggers,
+    univariate,
+    writers,
+)
 
 
 @dataclass
@@ -19,6 +32,12 @@ class ValidatorConfig:
     minimum_samples: int
     fdr_alpha: float
     stability_threshold: float
+    data: loaders.DataSource = field(default_factory=loaders.DataSource)
+    workers: int = 1
+    group_models: str | None = None
+    quantile_grid: Tuple[float, ...] | None = None
+    stability_windows: Tuple[int, ...] | None = None
+    cost_grid: costs.CostGrid | None = None
 
     @classmethod
     def from_yaml(cls, path: Path) -> "ValidatorConfig":
@@ -32,9 +51,32 @@ class ValidatorConfig:
             minimum_samples=int(payload.get("minimum_samples", 300)),
             fdr_alpha=float(payload.get("fdr_alpha", 0.10)),
             stability_threshold=float(payload.get("stability_threshold", 0.6)),
+            data=loaders.DataSource.from_dict(payload.get("data")),
+            workers=int(payload.get("workers", 1)),
+            group_models=payload.get("group_models"),
+            quantile_grid=_quantile_grid(payload.get("quantile_grid")),
+            stability_windows=(
+                tuple(int(window) for window in payload["stability_windows"])
+                if payload.get("stability_windows")
+                else None
+            ),
+            cost_grid=costs.CostGrid.from_dict(payload["cost_grid"]) if payload.get("cost_grid") else None,
         )
 
 
+def _quantile_grid(value) -> Tuple[float, ...] | None:
+    """``null`` disables the sweep, ``default`` is 0.05..0.95, else an explicit list."""
+
+    if value is None or value is False:
+        return None
+    if value is True or value == "default":
+        return multivariate.QUANTILE_GRID
+    return tuple(float(q) for q in value)
+
+
+CONTROLS = ("session_id", "atr_norm_range", "spread_bps", "state_tag", "ls_norm")
+
+
 class ValidatorV2:
     def __init__(self, config_path: Path | None = None) -> None:
         config_path = config_path or Path("validation/configs/validator_v2.yaml")
@@ -44,18 +86,18 @@ class ValidatorV2:
             self.cost_configs: Dict[str, Dict[str, float]] = yaml.safe_load(handle)
         writers.ensure_results_dir(self.config.results_dir)
 
-    def _prepare_dataset(self) -> pd.DataFrame:
-        dataset, _ = loaders.load_dataset()
+    def _prepare_dataset(self) -> Tuple[pd.DataFrame, partitions.PartitionIndex]:
+        dataset, _ = loaders.load_dataset(source=self.config.data)
         label_artifacts = labels.make_labels(dataset)
         dataset = dataset.copy()
         dataset["forward_return"] = label_artifacts.forward_returns
         dataset["label"] = label_artifacts.primary_label
         dataset = dataset.join(label_artifacts.filters)
         dataset = dataset.join(label_artifacts.meta_signals)
-        return dataset
+        return dataset, partitions.PartitionIndex.build(dataset)
 
     def run(self) -> Dict[str, Path]:
-        dataset = self._prepare_dataset()
+        dataset, partition_index = self._prepare_dataset()
 
         numeric_columns = dataset.select_dtypes(include=["number"]).columns
         metrics = [
@@ -78,9 +120,14 @@ class ValidatorV2:
             fdr_alpha=self.config.fdr_alpha,
             stability_threshold=self.config.stability_threshold,
         )
-        univariate_result = univariate.compute_univariate(dataset, "label", univariate_config)
+        univariate_result = univariate.compute_univariate(dataset, "label", univariate_config, partition_index)
 
-        stability_result = stability.compute_stability(dataset, "label")
+        stability_result = stability.compute_stability(
+            dataset,
+            "label",
+            partitions=partition_index,
+            window_grid=self.config.stability_windows,
+        )
         qc_report = qc.run_qc(
             dataset,
             "label",
@@ -93,10 +140,19 @@ class ValidatorV2:
             dataset,
             label_column="label",
             forward_returns=dataset["forward_return"],
-            controls=["session_id", "atr_norm_range", "spread_bps", "state_tag", "ls_norm"],
+            controls=[column for column in CONTROLS if column in dataset and dataset[column].notna().all()],
+            partitions=partition_index,
+            workers=self.config.workers,
+            group_column=self.config.group_models,
+            quantiles=self.config.quantile_grid,
         )
 
         cost_result = costs.evaluate_costs(dataset["forward_return"], self.cost_configs)
+        cost_surface = (
+            costs.cost_surface(dataset, self.config.cost_grid, partitions=partition_index)
+            if self.config.cost_grid is not None
+            else pd.DataFrame()
+        )
 
         trigger_summary = triggers.build_trigger_matrix(dataset, ["U1", "U2", "U3"])  # used for QC context
 
@@ -123,6 +179,26 @@ class ValidatorV2:
             qc_summary,
         )
 
+        if not multivariate_result.group_models.empty:
+            group_path = self.config.results_dir / "group_models.parquet"
+            writers.write_parquet(group_path, multivariate_result.group_models)
+            artifacts["group_models"] = group_path
+
+        if not stability_result.sensitivity.empty:
+            sensitivity_path = self.config.results_dir / "stability_sensitivity.parquet"
+            writers.write_parquet(sensitivity_path, stability_result.sensitivity)
+            artifacts["stability_sensitivity"] = sensitivity_path
+
+        if not cost_surface.empty:
+            cost_surface_path = self.config.results_dir / "cost_surface.parquet"
+            writers.write_parquet(cost_surface_path, cost_surface)
+            artifacts["cost_surface"] = cost_surface_path
+
+        if not multivariate_result.quantile_surface.empty:
+            surface_path = self.config.results_dir / "quantile_surface.parquet"
+            writers.write_parquet(surface_path, multivariate_result.quantile_surface)
+            artifacts["quantile_surface"] = surface_path
+
         writers.sync_trade_rules(Path("configs/trade_rules.json"), {"whitelist": whitelist, "blacklist": blacklist})
 
         return artifacts
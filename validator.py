@@ -1,23 +1,49 @@
 import argparse
 import glob
-import json
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 import yaml
 from scipy import stats
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import StandardScaler
+
+from preprocessing.atas_export import load_exports
+from preprocessing.kline_store import discover_stores, load_klines
+from validation.src.sufficient_stats import (
+    SufficientStatsStore,
+    accumulate,
+    config_key,
+    day_ids,
+    day_signatures,
+    summarise,
+)
 
 CONFIG_PATH = "validator_config.yaml"
 ATAS_DATA_PATH = "./data/atas/"
 BINANCE_DATA_PATH = "./data/binance_klines/"
 RESULTS_DIR = "results"
+SUFFICIENT_STATS_DIR = "sufficient_stats"
 ROLLING_WINDOW_DAYS = 90
 THRESHOLD_SENSITIVITY = 0.1
+# Candidate thresholds per indicator in threshold_curves.csv, overridden by
+# the threshold_curves.points setting; 0 disables the export.
+THRESHOLD_CURVE_POINTS = 1000
+BOOTSTRAP_SEED = 1234
+BOOTSTRAP_METHODS = ("iid", "block", "stationary")
+# Upper bound on (iteration, observation) cells drawn per chunk.  iid and block
+# resampling hold one int64 index matrix (~64 MB); the stationary path also
+# holds the float draws from rng.random and int64 starts/block_origin/first
+# arrays of the same shape, so it peaks at roughly 4-5x that (~300 MB).
+BOOTSTRAP_MAX_CELLS = 8_000_000
+LOGIT_MIN_ROWS = 20
+LOGIT_MAX_ITER = 50
+LOGIT_TOL = 1e-8
 
 
 class ValidationError(Exception):
@@ -31,37 +57,35 @@ def load_config(path: str) -> Dict:
         return yaml.safe_load(cfg) or {}
 
 
-def load_indicator_files(path: str) -> pd.DataFrame:
-    files = sorted(glob.glob(os.path.join(path, "*.json")))
-    if not files:
-        raise ValidationError(f"No indicator files found in {path}")
-
-    records: List[Dict] = []
-    for file in files:
-        with open(file, "r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    payload = json.loads(line)
-                except json.JSONDecodeError:
-                    payload = json.loads(handle.read())
-                records.append(payload)
-
-    df = pd.DataFrame(records)
-    if "timestamp" not in df.columns:
-        raise ValidationError("Indicator data must include a timestamp column")
-    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-    df = df.sort_values("timestamp").drop_duplicates("timestamp")
-    df = df.set_index("timestamp")
+def load_indicator_files(path: str, use_cache: bool = True) -> pd.DataFrame:
+    try:
+        df = load_exports(Path(path), use_cache=use_cache)
+    except (FileNotFoundError, ValueError) as exc:
+        raise ValidationError(str(exc))
+    if df.empty:
+        raise ValidationError(f"No indicator rows found in {path}")
     return df
 
 
-def load_binance_data(path: str) -> pd.DataFrame:
+def load_binance_data(
+    path: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    columns: List[str] | None = None,
+    symbol: str | None = None,
+    interval: str | None = None,
+) -> pd.DataFrame:
+    if discover_stores(path):
+        start_ms = int(start.timestamp() * 1000) if start is not None else None
+        end_ms = int(end.timestamp() * 1000) if end is not None else None
+        try:
+            return load_klines(path, start_ms, end_ms, columns, symbol=symbol, interval=interval)
+        except ValueError as exc:
+            raise ValidationError(str(exc))
+
     csv_files = sorted(glob.glob(os.path.join(path, "*.csv")))
     if not csv_files:
-        raise ValidationError(f"No Binance CSV files found in {path}")
+        raise ValidationError(f"No Binance kline store or CSV files found in {path}")
 
     frames: List[pd.DataFrame] = []
     for file in csv_files:
@@ -76,12 +100,126 @@ def load_binance_data(path: str) -> pd.DataFrame:
     return data
 
 
-def compute_future_returns(prices: pd.Series, horizons: Iterable[int]) -> pd.DataFrame:
-    future_returns = {}
-    for horizon in horizons:
-        delta = prices.shift(-horizon) / prices - 1.0
-        future_returns[f"fut_ret_{horizon}m"] = delta
-    return pd.DataFrame(future_returns)
+def _index_ns(index: pd.Index) -> np.ndarray:
+    return pd.DatetimeIndex(index).values.astype("datetime64[ns]").astype(np.int64)
+
+
+def _range_extreme(values: np.ndarray, lo: np.ndarray, hi: np.ndarray, reduce) -> np.ndarray:
+    """``reduce`` (np.fmax/np.fmin) of ``values[lo:hi]`` per row via a sparse table.
+
+    Rows with an empty range get NaN.  The table has ``log2(max window)``
+    levels, so every query is two lookups regardless of the window length.
+    """
+
+    lengths = hi - lo
+    result = np.full(lo.shape, np.nan)
+    nonempty = lengths > 0
+    if not nonempty.any():
+        return result
+    levels = [values]
+    span = 1
+    while span * 2 <= lengths.max():
+        previous = levels[-1]
+        levels.append(reduce(previous[:-span], previous[span:]))
+        span *= 2
+    level = np.zeros(lengths.shape, dtype=np.int64)
+    level[nonempty] = np.floor(np.log2(lengths[nonempty])).astype(np.int64)
+    for k, table in enumerate(levels):
+        rows = nonempty & (level == k)
+        if rows.any():
+            width = 1 << k
+            result[rows] = reduce(table[lo[rows]], table[hi[rows] - width])
+    return result
+
+
+def forward_return_matrix(
+    index: pd.Index,
+    close: np.ndarray,
+    horizons: Iterable[int],
+    high: np.ndarray | None = None,
+    low: np.ndarray | None = None,
+    tolerance: timedelta = timedelta(0),
+) -> Dict[str, np.ndarray]:
+    """Time-indexed forward returns for every horizon (minutes) in one pass.
+
+    Each timestamp plus horizon is mapped to its target row with a single
+    ``searchsorted`` on the int64 index, so a missing bar never stretches a
+    "60m" return.  When the exact target bar is absent the last bar at or
+    before it is used if it lies within ``tolerance``; otherwise the return is
+    NaN.  ``gap`` marks windows missing any bar, tolerated or not (bar spacing
+    is inferred from the median index step).  All outputs are ``(n, len(horizons))`` arrays:
+    ``simple``, ``log``, ``gap`` and the max favourable/adverse excursions
+    ``mfe``/``mae`` of ``high``/``low`` over ``(t, target]`` relative to the
+    entry close.
+    """
+
+    horizons = list(horizons)
+    stamps = _index_ns(index)
+    close = np.asarray(close, dtype=float)
+    high = close if high is None else np.asarray(high, dtype=float)
+    low = close if low is None else np.asarray(low, dtype=float)
+    n, width = stamps.size, len(horizons)
+    if n == 0:
+        empty = np.full((0, width), np.nan)
+        return {"simple": empty, "log": empty, "gap": np.zeros((0, width), dtype=bool), "mfe": empty, "mae": empty}
+    rows = np.arange(n)
+    spacing = int(np.median(np.diff(stamps))) if n > 1 else 0
+    tolerance_ns = int(pd.Timedelta(tolerance).value)
+
+    horizon_ns = np.array([int(h) * 60_000_000_000 for h in horizons], dtype=np.int64)
+    targets = stamps[:, None] + horizon_ns[None, :]
+    # Last row at or before each target; equal to the target when the bar exists.
+    found = np.searchsorted(stamps, targets, side="right") - 1
+    found_stamps = stamps[found]
+    in_range = targets <= stamps[-1]
+    usable = in_range & (found > rows[:, None]) & (targets - found_stamps <= tolerance_ns)
+    expected = horizon_ns // spacing if spacing else np.zeros(width, dtype=np.int64)
+    gap = in_range & ((targets != found_stamps) | (found - rows[:, None] < expected[None, :]))
+
+    target_close = np.where(usable, close[found], np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        simple = target_close / close[:, None] - 1.0
+        log_ret = np.log(target_close / close[:, None])
+
+    mfe = np.full((n, width), np.nan)
+    mae = np.full((n, width), np.nan)
+    lo = rows + 1
+    for column in range(width):
+        hi = np.where(usable[:, column], found[:, column] + 1, lo)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mfe[:, column] = _range_extreme(high, lo, hi, np.fmax) / close - 1.0
+            mae[:, column] = _range_extreme(low, lo, hi, np.fmin) / close - 1.0
+    return {"simple": simple, "log": log_ret, "gap": gap, "mfe": mfe, "mae": mae}
+
+
+def compute_future_returns(
+    prices: pd.Series,
+    horizons: Iterable[int],
+    high: pd.Series | None = None,
+    low: pd.Series | None = None,
+    tolerance: timedelta = timedelta(0),
+    extended: bool = False,
+) -> pd.DataFrame:
+    """``fut_ret_{h}m`` columns, plus log/MFE/MAE/gap columns when ``extended``."""
+
+    horizons = list(horizons)
+    matrix = forward_return_matrix(
+        prices.index,
+        prices.to_numpy(),
+        horizons,
+        high=high.to_numpy() if high is not None else None,
+        low=low.to_numpy() if low is not None else None,
+        tolerance=tolerance,
+    )
+    outputs = {"simple": "fut_ret"}
+    if extended:
+        outputs.update({"log": "fut_logret", "mfe": "fut_mfe", "mae": "fut_mae", "gap": "fut_gap"})
+    columns = {
+        f"{prefix}_{horizon}m": matrix[key][:, column]
+        for key, prefix in outputs.items()
+        for column, horizon in enumerate(horizons)
+    }
+    return pd.DataFrame(columns, index=prices.index)
 
 
 def apply_slice(df: pd.DataFrame, condition: str) -> pd.DataFrame:
@@ -93,50 +231,222 @@ def apply_slice(df: pd.DataFrame, condition: str) -> pd.DataFrame:
         raise ValidationError(f"Failed to evaluate slice condition '{condition}': {exc}")
 
 
-def run_t_test(data: pd.Series) -> Tuple[float, float]:
-    data = data.dropna()
-    if data.empty:
+class SliceIndex:
+    """Evaluate each distinct slice condition once into a boolean row mask.
+
+    Cells then index column arrays through the cached mask instead of calling
+    ``df.query`` (and copying the sliced frame) for every indicator.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self._masks: Dict[str, np.ndarray] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+
+    def mask(self, condition: str | None) -> np.ndarray:
+        key = (condition or "").strip()
+        if key not in self._masks:
+            if not key:
+                self._masks[key] = np.ones(len(self.df), dtype=bool)
+            else:
+                try:
+                    self._masks[key] = np.asarray(self.df.eval(key), dtype=bool)
+                except Exception as exc:
+                    raise ValidationError(f"Failed to evaluate slice condition '{condition}': {exc}")
+        return self._masks[key]
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            self._columns[name] = self.df[name].to_numpy()
+        return self._columns[name]
+
+    def values(self, name: str, condition: str | None) -> np.ndarray:
+        return self.column(name)[self.mask(condition)]
+
+    def sorted_values(self, name: str) -> np.ndarray:
+        """Sorted non-NaN values of a whole column, cached like the masks."""
+
+        if name not in self._sorted:
+            values = self.column(name).astype(float)
+            self._sorted[name] = np.sort(values[~np.isnan(values)])
+        return self._sorted[name]
+
+
+def _dropna(data) -> np.ndarray:
+    values = np.asarray(data, dtype=float)
+    return values[~np.isnan(values)]
+
+
+def run_t_test(data: pd.Series | np.ndarray) -> Tuple[float, float]:
+    data = _dropna(data)
+    if data.size == 0:
         return float("nan"), float("nan")
     stat, p_value = stats.ttest_1samp(data, 0.0, nan_policy="omit")
     return float(stat), float(p_value)
 
 
-def run_bootstrap(data: pd.Series, n_iter: int = 1000) -> Tuple[float, Tuple[float, float]]:
-    data = data.dropna().to_numpy()
+def _bootstrap_indices(
+    rng: np.random.Generator,
+    rows: int,
+    size: int,
+    method: str,
+    block_size: int,
+) -> np.ndarray:
+    if method == "iid":
+        return rng.integers(0, size, size=(rows, size))
+    positions = np.arange(size)
+    if method == "block":
+        # Circular moving-block bootstrap with fixed block length.
+        n_blocks = -(-size // block_size)
+        starts = rng.integers(0, size, size=(rows, n_blocks))
+        idx = starts[:, :, None] + np.arange(block_size)
+        return idx.reshape(rows, -1)[:, :size] % size
+    # Stationary bootstrap (Politis & Romano): geometric block lengths with
+    # mean ``block_size``; a new block starts wherever ``restart`` is set.
+    restart = rng.random((rows, size)) < 1.0 / block_size
+    restart[:, 0] = True
+    starts = rng.integers(0, size, size=(rows, size))
+    block_origin = np.maximum.accumulate(np.where(restart, positions, 0), axis=1)
+    first = np.take_along_axis(starts, block_origin, axis=1)
+    return (first + positions - block_origin) % size
+
+
+def bootstrap_means(
+    data: np.ndarray,
+    n_iter: int = 1000,
+    method: str = "iid",
+    block_size: int = 30,
+    seed: int = BOOTSTRAP_SEED,
+    max_cells: int = BOOTSTRAP_MAX_CELLS,
+) -> np.ndarray:
+    """Return ``n_iter`` resampled means, drawn in memory-bounded chunks."""
+
+    if method not in BOOTSTRAP_METHODS:
+        raise ValidationError(f"Unknown bootstrap method '{method}', expected one of {BOOTSTRAP_METHODS}")
+    size = data.size
+    block_size = max(1, min(int(block_size), size))
+    rng = np.random.default_rng(seed)
+    chunk = max(1, min(n_iter, max_cells // max(size, 1)))
+    means = np.empty(n_iter)
+    for start in range(0, n_iter, chunk):
+        rows = min(chunk, n_iter - start)
+        idx = _bootstrap_indices(rng, rows, size, method, block_size)
+        means[start:start + rows] = data[idx].mean(axis=1)
+    return means
+
+
+def run_bootstrap(
+    data: pd.Series | np.ndarray,
+    n_iter: int = 1000,
+    method: str = "iid",
+    block_size: int = 30,
+) -> Tuple[float, Tuple[float, float]]:
+    data = _dropna(data)
     if data.size == 0:
         return float("nan"), (float("nan"), float("nan"))
-    rng = np.random.default_rng(1234)
-    means = []
-    for _ in range(n_iter):
-        sample = rng.choice(data, size=data.size, replace=True)
-        means.append(sample.mean())
+    means = bootstrap_means(data, n_iter=n_iter, method=method, block_size=block_size)
     mean = float(np.mean(means))
     lower, upper = np.percentile(means, [2.5, 97.5])
     return mean, (float(lower), float(upper))
 
 
-def run_spearman(x: pd.Series, y: pd.Series) -> Tuple[float, float]:
-    valid = x.notna() & y.notna()
+def run_spearman(x: pd.Series | np.ndarray, y: pd.Series | np.ndarray) -> Tuple[float, float]:
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~np.isnan(x) & ~np.isnan(y)
     if valid.sum() == 0:
         return float("nan"), float("nan")
     corr, p_value = stats.spearmanr(x[valid], y[valid])
     return float(corr), float(p_value)
 
 
-def run_logistic_regression(feature: pd.Series, target: pd.Series) -> Tuple[float, float]:
-    valid = feature.notna() & target.notna()
-    if valid.sum() < 20:
-        return float("nan"), float("nan")
-    x = feature[valid].to_numpy().reshape(-1, 1)
-    scaler = StandardScaler()
-    x_scaled = scaler.fit_transform(x)
-    y = (target[valid] > 0).astype(int)
-    model = LogisticRegression(max_iter=1000)
-    model.fit(x_scaled, y)
-    coef = float(model.coef_[0][0])
-    pred = model.predict_proba(x_scaled)[:, 1]
-    _, p_value = stats.ttest_1samp(pred - y, 0.0, nan_policy="omit")
-    return coef, float(p_value)
+def fit_logistic_batch(
+    feature: np.ndarray,
+    targets: np.ndarray,
+    start: np.ndarray | None = None,
+    max_iter: int = LOGIT_MAX_ITER,
+    tol: float = LOGIT_TOL,
+) -> Dict[str, np.ndarray]:
+    """Fit ``k`` single-feature logistic regressions at once with Newton/IRLS.
+
+    ``feature`` is ``(n,)`` (shared) or ``(n, k)`` and ``targets`` is ``(n, k)``
+    of forward returns; a row is used for column ``j`` when both values are
+    finite and the label is ``target > 0``.  Each feature column is
+    standardised over its own valid rows, so coefficients are per standard
+    deviation like the previous ``StandardScaler`` fit.  The 2x2 Hessians are
+    inverted in closed form for every column simultaneously.  ``start`` takes
+    ``(k, 2)`` ``[intercept, slope]`` values, e.g. the solution of an adjacent
+    horizon; otherwise each column starts from its intercept-only fit.
+
+    Returns ``coef``, ``se``, ``p_value`` (two-sided Wald), ``intercept``,
+    ``n`` and ``converged`` arrays of length ``k``.  Columns with fewer than
+    ``LOGIT_MIN_ROWS`` rows, a constant feature or a non-converged fit get NaN.
+    """
+
+    targets = np.asarray(targets, dtype=float)
+    if targets.ndim == 1:
+        targets = targets[:, None]
+    x = np.asarray(feature, dtype=float)
+    x = np.broadcast_to(x[:, None] if x.ndim == 1 else x, targets.shape)
+    valid = ~np.isnan(x) & ~np.isnan(targets)
+    weight = valid.astype(float)
+    n = weight.sum(axis=0)
+    safe_n = np.maximum(n, 1.0)
+    y = (np.where(valid, targets, 0.0) > 0).astype(float)
+    x = np.where(valid, x, 0.0)
+    mean = x.sum(axis=0) / safe_n
+    std = np.sqrt((weight * (x - mean) ** 2).sum(axis=0) / safe_n)
+    z = np.where(valid, (x - mean) / np.where(std > 0, std, 1.0), 0.0)
+
+    if start is None:
+        rate = np.clip(y.sum(axis=0) / safe_n, 1e-6, 1 - 1e-6)
+        beta = np.column_stack([np.log(rate / (1 - rate)), np.zeros(targets.shape[1])])
+    else:
+        beta = np.array(start, dtype=float, copy=True).reshape(targets.shape[1], 2)
+    converged = np.zeros(targets.shape[1], dtype=bool)
+    h00 = h01 = h11 = det = np.ones(targets.shape[1])
+    for _ in range(max_iter):
+        with np.errstate(over="ignore"):
+            prob = 1.0 / (1.0 + np.exp(-(beta[:, 0] + beta[:, 1] * z)))
+        w = weight * prob * (1.0 - prob)
+        resid = weight * (y - prob)
+        g0, g1 = resid.sum(axis=0), (resid * z).sum(axis=0)
+        h00, h01, h11 = w.sum(axis=0), (w * z).sum(axis=0), (w * z * z).sum(axis=0)
+        det = h00 * h11 - h01 * h01
+        with np.errstate(invalid="ignore", divide="ignore"):
+            step0 = (h11 * g0 - h01 * g1) / det
+            step1 = (h00 * g1 - h01 * g0) / det
+        step0 = np.where(converged, 0.0, step0)
+        step1 = np.where(converged, 0.0, step1)
+        beta[:, 0] += step0
+        beta[:, 1] += step1
+        converged |= np.maximum(np.abs(step0), np.abs(step1)) < tol
+        if converged.all():
+            break
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        se = np.sqrt(h00 / det)
+    ok = converged & (n >= LOGIT_MIN_ROWS) & (std > 0) & np.isfinite(se) & (se > 0)
+    coef = np.where(ok, beta[:, 1], np.nan)
+    se = np.where(ok, se, np.nan)
+    p_value = np.where(ok, 2.0 * stats.norm.sf(np.abs(coef / np.where(ok, se, 1.0))), np.nan)
+    return {
+        "coef": coef,
+        "se": se,
+        "p_value": p_value,
+        "intercept": np.where(ok, beta[:, 0], np.nan),
+        "n": n.astype(np.int64),
+        "converged": converged,
+    }
+
+
+def run_logistic_regression(
+    feature: pd.Series | np.ndarray,
+    target: pd.Series | np.ndarray,
+) -> Tuple[float, float]:
+    fit = fit_logistic_batch(np.asarray(feature, dtype=float), np.asarray(target, dtype=float))
+    return float(fit["coef"][0]), float(fit["p_value"][0])
 
 
 def benjamini_hochberg(p_values: List[float]) -> List[float]:
@@ -153,69 +463,454 @@ def benjamini_hochberg(p_values: List[float]) -> List[float]:
     return adjusted.tolist()
 
 
-def rolling_window_stability(series: pd.Series, window: timedelta) -> float:
-    if series.empty:
-        return float("nan")
-    wins = 0
-    total = 0
-    start = series.index.min()
-    end = series.index.max()
-    current = start
-    while current < end:
-        segment = series.loc[current: current + window]
-        if segment.dropna().empty:
-            current += window
-            continue
-        sign = np.sign(segment.dropna().mean())
-        if sign != 0:
-            wins += np.mean(np.sign(segment.dropna()) == sign)
-            total += 1
-        current += window
-    if total == 0:
-        return float("nan")
-    return wins / total
-
+def _duration(value, default: timedelta | None) -> timedelta | None:
+    if value is None or value == "":
+        return default
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, (int, float)):
+        return timedelta(days=float(value))
+    return pd.Timedelta(str(value)).to_pytimedelta()
+
+
+def rolling_window_detail(
+    series: pd.Series,
+    window: timedelta,
+    step: timedelta | None = None,
+) -> pd.DataFrame:
+    """Per-window sign agreement of ``series`` over calendar windows.
+
+    Windows are half-open ``[start, start + window)`` intervals starting at the
+    first timestamp and advancing by ``step`` (defaults to ``window``; a shorter
+    step gives overlapping windows).  Window ids come from integer division of
+    the int64 timestamps, so every window is reduced in one ``np.bincount`` pass
+    per overlap offset instead of slicing the series window by window.
+    """
+
+    columns = ["window_start", "window_end", "count", "mean", "agreement"]
+    values = np.asarray(series, dtype=float)
+    valid = ~np.isnan(values)
+    values = values[valid]
+    if values.size == 0:
+        return pd.DataFrame(columns=columns)
+    index = pd.DatetimeIndex(series.index[valid])
+    stamps = index.values.astype("datetime64[ns]").astype(np.int64)
+    window_ns = int(pd.Timedelta(window).value)
+    step_ns = int(pd.Timedelta(step).value) if step is not None else window_ns
+    if window_ns <= 0 or step_ns <= 0:
+        raise ValidationError("Rolling window and step must be positive")
+
+    offsets = stamps - stamps.min()
+    base_ids = offsets // step_ns
+    ids_parts, value_parts = [], []
+    for shift in range(-(-window_ns // step_ns)):
+        ids = base_ids - shift
+        inside = (ids >= 0) & (offsets - ids * step_ns < window_ns)
+        ids_parts.append(ids[inside])
+        value_parts.append(values[inside])
+    ids = np.concatenate(ids_parts)
+    grouped = np.concatenate(value_parts)
+
+    size = int(ids.max()) + 1
+    counts = np.bincount(ids, minlength=size)
+    sums = np.bincount(ids, weights=grouped, minlength=size)
+    positives = np.bincount(ids, weights=(grouped > 0).astype(float), minlength=size)
+    negatives = np.bincount(ids, weights=(grouped < 0).astype(float), minlength=size)
+
+    present = np.flatnonzero(counts)
+    counts, sums = counts[present], sums[present]
+    sign = np.sign(sums)
+    agreement = np.where(sign > 0, positives[present], negatives[present]) / counts
+    agreement[sign == 0] = np.nan
+
+    starts = index.min() + pd.to_timedelta(present * step_ns, unit="ns")
+    return pd.DataFrame(
+        {
+            "window_start": starts,
+            "window_end": starts + pd.Timedelta(window_ns, unit="ns"),
+            "count": counts,
+            "mean": sums / counts,
+            "agreement": agreement,
+        },
+        columns=columns,
+    )
+
+
+def rolling_window_stability(
+    series: pd.Series,
+    window: timedelta,
+    step: timedelta | None = None,
+) -> Tuple[float, pd.DataFrame]:
+    """Average per-window sign agreement and the per-window detail behind it."""
+
+    detail = rolling_window_detail(series, window, step)
+    scored = detail["agreement"].dropna()
+    if scored.empty:
+        return float("nan"), detail
+    return float(scored.mean()), detail
+
+
+def threshold_curve(
+    indicator: pd.Series | np.ndarray,
+    future: Dict[str, pd.Series | np.ndarray] | None = None,
+    thresholds: Iterable[float] | None = None,
+    n_points: int = THRESHOLD_CURVE_POINTS,
+) -> pd.DataFrame:
+    """Trigger rate and forward-return stats for ``indicator > t`` over many ``t``.
+
+    The indicator is sorted once; every threshold maps to a cut position with
+    ``searchsorted`` and the rows above it are read off suffix sums.  All
+    horizons in ``future`` are stacked into one matrix so a single cumulative
+    sum serves every horizon.  ``thresholds`` defaults to ``n_points`` evenly
+    spaced quantiles of the indicator.  Trigger rates use every row (NaN never
+    triggers) like ``(series > t).mean()``; return stats skip NaN returns.
+    """
+
+    values = np.asarray(indicator, dtype=float)
+    valid = ~np.isnan(values)
+    order = np.flatnonzero(valid)[np.argsort(values[valid], kind="stable")]
+    ordered = values[order]
+    if thresholds is None:
+        if ordered.size == 0:
+            thresholds = np.array([], dtype=float)
+        else:
+            positions = np.linspace(0, ordered.size - 1, max(int(n_points), 1)).round().astype(np.int64)
+            thresholds = np.unique(ordered[positions])
+    thresholds = np.asarray(list(thresholds), dtype=float)
+    cuts = np.searchsorted(ordered, thresholds, side="right")
+    triggers = ordered.size - cuts
+    trigger_rate = triggers / values.size if values.size else np.full(thresholds.size, np.nan)
+
+    future = future or {}
+    if not future:
+        return pd.DataFrame({"threshold": thresholds, "triggers": triggers, "trigger_rate": trigger_rate})
+
+    horizons = list(future)
+    returns = np.column_stack([np.asarray(future[key], dtype=float)[order] for key in horizons])
+    finite = ~np.isnan(returns)
+    stacked = np.concatenate([np.where(finite, returns, 0.0), finite, returns > 0], axis=1)
+    # suffix[i] sums rows i..end of the sorted order; suffix[-1] is the empty sum.
+    suffix = np.zeros((stacked.shape[0] + 1, stacked.shape[1]))
+    suffix[:-1] = np.cumsum(stacked[::-1], axis=0)[::-1]
+    above = suffix[cuts]
+    width = len(horizons)
+    sums, counts, hits = above[:, :width], above[:, width:2 * width], above[:, 2 * width:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        hit_rates = hits / counts
+
+    frames = [
+        pd.DataFrame(
+            {
+                "threshold": thresholds,
+                "horizon": key,
+                "triggers": triggers,
+                "trigger_rate": trigger_rate,
+                "sample_size": counts[:, column].astype(np.int64),
+                "mean_ret": means[:, column],
+                "hit_rate": hit_rates[:, column],
+            }
+        )
+        for column, key in enumerate(horizons)
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def threshold_sensitivity(
+    series: pd.Series | np.ndarray,
+    base_threshold: float,
+    ordered: np.ndarray | None = None,
+) -> float:
+    """Mean change of ``(series > t).mean()`` when ``t`` moves by +/- THRESHOLD_SENSITIVITY.
+
+    ``ordered`` is the sorted non-NaN ``series`` (see ``SliceIndex.sorted_values``);
+    passing it lets every cell of an indicator share one sort.
+    """
 
-def threshold_sensitivity(series: pd.Series, base_threshold: float) -> float:
     if base_threshold == 0:
         return float("nan")
-    perturbations = [1 - THRESHOLD_SENSITIVITY, 1 + THRESHOLD_SENSITIVITY]
-    base_signal = (series > base_threshold).mean()
-    deviations = []
-    for factor in perturbations:
-        perturbed = (series > base_threshold * factor).mean()
-        deviations.append(abs(perturbed - base_signal))
-    return float(np.mean(deviations))
+    values = np.asarray(series, dtype=float)
+    if ordered is None:
+        ordered = np.sort(values[~np.isnan(values)])
+    thresholds = base_threshold * np.array([1.0, 1 - THRESHOLD_SENSITIVITY, 1 + THRESHOLD_SENSITIVITY])
+    rates = (ordered.size - np.searchsorted(ordered, thresholds, side="right")) / values.size
+    return float(np.mean(np.abs(rates[1:] - rates[0])))
+
+
+def evaluate_cells(
+    dataset: pd.DataFrame,
+    indicator_cfg: Dict,
+    slice_cfg: Dict,
+    settings: Dict,
+    slice_index: SliceIndex | None = None,
+) -> List[Dict]:
+    """Evaluate every horizon of one (indicator, slice) pair."""
+
+    slice_index = slice_index or SliceIndex(dataset)
+    indicator_name = indicator_cfg.get("name")
+    threshold = indicator_cfg.get("threshold")
+    bootstrap_cfg = settings["bootstrap"]
+    stability_cfg = settings.get("stability", {})
+    slice_name = slice_cfg.get("name", "all")
+    condition = slice_cfg.get("condition")
+    mask = slice_index.mask(condition)
+    if not mask.any():
+        return []
+    indicator_values = slice_index.values(indicator_name, condition)
+    timestamps = dataset.index[mask]
+    sensitivity = None
+    if threshold is not None:
+        sensitivity = threshold_sensitivity(
+            slice_index.column(indicator_name), float(threshold), slice_index.sorted_values(indicator_name)
+        )
+
+    tests = indicator_cfg.get("tests", settings["tests"])
+    horizon_keys = [
+        f"fut_ret_{horizon}m"
+        for horizon in indicator_cfg.get("horizons", settings["horizons"])
+        if f"fut_ret_{horizon}m" in dataset.columns
+    ]
+    logit = None
+    if "logistic_regression" in tests and horizon_keys:
+        # One batched IRLS solve covers every horizon of the cell.
+        targets = np.column_stack([slice_index.values(key, condition) for key in horizon_keys]).astype(float)
+        logit = fit_logistic_batch(indicator_values.astype(float), targets)
+
+    rows: List[Dict] = []
+    for column, horizon_key in enumerate(horizon_keys):
+        future = slice_index.values(horizon_key, condition).astype(float)
+        valid = ~np.isnan(future)
+        if not valid.any():
+            continue
+
+        stats_summary: Dict[str, object] = {
+            "indicator": indicator_name,
+            "slice": slice_name,
+            "horizon": horizon_key,
+            "mean_ret": float(future[valid].mean()),
+            "win_rate": float((future > 0).mean()),
+            "sample_size": int(valid.sum())
+        }
+
+        effect_size = float(np.nanmean(indicator_values.astype(float)))
+        stats_summary["effect_size"] = effect_size
+
+        for test in tests:
+            if test == "t-test":
+                stat, p_value = run_t_test(future)
+                stats_summary["t_stat"] = stat
+                stats_summary["p_value"] = p_value
+            elif test == "bootstrap":
+                mean, (ci_low, ci_high) = run_bootstrap(
+                    future,
+                    n_iter=int(bootstrap_cfg.get("n_iter", 1000)),
+                    method=bootstrap_cfg.get("method", "iid"),
+                    block_size=int(bootstrap_cfg.get("block_size", 30)),
+                )
+                stats_summary["bootstrap_mean"] = mean
+                stats_summary["ci_low"] = ci_low
+                stats_summary["ci_high"] = ci_high
+            elif test == "spearman_corr":
+                corr, p_value = run_spearman(indicator_values, future)
+                stats_summary["spearman_corr"] = corr
+                stats_summary["p_value"] = p_value
+            elif test == "logistic_regression":
+                stats_summary["logit_coef"] = float(logit["coef"][column])
+                stats_summary["logit_se"] = float(logit["se"][column])
+                stats_summary["p_value"] = float(logit["p_value"][column])
+
+        if sensitivity is not None:
+            stats_summary["threshold_sensitivity"] = sensitivity
+
+        future_series = pd.Series(future[valid], index=timestamps[valid])
+        stability, windows = rolling_window_stability(
+            future_series,
+            _duration(stability_cfg.get("rolling_window"), timedelta(days=ROLLING_WINDOW_DAYS)),
+            _duration(stability_cfg.get("rolling_step"), None),
+        )
+        stats_summary["rolling_stability"] = stability
+        stats_summary["stability_windows"] = int(windows["agreement"].notna().sum())
+
+        rows.append(stats_summary)
+    return rows
+
+
+# Each worker process maps the shared dataset once; tasks then only carry the
+# small (indicator, slice) configs.
+_WORKER_DATASET: pd.DataFrame | None = None
+_WORKER_SLICES: SliceIndex | None = None
+
+
+def share_dataset(dataset: pd.DataFrame, path: str) -> None:
+    frame = dataset.reset_index()
+    # Float columns keep NaN as a value instead of a null mask: Arrow can only
+    # hand a column to pandas without copying when it has no nulls.
+    columns = [
+        pa.array(frame[name].to_numpy()) if frame[name].dtype.kind == "f" else pa.Array.from_pandas(frame[name])
+        for name in frame.columns
+    ]
+    table = pa.Table.from_arrays(columns, names=[str(name) for name in frame.columns])
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def open_shared_dataset(path: str) -> pd.DataFrame:
+    # Float and integer columns are read-only views of the memory-mapped file,
+    # so all workers share its page-cache copy; boolean, string and timestamp
+    # columns are still converted into per-worker arrays.
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    frame = table.to_pandas(split_blocks=True)
+    return frame.set_index(frame.columns[0])
+
+
+def _init_worker(path: str) -> None:
+    global _WORKER_DATASET, _WORKER_SLICES
+    _WORKER_DATASET = open_shared_dataset(path)
+    _WORKER_SLICES = SliceIndex(_WORKER_DATASET)
+
+
+def _evaluate_task(task: Tuple[Dict, Dict, Dict]) -> List[Dict]:
+    indicator_cfg, slice_cfg, settings = task
+    return evaluate_cells(_WORKER_DATASET, indicator_cfg, slice_cfg, settings, _WORKER_SLICES)
+
+
+def run_grid(
+    dataset: pd.DataFrame,
+    tasks: List[Tuple[Dict, Dict]],
+    settings: Dict,
+    workers: int = 1,
+) -> List[Dict]:
+    """Evaluate all (indicator, slice) tasks, in task order, serially or on a process pool."""
+
+    if workers <= 1 or len(tasks) <= 1:
+        slice_index = SliceIndex(dataset)
+        return [
+            row
+            for indicator_cfg, slice_cfg in tasks
+            for row in evaluate_cells(dataset, indicator_cfg, slice_cfg, settings, slice_index)
+        ]
+
+    with tempfile.TemporaryDirectory(prefix="validator_") as tmp_dir:
+        path = os.path.join(tmp_dir, "dataset.arrow")
+        share_dataset(dataset, path)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+            payloads = [(indicator_cfg, slice_cfg, settings) for indicator_cfg, slice_cfg in tasks]
+            return [row for rows in pool.map(_evaluate_task, payloads) for row in rows]
 
 
 def ensure_results_dir() -> None:
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
 
+def run_incremental(
+    dataset: pd.DataFrame,
+    tasks: List[Tuple[Dict, Dict]],
+    settings: Dict,
+    store_root: str,
+    rebuild: bool = False,
+) -> List[Dict]:
+    """Summarise every cell from persisted per-day sufficient statistics.
+
+    Only days that are new or whose rows changed since the last run are
+    accumulated; the report is then a grouped sum over the dataset's days.  It
+    covers means, t-tests, win rates, effect sizes and Pearson correlations;
+    bootstrap, Spearman, logistic and stability need the exact path.
+    """
+
+    horizon_keys = {
+        id(indicator_cfg): [
+            f"fut_ret_{horizon}m"
+            for horizon in indicator_cfg.get("horizons", settings["horizons"])
+            if f"fut_ret_{horizon}m" in dataset.columns
+        ]
+        for indicator_cfg, _ in tasks
+    }
+    codes, labels = day_ids(dataset.index)
+    signatures = day_signatures(codes, labels, dataset)
+    grid_key = config_key({"tasks": tasks, "horizons": settings["horizons"]})
+
+    store = SufficientStatsStore(Path(store_root))
+    stale = sorted(signatures) if rebuild else store.stale_days(signatures, grid_key)
+    if stale:
+        rows = np.flatnonzero(np.isin(labels, stale)[codes])
+        subset = dataset.iloc[rows]
+        subset_codes = codes[rows]
+        slice_index = SliceIndex(subset)
+        frames = []
+        for indicator_cfg, slice_cfg in tasks:
+            condition = slice_cfg.get("condition")
+            mask = slice_index.mask(condition)
+            if not mask.any():
+                continue
+            day_codes = subset_codes[mask]
+            indicator_values = slice_index.values(indicator_cfg["name"], condition)
+            for horizon_key in horizon_keys[id(indicator_cfg)]:
+                totals = accumulate(day_codes, labels.size, indicator_values, slice_index.values(horizon_key, condition))
+                present = np.flatnonzero(totals["rows"])
+                frame = pd.DataFrame({name: values[present] for name, values in totals.items()})
+                frame.insert(0, "horizon", horizon_key)
+                frame.insert(0, "slice", slice_cfg.get("name", "all"))
+                frame.insert(0, "indicator", indicator_cfg["name"])
+                frame.insert(0, "day", labels[present])
+                frames.append(frame)
+        computed = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        store.write_days(computed, {day: signatures[day] for day in stale}, grid_key)
+    # Only the current dataset's days: the store may hold days outside it.
+    return summarise(store.load(signatures)).to_dict("records")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Validate ATAS indicator exports against Binance data")
     parser.add_argument("--atas", default=ATAS_DATA_PATH, help="Path to ATAS JSON exports")
-    parser.add_argument("--binance", default=BINANCE_DATA_PATH, help="Path to Binance CSV data")
+    parser.add_argument("--binance", default=BINANCE_DATA_PATH, help="Path to Binance CSV data or kline store")
+    parser.add_argument("--symbol", help="Kline series symbol when the store holds several series")
+    parser.add_argument("--interval", help="Kline series interval when the store holds several series")
     parser.add_argument("--config", default=CONFIG_PATH, help="Validator configuration file")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the indicator x slice grid")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every ATAS export instead of using the Parquet cache")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Summarise from per-day sufficient statistics, accumulating only new or changed days",
+    )
+    parser.add_argument("--rebuild-stats", action="store_true", help="Recompute every stored day (implies --incremental)")
     args = parser.parse_args()
 
     config = load_config(args.config)
-    indicator_data = load_indicator_files(args.atas)
-    binance_data = load_binance_data(args.binance)
+    indicator_data = load_indicator_files(args.atas, use_cache=not args.no_cache)
+    binance_data = load_binance_data(
+        args.binance,
+        start=indicator_data.index.min().to_pydatetime(),
+        end=indicator_data.index.max().to_pydatetime() + timedelta(milliseconds=1),
+        symbol=args.symbol,
+        interval=args.interval,
+    )
 
     combined = indicator_data.join(binance_data, how="inner", rsuffix="_binance")
     if combined.empty:
         raise ValidationError("Combined dataset is empty after joining indicator and Binance data")
 
     horizons = config.get("horizons", [5, 15, 30, 60])
-    future_returns = compute_future_returns(combined["close"], horizons)
+    forward_cfg = config.get("forward_returns", {}) or {}
+    future_returns = compute_future_returns(
+        combined["close"],
+        horizons,
+        high=combined["high"] if "high" in combined.columns else None,
+        low=combined["low"] if "low" in combined.columns else None,
+        tolerance=_duration(forward_cfg.get("gap_tolerance"), timedelta(0)),
+        extended=bool(forward_cfg.get("extended", False)),
+    )
     dataset = combined.join(future_returns)
 
-    results_rows: List[Dict] = []
-    p_values: List[float] = []
-
     slices = config.get("slices", []) or [{"name": "all", "condition": None}]
-    tests = config.get("tests", ["t-test", "spearman_corr"])
+    settings = {
+        "horizons": horizons,
+        "tests": config.get("tests", ["t-test", "spearman_corr"]),
+        "bootstrap": config.get("bootstrap", {}) or {},
+        "stability": config.get("stability", {}) or {},
+    }
 
     indicators = config.get("indicators", [])
     if not indicators:
@@ -223,75 +918,36 @@ def main() -> None:
 
     ensure_results_dir()
 
-    for indicator_cfg in indicators:
-        indicator_name = indicator_cfg.get("name")
-        if indicator_name not in dataset.columns:
-            continue
-        indicator_series = dataset[indicator_name]
-        threshold = indicator_cfg.get("threshold")
-
-        for slice_cfg in indicator_cfg.get("slices", slices):
-            slice_name = slice_cfg.get("name", "all")
-            condition = slice_cfg.get("condition")
-            sliced = apply_slice(dataset, condition)
-            if sliced.empty:
-                continue
-
-            for horizon in indicator_cfg.get("horizons", horizons):
-                horizon_key = f"fut_ret_{horizon}m"
-                if horizon_key not in sliced.columns:
-                    continue
-                future = sliced[horizon_key]
-                if future.dropna().empty:
-                    continue
-
-                stats_summary: Dict[str, object] = {
-                    "indicator": indicator_name,
-                    "slice": slice_name,
-                    "horizon": horizon_key,
-                    "mean_ret": float(future.mean()),
-                    "win_rate": float((future > 0).mean()),
-                    "sample_size": int(future.dropna().shape[0])
-                }
-
-                effect_size = float(indicator_series.loc[sliced.index].mean())
-                stats_summary["effect_size"] = effect_size
-
-                for test in indicator_cfg.get("tests", tests):
-                    if test == "t-test":
-                        stat, p_value = run_t_test(future)
-                        stats_summary["t_stat"] = stat
-                        stats_summary["p_value"] = p_value
-                    elif test == "bootstrap":
-                        mean, (ci_low, ci_high) = run_bootstrap(future)
-                        stats_summary["bootstrap_mean"] = mean
-                        stats_summary["ci_low"] = ci_low
-                        stats_summary["ci_high"] = ci_high
-                    elif test == "spearman_corr":
-                        corr, p_value = run_spearman(indicator_series.loc[sliced.index], future)
-                        stats_summary["spearman_corr"] = corr
-                        stats_summary["p_value"] = p_value
-                    elif test == "logistic_regression":
-                        coef, p_value = run_logistic_regression(indicator_series.loc[sliced.index], future)
-                        stats_summary["logit_coef"] = coef
-                        stats_summary["p_value"] = p_value
-
-                if "p_value" in stats_summary and not np.isnan(stats_summary["p_value"]):
-                    p_values.append(stats_summary["p_value"])
-
-                if threshold is not None:
-                    stats_summary["threshold_sensitivity"] = threshold_sensitivity(indicator_series, float(threshold))
-
-                stability = rolling_window_stability(future.dropna(), timedelta(days=ROLLING_WINDOW_DAYS))
-                stats_summary["rolling_stability"] = stability
-
-                results_rows.append(stats_summary)
+    tasks = [
+        (indicator_cfg, slice_cfg)
+        for indicator_cfg in indicators
+        if indicator_cfg.get("name") in dataset.columns
+        for slice_cfg in indicator_cfg.get("slices", slices)
+    ]
+    if args.incremental or args.rebuild_stats:
+        store_root = os.path.join(RESULTS_DIR, SUFFICIENT_STATS_DIR)
+        results_rows = run_incremental(dataset, tasks, settings, store_root, rebuild=args.rebuild_stats)
+    else:
+        results_rows = run_grid(dataset, tasks, settings, workers=args.workers)
 
     if results_rows:
         adjusted = benjamini_hochberg([row.get("p_value", np.nan) for row in results_rows])
         for row, padj in zip(results_rows, adjusted):
             row["p_adj"] = padj
 
+    curve_cfg = config.get("threshold_curves", {}) or {}
+    curve_points = int(curve_cfg.get("points", THRESHOLD_CURVE_POINTS))
+    if curve_points > 0:
+        horizon_columns = [f"fut_ret_{h}m" for h in horizons if f"fut_ret_{h}m" in dataset.columns]
+        future = {column: dataset[column].to_numpy() for column in horizon_columns}
+        curves = []
+        for name in dict.fromkeys(cfg.get("name") for cfg in indicators if cfg.get("name") in dataset.columns):
+            curve = threshold_curve(dataset[name].to_numpy(), future, n_points=curve_points)
+            curve.insert(0, "indicator", name)
+            curves.append(curve)
+        if curves:
+            pd.concat(curves, ignore_index=True).to_csv(os.path.join(RESULTS_DIR, "threshold_curves.csv"), index=False)
+
     report = pd.DataFrame(results_rows)
     csv_path = os.path.join(RESULTS_DIR, "validation_report.csv")
     excel_path = os.path.join(RESULTS_DIR, "validation_report.xlsx")